@@ -1,60 +1,199 @@
 import pandas as pd
 import os
 from pathlib import Path
+import re
+import json
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def procesar_datos_jugadores_cinco_torneos(ruta_csv_torneo1, ruta_csv_torneo2, ruta_csv_torneo3, 
-                                          ruta_csv_torneo4, ruta_csv_torneo5, 
-                                          ruta_salida='data/jugadores_unificados.csv'):
+from esquemas import ESQUEMAS, leer_csv
+from calidad_datos import validar, exigir_calidad, guardar_reportes, imprimir_reporte
+
+# Archivo combinado que genera el scraper de SofaScore en cada carpeta <tipo>_<id>/<modo>/
+ARCHIVO_JUGADORES = "jugadores_liga_colombiana_completo.csv"
+
+# Registro de torneos: ID de temporada de SofaScore -> nombre y posición cronológica.
+# Para añadir una temporada nueva basta con agregar su entrada en torneos.json.
+RUTA_REGISTRO_TORNEOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "torneos.json")
+
+# Se conserva el nombre histórico porque lo consume analisis_futbol_colombiano.ipynb
+RUTA_SALIDA_PREDETERMINADA = "data/jugadores_unificados_cinco_torneos.csv"
+
+PATRON_CARPETA_TORNEO = re.compile(r'^(apertura|clausura)_(\d+)$', re.IGNORECASE)
+
+# Semestre de cada tipo de torneo y sufijo del nombre ('Apertura 2025A', 'Clausura 2024B')
+SEMESTRE_TORNEO = {'Apertura': 1, 'Clausura': 2}
+SUFIJO_SEMESTRE = {1: 'A', 2: 'B'}
+
+def cargar_registro_torneos(ruta_registro=RUTA_REGISTRO_TORNEOS):
     """
-    Procesa los datos de jugadores de cinco torneos, combinando estadísticas 
-    de jugadores duplicados y uniendo datos de los cinco torneos.
+    Carga el registro de torneos desde un archivo JSON.
     
     Args:
-        ruta_csv_torneo1: Ruta al CSV con datos del torneo Apertura 2023A
-        ruta_csv_torneo2: Ruta al CSV con datos del torneo Clausura 2023B
-        ruta_csv_torneo3: Ruta al CSV con datos del torneo Apertura 2024A
-        ruta_csv_torneo4: Ruta al CSV con datos del torneo Clausura 2024B
-        ruta_csv_torneo5: Ruta al CSV con datos del torneo Apertura 2025A (actual)
+        ruta_registro: Ruta al JSON con el formato {"<id>": {"nombre": ..., "año": ..., "semestre": ...}}
+    
+    Returns:
+        dict: Registro de torneos indexado por ID de temporada (vacío si no existe el archivo)
+    """
+    if not os.path.exists(ruta_registro):
+        print(f"Advertencia: No se encontró el registro de torneos en {ruta_registro}")
+        return {}
+    
+    with open(ruta_registro, encoding='utf-8') as f:
+        return json.load(f)
+
+def describir_torneo(carpeta, registro):
+    """
+    Obtiene el nombre y la clave de orden cronológico de una carpeta <tipo>_<id>.
+    
+    Args:
+        carpeta: Nombre de la carpeta del torneo (por ejemplo 'apertura_70681')
+        registro: Registro de torneos cargado con cargar_registro_torneos
+    
+    Returns:
+        tuple: (nombre del torneo, clave de orden (año, semestre, id)) o None si la
+               carpeta no es de un torneo
+    """
+    coincidencia = PATRON_CARPETA_TORNEO.match(carpeta)
+    if not coincidencia:
+        return None
+    
+    tipo, id_torneo = coincidencia.group(1).capitalize(), int(coincidencia.group(2))
+    entrada = registro.get(str(id_torneo))
+    
+    if entrada:
+        # Los torneos registrados se ordenan por año y semestre
+        return entrada['nombre'], (int(entrada['año']), int(entrada['semestre']), id_torneo)
+    
+    # Torneos sin registrar: el semestre sale del tipo de la carpeta y el año del torneo
+    # registrado anterior (los ID de temporada de SofaScore crecen con el tiempo)
+    semestre = SEMESTRE_TORNEO[tipo]
+    anteriores = [(int(e['año']), int(e['semestre'])) for clave, e in registro.items() if int(clave) < id_torneo]
+    posteriores = [(int(e['año']), int(e['semestre'])) for clave, e in registro.items() if int(clave) > id_torneo]
+    if anteriores:
+        año_anterior, semestre_anterior = max(anteriores)
+        año = año_anterior if semestre > semestre_anterior else año_anterior + 1
+    elif posteriores:
+        año_siguiente, semestre_siguiente = min(posteriores)
+        año = año_siguiente if semestre < semestre_siguiente else año_siguiente - 1
+    else:
+        # Sin torneos registrados solo se puede ordenar por ID de temporada
+        print(f"Advertencia: El torneo {carpeta} no está en el registro, se usará el nombre '{tipo} {id_torneo}'")
+        return f"{tipo} {id_torneo}", (0, 0, id_torneo)
+    
+    nombre = f"{tipo} {año}{SUFIJO_SEMESTRE[semestre]}"
+    print(f"Advertencia: El torneo {carpeta} no está en el registro, se usará el nombre '{nombre}' "
+          f"(añádalo a torneos.json)")
+    return nombre, (año, semestre, id_torneo)
+
+def verificar_nombres_unicos(torneos):
+    """
+    Comprueba que cada nombre de torneo corresponda a un solo archivo; dos carpetas con
+    el mismo nombre mezclarían sus jugadores en la columna 'Torneo'.
+    
+    Raises:
+        ValueError: Si dos torneos comparten nombre
+    """
+    rutas_por_nombre = {}
+    for torneo in torneos:
+        rutas_por_nombre.setdefault(torneo['nombre'], []).append(torneo['ruta'])
+    repetidos = {nombre: rutas for nombre, rutas in rutas_por_nombre.items() if len(rutas) > 1}
+    if repetidos:
+        raise ValueError(f"Varios torneos tienen el mismo nombre (revise torneos.json): {repetidos}")
+
+def descubrir_torneos(base_path, modo="all", registro=None):
+    """
+    Busca todos los archivos data/<tipo>_<id>/<modo>/jugadores_liga_colombiana_completo.csv
+    
+    Args:
+        base_path: Carpeta de datos del scraper (la que contiene las carpetas <tipo>_<id>)
+        modo: Modo de acumulación a unificar ('all' o 'per_90_mins')
+        registro: Registro de torneos; si es None se carga desde torneos.json
+    
+    Returns:
+        list: Lista de diccionarios con 'nombre', 'ruta' y 'orden', del más antiguo al más reciente
+    """
+    if registro is None:
+        registro = cargar_registro_torneos()
+    
+    if not os.path.isdir(base_path):
+        raise FileNotFoundError(f"No se encontró la carpeta de datos: {base_path}")
+    
+    torneos = []
+    for carpeta in sorted(os.listdir(base_path)):
+        ruta = os.path.join(base_path, carpeta, modo, ARCHIVO_JUGADORES)
+        if not os.path.isfile(ruta):
+            continue
+        
+        descripcion = describir_torneo(carpeta, registro)
+        if descripcion is None:
+            continue
+        
+        nombre, orden = descripcion
+        torneos.append({'nombre': nombre, 'ruta': ruta, 'orden': orden})
+    
+    torneos.sort(key=lambda torneo: torneo['orden'])
+    verificar_nombres_unicos(torneos)
+    return torneos
+
+def cargar_torneos(torneos, max_workers=None):
+    """
+    Carga en paralelo los CSV de los torneos y añade la columna 'Torneo'.
+    
+    Args:
+        torneos: Lista de diccionarios con 'nombre' y 'ruta'
+        max_workers: Número máximo de hilos de lectura (por defecto uno por torneo)
+    
+    Returns:
+        list: DataFrames en el mismo orden que la lista de torneos
+    """
+    for torneo in torneos:
+        if not os.path.exists(torneo['ruta']):
+            raise FileNotFoundError(f"No se pudo encontrar el archivo para el torneo {torneo['nombre']} en la ruta: {torneo['ruta']}")
+    
+    esquema = ESQUEMAS['jugadores_sofascore']
+    
+    def leer_torneo(torneo):
+        # Las estadísticas se cargan como float32 y los identificadores como texto
+        return leer_csv(torneo['ruta'], texto=esquema['texto'],
+                        numericas_por_defecto=esquema['numericas_por_defecto'])
+    
+    # La lectura de CSV es principalmente E/S, por lo que los hilos la solapan bien
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(torneos))) as executor:
+        dataframes = list(executor.map(leer_torneo, torneos))
+    
+    for torneo, df_torneo in zip(torneos, dataframes):
+        df_torneo['Torneo'] = torneo['nombre']
+        print(f"  ✓ {torneo['nombre']}: cargados {len(df_torneo)} registros")
+    
+    return dataframes
+
+def procesar_datos_jugadores_torneos(torneos, ruta_salida=RUTA_SALIDA_PREDETERMINADA, max_workers=None,
+                                     validar_calidad=True):
+    """
+    Procesa los datos de jugadores de cualquier número de torneos, combinando estadísticas
+    de jugadores duplicados y uniendo los datos de todos los torneos.
+    
+    Args:
+        torneos: Lista de diccionarios con 'nombre', 'ruta' y 'orden' (ver descubrir_torneos)
         ruta_salida: Ruta donde se guardará el archivo CSV unificado
+        max_workers: Número máximo de hilos para la carga de archivos
+        validar_calidad: Si es True, no se guarda un resultado que no supere las
+            comprobaciones de calidad (el informe queda en <salida>_calidad.json)
+    
+    Returns:
+        DataFrame: Datos unificados ordenados por nombre y torneo (del más reciente al más antiguo)
     """
-    # Verificar que los archivos existen
-    for ruta, nombre in zip(
-        [ruta_csv_torneo1, ruta_csv_torneo2, ruta_csv_torneo3, ruta_csv_torneo4, ruta_csv_torneo5], 
-        ["Apertura 2023A", "Clausura 2023B", "Apertura 2024A", "Clausura 2024B", "Apertura 2025A"]
-    ):
-        if not os.path.exists(ruta):
-            raise FileNotFoundError(f"No se pudo encontrar el archivo para el torneo {nombre} en la ruta: {ruta}")
-    
-    print("Cargando datos del torneo Apertura 2023A...")
-    df_torneo1 = pd.read_csv(ruta_csv_torneo1)
-    print(f"  ✓ Cargados {len(df_torneo1)} registros")
-    
-    print("Cargando datos del torneo Clausura 2023B...")
-    df_torneo2 = pd.read_csv(ruta_csv_torneo2)
-    print(f"  ✓ Cargados {len(df_torneo2)} registros")
-    
-    print("Cargando datos del torneo Apertura 2024A...")
-    df_torneo3 = pd.read_csv(ruta_csv_torneo3)
-    print(f"  ✓ Cargados {len(df_torneo3)} registros")
-    
-    print("Cargando datos del torneo Clausura 2024B...")
-    df_torneo4 = pd.read_csv(ruta_csv_torneo4)
-    print(f"  ✓ Cargados {len(df_torneo4)} registros")
-    
-    print("Cargando datos del torneo Apertura 2025A (actual)...")
-    df_torneo5 = pd.read_csv(ruta_csv_torneo5)
-    print(f"  ✓ Cargados {len(df_torneo5)} registros")
-    
-    # Agregar columna para identificar el torneo
-    df_torneo1['Torneo'] = 'Apertura 2023A'
-    df_torneo2['Torneo'] = 'Clausura 2023B'
-    df_torneo3['Torneo'] = 'Apertura 2024A'
-    df_torneo4['Torneo'] = 'Clausura 2024B'
-    df_torneo5['Torneo'] = 'Apertura 2025A'
-    
-    # Combinar los cinco DataFrames
-    df_combinado = pd.concat([df_torneo1, df_torneo2, df_torneo3, df_torneo4, df_torneo5])
+    if not torneos:
+        raise ValueError("No hay torneos para procesar")
+    verificar_nombres_unicos(torneos)
+    
+    print(f"Cargando datos de {len(torneos)} torneos...")
+    dataframes = cargar_torneos(torneos, max_workers=max_workers)
+    
+    # Combinar los DataFrames de todos los torneos
+    df_combinado = pd.concat(dataframes)
     print(f"Total de registros combinados: {len(df_combinado)}")
     
     # Procesar jugadores duplicados
@@ -70,17 +209,12 @@ def procesar_datos_jugadores_cinco_torneos(ruta_csv_torneo1, ruta_csv_torneo2, r
             df_unificado = df_unificado.drop(columna, axis=1)
             print(f"  ✓ Columna '{columna}' eliminada")
     
-    # Ordenar primero por nombre y luego por torneo en orden específico
+    # Ordenar primero por nombre y luego por torneo (cronológico inverso)
     print("Ordenando por nombre y torneo...")
     
-    # Crear un mapeo para ordenar los torneos en el orden deseado (cronológico inverso)
-    torneo_orden = {
-        'Apertura 2025A': 0,  # Primero (más reciente)
-        'Clausura 2024B': 1,
-        'Apertura 2024A': 2,
-        'Clausura 2023B': 3,
-        'Apertura 2023A': 4   # Último (más antiguo)
-    }
+    # El orden se deriva del año y semestre de cada torneo: 0 es el más reciente
+    torneos_cronologicos = sorted(torneos, key=lambda torneo: torneo['orden'], reverse=True)
+    torneo_orden = {torneo['nombre']: posicion for posicion, torneo in enumerate(torneos_cronologicos)}
     
     # Crear una columna temporal para ordenar por torneo
     df_unificado['torneo_orden'] = df_unificado['Torneo'].map(torneo_orden)
@@ -96,12 +230,46 @@ def procesar_datos_jugadores_cinco_torneos(ruta_csv_torneo1, ruta_csv_torneo2, r
     if ruta_salida_dir and not os.path.exists(ruta_salida_dir):
         os.makedirs(ruta_salida_dir, exist_ok=True)
     
+    # Comprobaciones de calidad antes de entregar el archivo al preprocesamiento
+    if validar_calidad:
+        reporte = validar(df_unificado, 'jugadores_unificados', nombre=ruta_salida)
+        imprimir_reporte(reporte)
+        guardar_reportes(reporte, os.path.splitext(ruta_salida)[0] + "_calidad.json")
+        exigir_calidad(reporte)
+    
     # Guardar como CSV 
     df_unificado.to_csv(ruta_salida, index=False)
     print(f"Datos unificados guardados en {ruta_salida}")
     
     return df_unificado
 
+def procesar_datos_jugadores_cinco_torneos(ruta_csv_torneo1, ruta_csv_torneo2, ruta_csv_torneo3, 
+                                          ruta_csv_torneo4, ruta_csv_torneo5, 
+                                          ruta_salida='data/jugadores_unificados.csv'):
+    """
+    Procesa los datos de jugadores de cinco torneos, combinando estadísticas 
+    de jugadores duplicados y uniendo datos de los cinco torneos.
+    Se mantiene por compatibilidad; para un número arbitrario de torneos
+    usar descubrir_torneos y procesar_datos_jugadores_torneos.
+    
+    Args:
+        ruta_csv_torneo1: Ruta al CSV con datos del torneo Apertura 2023A
+        ruta_csv_torneo2: Ruta al CSV con datos del torneo Clausura 2023B
+        ruta_csv_torneo3: Ruta al CSV con datos del torneo Apertura 2024A
+        ruta_csv_torneo4: Ruta al CSV con datos del torneo Clausura 2024B
+        ruta_csv_torneo5: Ruta al CSV con datos del torneo Apertura 2025A (actual)
+        ruta_salida: Ruta donde se guardará el archivo CSV unificado
+    """
+    rutas = [ruta_csv_torneo1, ruta_csv_torneo2, ruta_csv_torneo3, ruta_csv_torneo4, ruta_csv_torneo5]
+    nombres = ["Apertura 2023A", "Clausura 2023B", "Apertura 2024A", "Clausura 2024B", "Apertura 2025A"]
+    
+    torneos = [
+        {'nombre': nombre, 'ruta': ruta, 'orden': (0, posicion)}
+        for posicion, (nombre, ruta) in enumerate(zip(nombres, rutas))
+    ]
+    
+    return procesar_datos_jugadores_torneos(torneos, ruta_salida)
+
 def unificar_jugadores_duplicados(df):
     """
     Unifica las estadísticas de jugadores duplicados.
@@ -111,109 +279,54 @@ def unificar_jugadores_duplicados(df):
     # Identificar columnas clave que identifican a un jugador único
     columnas_clave = ['Team', 'Name', 'Torneo']
     
-    # Agrupar por nombre de jugador, equipo y torneo
-    grupos = df.groupby(columnas_clave)
+    # Columnas estadísticas en el orden original, sin la posición
+    columnas_valores = [col for col in df.columns if col not in columnas_clave and col != 'Position']
     
-    # Lista para almacenar filas procesadas
-    filas_procesadas = []
-    
-    # Procesar cada grupo (jugador)
-    for nombre_grupo, grupo in grupos:
-        # Inicializar fila unificada con valores no-nulos
-        fila_unificada = {}
-        
-        # Copiar columnas clave
-        for i, col in enumerate(columnas_clave):
-            fila_unificada[col] = nombre_grupo[i]
-        
-        # Para cada columna estadística, tomar el primer valor no-nulo
-        for columna in df.columns:
-            if columna not in columnas_clave and columna != 'Position':
-                # Obtener valores no nulos
-                valores_no_nulos = grupo[columna].dropna()
-                if not valores_no_nulos.empty:
-                    fila_unificada[columna] = valores_no_nulos.iloc[0]
-                else:
-                    fila_unificada[columna] = None
-        
-        filas_procesadas.append(fila_unificada)
-    
-    # Crear DataFrame con filas procesadas
-    df_procesado = pd.DataFrame(filas_procesadas)
+    # first() toma por grupo el primer valor no-nulo de cada columna en una sola pasada
+    df_procesado = (
+        df.groupby(columnas_clave)[columnas_valores]
+        .first()
+        .reset_index()
+    )
     
     return df_procesado
 
-# Ejemplo de uso
-if __name__ == "__main__":
-    # Definir ruta de salida predeterminada
-    ruta_salida = "data/jugadores_unificados_cinco_torneos.csv"
-    
-    # Obtener la ruta base del proyecto - ajusta esto según tu estructura de directorios
-    # Esto asume que estás ejecutando el script desde el directorio 'Procesamiento de datos'
-    base_path = os.path.join("..", "scraper", "data")
-    
-    # Rutas a los archivos CSV - ajústalas según la ubicación real de tus archivos
-    ruta_csv_torneo1 = os.path.join(base_path, "apertura_48283", "all", "jugadores_liga_colombiana_completo.csv")
-    ruta_csv_torneo2 = os.path.join(base_path, "clausura_52847", "all", "jugadores_liga_colombiana_completo.csv")
-    ruta_csv_torneo3 = os.path.join(base_path, "apertura_57374", "all", "jugadores_liga_colombiana_completo.csv")
-    ruta_csv_torneo4 = os.path.join(base_path, "clausura_63819", "all", "jugadores_liga_colombiana_completo.csv")
-    ruta_csv_torneo5 = os.path.join(base_path, "apertura_70681", "all", "jugadores_liga_colombiana_completo.csv")
-    
-    print("Rutas de archivos a procesar:")
-    print(f"Apertura 2023A: {ruta_csv_torneo1}")
-    print(f"Clausura 2023B: {ruta_csv_torneo2}")
-    print(f"Apertura 2024A: {ruta_csv_torneo3}")
-    print(f"Clausura 2024B: {ruta_csv_torneo4}")
-    print(f"Apertura 2025A: {ruta_csv_torneo5}")
-    
-    # Verificar si los archivos existen
-    archivos_existen = True
-    for ruta, nombre in zip(
-        [ruta_csv_torneo1, ruta_csv_torneo2, ruta_csv_torneo3, ruta_csv_torneo4, ruta_csv_torneo5], 
-        ["Apertura 2023A", "Clausura 2023B", "Apertura 2024A", "Clausura 2024B", "Apertura 2025A"]
-    ):
-        if not os.path.exists(ruta):
-            print(f"ERROR: No se encontró el archivo para el torneo {nombre} en: {ruta}")
-            archivos_existen = False
-    
-    if not archivos_existen:
-        print("\nPor favor, especifica las rutas correctas cuando ejecutes el script:")
-        print("python Unificacion.py <ruta_torneo1> <ruta_torneo2> <ruta_torneo3> <ruta_torneo4> <ruta_torneo5> [ruta_salida]")
-        
-        # Si hay argumentos de línea de comandos, usarlos como rutas
-        if len(sys.argv) >= 6:
-            ruta_csv_torneo1 = sys.argv[1]
-            ruta_csv_torneo2 = sys.argv[2]
-            ruta_csv_torneo3 = sys.argv[3]
-            ruta_csv_torneo4 = sys.argv[4]
-            ruta_csv_torneo5 = sys.argv[5]
-            if len(sys.argv) >= 7:
-                ruta_salida = sys.argv[6]
-            print("\nUsando rutas desde argumentos de línea de comandos.")
-        else:
-            # Solicitar rutas al usuario
-            print("\nPor favor, ingresa las rutas completas a los archivos:")
-            ruta_csv_torneo1 = input("Ruta al CSV del torneo Apertura 2023A: ")
-            ruta_csv_torneo2 = input("Ruta al CSV del torneo Clausura 2023B: ")
-            ruta_csv_torneo3 = input("Ruta al CSV del torneo Apertura 2024A: ")
-            ruta_csv_torneo4 = input("Ruta al CSV del torneo Clausura 2024B: ")
-            ruta_csv_torneo5 = input("Ruta al CSV del torneo Apertura 2025A: ")
-            ruta_salida_input = input("Ruta de salida para el CSV unificado (deja en blanco para usar 'data/jugadores_unificados_cinco_torneos.csv'): ")
-            if ruta_salida_input:
-                ruta_salida = ruta_salida_input
+def main():
+    parser = argparse.ArgumentParser(description='Unifica los datos de jugadores de todos los torneos descargados')
+    parser.add_argument('--base', type=str, default=os.path.join("..", "scraper", "data"),
+                        help='Carpeta de datos del scraper con las carpetas <tipo>_<id>')
+    parser.add_argument('--modo', type=str, default="all",
+                        help="Modo de acumulación a unificar ('all' o 'per_90_mins')")
+    parser.add_argument('--salida', type=str, default=RUTA_SALIDA_PREDETERMINADA,
+                        help='Ruta del CSV unificado')
+    parser.add_argument('--registro', type=str, default=RUTA_REGISTRO_TORNEOS,
+                        help='Ruta del registro de torneos (JSON)')
+    parser.add_argument('--hilos', type=int, default=None,
+                        help='Número máximo de hilos para cargar los archivos')
+    
+    args = parser.parse_args()
     
     try:
+        registro = cargar_registro_torneos(args.registro)
+        torneos = descubrir_torneos(args.base, args.modo, registro)
+        
+        if not torneos:
+            print(f"ERROR: No se encontraron archivos {ARCHIVO_JUGADORES} en {args.base}/<tipo>_<id>/{args.modo}/")
+            sys.exit(1)
+        
+        print("Torneos encontrados (del más antiguo al más reciente):")
+        for torneo in torneos:
+            print(f"{torneo['nombre']}: {torneo['ruta']}")
+        
         # Procesar datos
-        df_unificado = procesar_datos_jugadores_cinco_torneos(
-            ruta_csv_torneo1, 
-            ruta_csv_torneo2, 
-            ruta_csv_torneo3,
-            ruta_csv_torneo4,
-            ruta_csv_torneo5,
-            ruta_salida
-        )
+        procesar_datos_jugadores_torneos(torneos, args.salida, max_workers=args.hilos)
         
         print("\nProceso completado. El archivo CSV unificado está listo para su análisis posterior.")
     except Exception as e:
         print(f"\nERROR: {str(e)}")
-        print("No se pudo completar el procesamiento de datos.")
\ No newline at end of file
+        print("No se pudo completar el procesamiento de datos.")
+        # Código de salida distinto de 0 para que pipeline.py no dé la etapa por ejecutada
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+import argparse
+import glob
+import numbers
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from esquemas import ESQUEMAS, aplicar_tipos
+from equipos import estandarizar_equipos
+from Unificacion import descubrir_torneos, cargar_torneos, cargar_registro_torneos
+
+# Normalización de los archivos por jugador y temporada de FBref (scraper/Fbref)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper', 'Fbref'))
+import Unificacion_año_jugador
+import Unificacion_año_GoalKeeper
+
+# Base de datos embebida con todos los datos descargados
+RUTA_ALMACEN = "data/almacen_futbol.db"
+
+# Carpeta de datos de los scrapers (torneos de SofaScore y carpetas de FBref)
+CARPETA_DATOS = os.path.join("..", "scraper", "data")
+
+# Modos de acumulación de SofaScore (subcarpetas de cada torneo)
+MODOS_SOFASCORE = ["all", "per_90_mins"]
+
+# Tablas del almacén: carpeta de origen, columnas de jugador, equipo, torneo y fecha,
+# índices y tipos con los que se devuelven los datos
+TABLAS = {
+    'sofascore_jugadores': {
+        'jugador': 'Name', 'equipo': 'Team', 'torneo': 'Torneo', 'fecha': None,
+        'indices': [('Name',), ('Team', 'Torneo'), ('Torneo', 'Modo')],
+        'tipos': {},
+    },
+    'partidos_jugadores': {
+        'carpeta': "Jugadores seleccionados", 'normalizador': Unificacion_año_jugador,
+        'jugador': 'Jugador', 'equipo': 'Equipo_Estandarizado', 'torneo': 'Temporada', 'fecha': 'Fecha',
+        'indices': [('Jugador', 'Fecha'), ('Equipo_Estandarizado', 'Fecha'), ('Fecha',), ('Temporada',)],
+        'tipos': ESQUEMAS['goleadores_unificados']['tipos'],
+    },
+    'partidos_porteros': {
+        'carpeta': "Porteros seleccionados", 'normalizador': Unificacion_año_GoalKeeper,
+        'jugador': 'Portero', 'equipo': 'Equipo_Estandarizado', 'torneo': 'Temporada', 'fecha': 'Fecha',
+        'indices': [('Portero', 'Fecha'), ('Equipo_Estandarizado', 'Fecha'), ('Fecha',), ('Temporada',)],
+        'tipos': ESQUEMAS['porteros_unificados']['tipos'],
+    },
+}
+
+# Operadores admitidos en los filtros de consultar()
+OPERADORES = {'=', '!=', '<', '<=', '>', '>=', 'LIKE', 'IN', 'NOT IN', 'BETWEEN'}
+
+def abrir_almacen(ruta=RUTA_ALMACEN):
+    """
+    Abre (o crea) el almacén y prepara la tabla de control de archivos ingeridos.
+    """
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS archivos_ingeridos (
+            ruta TEXT PRIMARY KEY, tabla TEXT, modificado REAL, tamano INTEGER, filas INTEGER, ingerido TEXT
+        )""")
+    return conexion
+
+def _citar(nombre):
+    """Identificador SQL entre comillas (las columnas tienen espacios y tildes)"""
+    return '"' + str(nombre).replace('"', '""') + '"'
+
+def columnas_tabla(conexion, tabla):
+    """Columnas de una tabla del almacén (lista vacía si no existe)"""
+    return [fila[1] for fila in conexion.execute(f"PRAGMA table_info({_citar(tabla)})")]
+
+def _tipo_sql(serie):
+    if pd.api.types.is_integer_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return "INTEGER"
+    if pd.api.types.is_numeric_dtype(serie):
+        return "REAL"
+    return "TEXT"
+
+def _insertar(conexion, tabla, df):
+    """
+    Inserta filas en una tabla, creándola o añadiendo las columnas que aún no tiene
+    (los archivos nuevos pueden traer estadísticas que los anteriores no tenían).
+    """
+    existentes = columnas_tabla(conexion, tabla)
+    if not existentes:
+        definicion = ', '.join(f"{_citar(col)} {_tipo_sql(df[col])}" for col in df.columns)
+        conexion.execute(f"CREATE TABLE {_citar(tabla)} ({definicion})")
+    else:
+        for col in df.columns:
+            if col not in existentes:
+                conexion.execute(f"ALTER TABLE {_citar(tabla)} ADD COLUMN {_citar(col)} {_tipo_sql(df[col])}")
+
+    # Fechas como texto ISO (se comparan bien como texto) y nulos como NULL
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime('%Y-%m-%d')
+    filas = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+    columnas = ', '.join(_citar(col) for col in df.columns)
+    marcadores = ', '.join('?' * len(df.columns))
+    conexion.executemany(f"INSERT INTO {_citar(tabla)} ({columnas}) VALUES ({marcadores})", filas)
+
+def crear_indices(conexion):
+    """Crea los índices de jugador, equipo, torneo y fecha de las tablas existentes"""
+    for tabla, config in TABLAS.items():
+        existentes = set(columnas_tabla(conexion, tabla))
+        for columnas in config['indices'] + [('_archivo',)]:
+            if existentes and set(columnas) <= existentes:
+                nombre = f"idx_{tabla}_{'_'.join(columnas)}".replace(' ', '_')
+                conexion.execute(f"CREATE INDEX IF NOT EXISTS {_citar(nombre)} ON {_citar(tabla)} "
+                                 f"({', '.join(_citar(col) for col in columnas)})")
+    conexion.execute("ANALYZE")
+
+def descubrir_archivos(carpeta_datos, registro=None):
+    """
+    Busca todos los archivos a ingerir.
+
+    - data/<tipo>_<id>/<modo>/jugadores_liga_colombiana_completo.csv (SofaScore; el archivo
+      combinado ya contiene las columnas de todas las categorías)
+    - data/Jugadores seleccionados/<jugador>/<año>_<jugador>.csv (FBref)
+    - data/Porteros seleccionados/<portero>/<año>_<portero>.csv (FBref)
+
+    Returns:
+        list: Diccionarios con 'ruta', 'tabla' y la información de origen
+    """
+    archivos = []
+    if os.path.isdir(carpeta_datos):
+        for modo in MODOS_SOFASCORE:
+            for torneo in descubrir_torneos(carpeta_datos, modo=modo, registro=registro):
+                id_torneo = os.path.basename(os.path.dirname(os.path.dirname(torneo['ruta']))).split('_')[-1]
+                archivos.append({'ruta': torneo['ruta'], 'tabla': 'sofascore_jugadores', 'torneo': torneo,
+                                 'modo': modo, 'id_torneo': id_torneo})
+
+    for tabla, config in TABLAS.items():
+        if 'carpeta' in config:
+            patron = os.path.join(carpeta_datos, config['carpeta'], '*', '*.csv')
+            archivos += [{'ruta': ruta, 'tabla': tabla} for ruta in sorted(glob.glob(patron))]
+
+    for archivo in archivos:
+        archivo['ruta'] = os.path.abspath(archivo['ruta'])
+    return archivos
+
+def leer_archivo(archivo):
+    """
+    Lee y normaliza un archivo con el mismo tratamiento que el resto del proyecto
+    (Unificacion.py para SofaScore y los unificadores de FBref para los partidos).
+
+    Returns:
+        DataFrame: Filas del archivo listas para insertar (None si no se pudo leer)
+    """
+    tabla = archivo['tabla']
+    if tabla == 'sofascore_jugadores':
+        df = cargar_torneos([archivo['torneo']])[0]
+        df['Id_Torneo'] = archivo['id_torneo']
+        df['Modo'] = archivo['modo']
+        return df
+
+    df = TABLAS[tabla]['normalizador'].procesar_archivo(archivo['ruta'])
+    if df is None:
+        return None
+    df['Fecha'] = pd.to_datetime(df['Fecha'], errors='coerce')
+    df['Temporada'] = pd.to_numeric(df['Temporada'], errors='coerce').astype('Int16')
+    df['Equipo_Estandarizado'] = estandarizar_equipos(df['Equipo'].astype(str).str.strip())
+    df['Oponente_Estandarizado'] = estandarizar_equipos(df['Oponente'].astype(str).str.strip())
+    return df
+
+def ingerir(carpeta_datos=CARPETA_DATOS, ruta_almacen=RUTA_ALMACEN, forzar=False, registro=None):
+    """
+    Carga en el almacén todos los archivos nuevos o modificados desde la última
+    ingesta y elimina las filas de los archivos que ya no existen. Cada fila guarda
+    su archivo de origen (_archivo), así que un archivo modificado se reemplaza
+    completo sin tocar el resto.
+
+    Args:
+        carpeta_datos: Carpeta de datos de los scrapers
+        ruta_almacen: Ruta de la base de datos
+        forzar: Si es True, vuelve a cargar todos los archivos
+        registro: Registro de torneos; si es None se carga desde torneos.json
+
+    Returns:
+        dict: Resumen con archivos cargados, omitidos, eliminados y filas insertadas
+    """
+    inicio = time.perf_counter()
+    registro = registro if registro is not None else cargar_registro_torneos()
+    archivos = descubrir_archivos(carpeta_datos, registro)
+    resumen = {'cargados': 0, 'omitidos': 0, 'eliminados': 0, 'filas': 0, 'errores': []}
+
+    conexion = abrir_almacen(ruta_almacen)
+    try:
+        ingeridos = {ruta: (tabla, modificado, tamano) for ruta, tabla, modificado, tamano
+                     in conexion.execute("SELECT ruta, tabla, modificado, tamano FROM archivos_ingeridos")}
+
+        with conexion:
+            # Archivos que desaparecieron de la carpeta de datos
+            rutas_actuales = {archivo['ruta'] for archivo in archivos}
+            for ruta, (tabla, _, _) in ingeridos.items():
+                if ruta not in rutas_actuales:
+                    if columnas_tabla(conexion, tabla):
+                        conexion.execute(f"DELETE FROM {_citar(tabla)} WHERE _archivo = ?", (ruta,))
+                    conexion.execute("DELETE FROM archivos_ingeridos WHERE ruta = ?", (ruta,))
+                    resumen['eliminados'] += 1
+
+            for archivo in archivos:
+                ruta, tabla = archivo['ruta'], archivo['tabla']
+                estado = os.stat(ruta)
+                if not forzar and ingeridos.get(ruta) == (tabla, estado.st_mtime, estado.st_size):
+                    resumen['omitidos'] += 1
+                    continue
+
+                df = leer_archivo(archivo)
+                if df is None:
+                    resumen['errores'].append(ruta)
+                    continue
+                df['_archivo'] = ruta
+
+                if columnas_tabla(conexion, tabla):
+                    conexion.execute(f"DELETE FROM {_citar(tabla)} WHERE _archivo = ?", (ruta,))
+                _insertar(conexion, tabla, df)
+                conexion.execute("INSERT OR REPLACE INTO archivos_ingeridos VALUES (?, ?, ?, ?, ?, ?)",
+                                 (ruta, tabla, estado.st_mtime, estado.st_size, len(df),
+                                  datetime.now().isoformat(timespec='seconds')))
+                resumen['cargados'] += 1
+                resumen['filas'] += len(df)
+
+            crear_indices(conexion)
+    finally:
+        conexion.close()
+
+    resumen['tiempo'] = time.perf_counter() - inicio
+    return resumen
+
+def _valor_sql(valor):
+    """Fechas como texto ISO, igual que se guardan en el almacén; escalares de numpy como tipos de Python"""
+    if isinstance(valor, (pd.Timestamp, datetime)):
+        return valor.strftime('%Y-%m-%d')
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+def _condicion(columna, filtro, parametros):
+    """
+    Traduce un filtro a SQL. El filtro puede ser un valor (igualdad), una lista
+    (IN), None (IS NULL) o una tupla (operador, valor), por ejemplo ('>=', '2023-01-01'),
+    ('LIKE', 'FW%') o ('BETWEEN', (desde, hasta)).
+    """
+    if filtro is None:
+        return f"{_citar(columna)} IS NULL"
+    if isinstance(filtro, (list, set)):
+        filtro = ('IN', list(filtro))
+    if not isinstance(filtro, tuple):
+        filtro = ('=', filtro)
+
+    operador, valor = filtro[0].upper(), filtro[1]
+    if operador not in OPERADORES:
+        raise ValueError(f"Operador no admitido: {operador}. Disponibles: {sorted(OPERADORES)}")
+    valor = [_valor_sql(v) for v in valor] if operador in ('IN', 'NOT IN', 'BETWEEN') else _valor_sql(valor)
+
+    if operador in ('IN', 'NOT IN'):
+        valores = valor
+        if not valores:
+            return "0" if operador == 'IN' else "1"
+        parametros.extend(valores)
+        return f"{_citar(columna)} {operador} ({', '.join('?' * len(valores))})"
+    if operador == 'BETWEEN':
+        parametros.extend(valor)
+        return f"{_citar(columna)} BETWEEN ? AND ?"
+    parametros.append(valor)
+    return f"{_citar(columna)} {operador} ?"
+
+def consultar(almacen, tabla, columnas=None, filtros=None, orden=None, limite=None):
+    """
+    Consulta una tabla del almacén. Solo se leen las columnas pedidas y los filtros
+    se resuelven en SQLite con los índices de jugador, equipo, torneo y fecha.
+
+    Args:
+        almacen: Conexión abierta con abrir_almacen o ruta de la base de datos
+        tabla: Tabla a consultar (ver TABLAS)
+        columnas: Columnas a devolver (None para todas)
+        filtros: Diccionario columna -> filtro (ver _condicion)
+        orden: Columna o lista de columnas de ordenación ('-Fecha' para descendente)
+        limite: Número máximo de filas
+
+    Returns:
+        DataFrame: Filas que cumplen los filtros, con los tipos del esquema
+    """
+    conexion = abrir_almacen(almacen) if isinstance(almacen, str) else almacen
+    try:
+        disponibles = columnas_tabla(conexion, tabla)
+        if not disponibles:
+            raise KeyError(f"La tabla '{tabla}' no existe en el almacén; ejecute primero la ingesta")
+
+        columnas = [col for col in disponibles if col != '_archivo'] if columnas is None else list(columnas)
+        orden = [orden] if isinstance(orden, str) else list(orden or [])
+        usadas = set(columnas) | set(filtros or {}) | {col.lstrip('-') for col in orden}
+        faltantes = [col for col in usadas if col not in disponibles]
+        if faltantes:
+            raise KeyError(f"Columnas no encontradas en '{tabla}': {faltantes}")
+
+        parametros = []
+        consulta = f"SELECT {', '.join(_citar(col) for col in columnas)} FROM {_citar(tabla)}"
+        if filtros:
+            consulta += " WHERE " + " AND ".join(_condicion(col, filtro, parametros) for col, filtro in filtros.items())
+        if orden:
+            consulta += " ORDER BY " + ", ".join(
+                f"{_citar(col.lstrip('-'))} {'DESC' if col.startswith('-') else 'ASC'}" for col in orden)
+        if limite is not None:
+            consulta += f" LIMIT {int(limite)}"
+
+        df = pd.read_sql_query(consulta, conexion, params=parametros)
+    finally:
+        if isinstance(almacen, str):
+            conexion.close()
+
+    config = TABLAS.get(tabla, {})
+    if config.get('fecha') in df.columns:
+        df[config['fecha']] = pd.to_datetime(df[config['fecha']], errors='coerce')
+    return aplicar_tipos(df, {col: tipo for col, tipo in config.get('tipos', {}).items() if col in df.columns})
+
+def partidos(almacen, jugador=None, equipo=None, posicion=None, desde=None, hasta=None, temporada=None,
+             columnas=None, porteros=False, orden='Fecha'):
+    """
+    Partidos de FBref filtrados por jugador, equipo, posición y fechas. Por ejemplo,
+    los partidos de los delanteros de Junior desde 2023:
+
+        partidos(almacen, equipo='Junior', posicion='FW', desde='2023-01-01')
+
+    Args:
+        almacen: Conexión o ruta del almacén
+        jugador: Jugador o lista de jugadores
+        equipo: Equipo o lista de equipos (cualquier alias; se usa el nombre canónico)
+        posicion: Posición de FBref (FW, MF, DF, GK); admite posiciones combinadas como 'FW,LW'
+        desde, hasta: Fechas límite (inclusivas)
+        temporada: Año o lista de años
+        columnas: Columnas a devolver (None para todas)
+        porteros: Si es True consulta los partidos de porteros
+
+    Returns:
+        DataFrame: Partidos ordenados por fecha
+    """
+    tabla = 'partidos_porteros' if porteros else 'partidos_jugadores'
+    config = TABLAS[tabla]
+    filtros = {}
+    if jugador is not None:
+        filtros[config['jugador']] = jugador if isinstance(jugador, str) else list(jugador)
+    if equipo is not None:
+        equipos = [equipo] if isinstance(equipo, str) else list(equipo)
+        canonicos = estandarizar_equipos(pd.Series(equipos, dtype=object)).tolist()
+        filtros[config['equipo']] = canonicos[0] if len(canonicos) == 1 else canonicos
+    if desde is not None and hasta is not None:
+        filtros['Fecha'] = ('BETWEEN', (pd.Timestamp(desde), pd.Timestamp(hasta)))
+    elif desde is not None:
+        filtros['Fecha'] = ('>=', pd.Timestamp(desde))
+    elif hasta is not None:
+        filtros['Fecha'] = ('<=', pd.Timestamp(hasta))
+    if temporada is not None:
+        filtros['Temporada'] = temporada if isinstance(temporada, numbers.Integral) else list(temporada)
+    if posicion is not None:
+        filtros['Posición'] = ('LIKE', f"%{posicion}%")
+    return consultar(almacen, tabla, columnas=columnas, filtros=filtros, orden=orden)
+
+def estadisticas_sofascore(almacen, jugador=None, equipo=None, torneo=None, modo="all", columnas=None):
+    """
+    Estadísticas de SofaScore por jugador y torneo (una fila por jugador, equipo y torneo).
+
+    Args:
+        almacen: Conexión o ruta del almacén
+        jugador: Jugador o lista de jugadores
+        equipo: Equipo o lista de equipos tal como aparecen en SofaScore
+        torneo: Torneo o lista de torneos ('Apertura 2025A', ...)
+        modo: 'all' o 'per_90_mins'
+        columnas: Columnas a devolver (None para todas)
+    """
+    filtros = {'Modo': modo}
+    for columna, valor in (('Name', jugador), ('Team', equipo), ('Torneo', torneo)):
+        if valor is not None:
+            filtros[columna] = valor if isinstance(valor, str) else list(valor)
+    return consultar(almacen, 'sofascore_jugadores', columnas=columnas, filtros=filtros)
+
+def describir_almacen(almacen=RUTA_ALMACEN):
+    """Filas y archivos de cada tabla del almacén"""
+    conexion = abrir_almacen(almacen) if isinstance(almacen, str) else almacen
+    try:
+        return pd.read_sql_query(
+            "SELECT tabla, COUNT(*) AS archivos, SUM(filas) AS filas, MAX(ingerido) AS ultima_ingesta "
+            "FROM archivos_ingeridos GROUP BY tabla ORDER BY tabla", conexion)
+    finally:
+        if isinstance(almacen, str):
+            conexion.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Carga los datos de los scrapers en el almacén SQLite')
+    parser.add_argument('--datos', type=str, default=CARPETA_DATOS,
+                        help='Carpeta de datos de los scrapers (torneos de SofaScore y carpetas de FBref)')
+    parser.add_argument('--almacen', type=str, default=RUTA_ALMACEN, help='Ruta de la base de datos')
+    parser.add_argument('--forzar', action='store_true', help='Volver a cargar todos los archivos')
+    args = parser.parse_args()
+
+    resumen = ingerir(args.datos, args.almacen, forzar=args.forzar)
+    print(f"\n✓ Ingesta completada en {resumen['tiempo']:.2f} s: {resumen['cargados']} archivos cargados "
+          f"({resumen['filas']} filas), {resumen['omitidos']} sin cambios, {resumen['eliminados']} eliminados")
+    for ruta in resumen['errores']:
+        print(f"  Error al leer {ruta}")
+    print(describir_almacen(args.almacen).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
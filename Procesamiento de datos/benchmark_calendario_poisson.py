@@ -0,0 +1,254 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+import statsmodels.formula.api as smf
+from scipy.stats import poisson
+
+from calendario_poisson import (preparar_calendario, puntuar_calendario_poisson, formatear_predicciones,
+                                MAPEO_JUGADORES_CALENDARIO, EQUIPOS_JUGADORES)
+from equipos import REGISTRO_EQUIPOS, NOMBRES_EQUIPOS, estandarizar_equipo
+
+def preparar_calendario_iterativo(calendario):
+    """
+    Preparación anterior del calendario (apply por fila), usada como referencia.
+    """
+    calendario = calendario.copy()
+    mapeo_inverso = {v: k for k, v in MAPEO_JUGADORES_CALENDARIO.items()}
+    calendario['Equipo_Local_Estandarizado'] = calendario['Equipo_Local'].apply(lambda n: estandarizar_equipo(n) or n)
+    calendario['Equipo_Visitante_Estandarizado'] = calendario['Equipo_Visitante'].apply(lambda n: estandarizar_equipo(n) or n)
+    calendario['Jugador_Estandarizado'] = calendario['Jugador'].apply(lambda n: MAPEO_JUGADORES_CALENDARIO.get(n, n))
+    calendario['Equipo_Jugador'] = calendario['Jugador_Estandarizado'].map(EQUIPOS_JUGADORES)
+    calendario['Es_Local'] = calendario.apply(
+        lambda row: row['Equipo_Local_Estandarizado'] == row['Equipo_Jugador'], axis=1)
+    calendario['Oponente'] = calendario.apply(
+        lambda row: row['Equipo_Visitante_Estandarizado'] if row['Es_Local'] else row['Equipo_Local_Estandarizado'], axis=1)
+    return calendario, mapeo_inverso
+
+def puntuar_calendario_iterativo(calendario, datos_historicos, modelos):
+    """
+    Implementación anterior de predecir_goles_poisson_calendario_2025 (iterrows y un
+    predict por fila), sin la carga de archivos ni los mensajes por pantalla.
+    """
+    calendario, mapeo_inverso = preparar_calendario_iterativo(calendario)
+
+    predicciones = calendario[['Fecha_Numero', 'Fecha', 'Jugador_Estandarizado', 'Equipo_Local_Estandarizado',
+                              'Equipo_Visitante_Estandarizado', 'Es_Local', 'Oponente']].copy()
+    predicciones['Prediccion_Goles'] = 0.0
+    predicciones['Tiros_Puerta_Estimados'] = 0.0
+    predicciones['Tiros_Totales_Estimados'] = 0.0
+    predicciones['Factor_Oponente'] = 0.0
+    predicciones['Promedio_Historico_vs_Oponente'] = 0.0
+    predicciones['Tipo_Modelo'] = ''
+    predicciones['Num_Coeficientes'] = 0
+    predicciones['RMSE_Modelo'] = 0.0
+    predicciones['Porcentaje_Acierto_Modelo'] = 0.0
+    for i in range(5):
+        predicciones[f'P{i}'] = 0.0
+    predicciones['Promedio_Goles_General'] = 0.0
+    predicciones['Total_Goles_Historicos'] = 0
+    predicciones['Total_Partidos'] = 0
+    predicciones['Promedio_Goles_Local'] = 0.0
+    predicciones['Promedio_Goles_Visitante'] = 0.0
+    predicciones['Partidos_vs_Oponente'] = 0
+
+    for jugador in calendario['Jugador_Estandarizado'].unique():
+        if jugador not in modelos:
+            continue
+        modelo_guardado = modelos[jugador]
+        modelo_entrenado = modelo_guardado['modelo_entrenado']
+        features = modelo_guardado['modelo_config']['features']
+        num_coeficientes = modelo_guardado['modelo_config'].get('num_coeficientes', 0)
+        normalization_info = modelo_guardado.get('normalization_info', {})
+        rmse = modelo_guardado.get('metricas', {}).get('RMSE', 0.0)
+        porcentaje_acierto = modelo_guardado.get('metricas', {}).get('Acierto', 0.0)
+
+        partidos_jugador = calendario[calendario['Jugador_Estandarizado'] == jugador]
+        for idx, partido in partidos_jugador.iterrows():
+            oponente = partido['Oponente']
+            es_local = partido['Es_Local']
+            predicciones.loc[idx, 'Tipo_Modelo'] = 'Poisson'
+            predicciones.loc[idx, 'Num_Coeficientes'] = num_coeficientes
+            predicciones.loc[idx, 'RMSE_Modelo'] = rmse
+            predicciones.loc[idx, 'Porcentaje_Acierto_Modelo'] = porcentaje_acierto
+
+            jugador_id = mapeo_inverso.get(jugador, jugador)
+            df_hist = datos_historicos[datos_historicos['Jugador'] == jugador_id].copy()
+            if len(df_hist) == 0:
+                continue
+
+            promedio_goles = df_hist['Goles'].mean()
+            goles_local = df_hist[df_hist['Sede_Local'] == 1]['Goles'].mean() if 'Sede_Local' in df_hist.columns else None
+            goles_visitante = df_hist[df_hist['Sede_Visitante'] == 1]['Goles'].mean() if 'Sede_Visitante' in df_hist.columns else None
+            df_vs_oponente = df_hist[df_hist['Oponente_Estandarizado'] == oponente].copy()
+            partidos_vs_oponente = len(df_vs_oponente)
+            promedio_vs_oponente = df_vs_oponente['Goles'].mean() if partidos_vs_oponente > 0 else promedio_goles
+            factor_oponente = (promedio_vs_oponente + 0.1) / (promedio_goles + 0.1) if promedio_goles > 0 else 1.0
+
+            predicciones.loc[idx, 'Promedio_Goles_General'] = promedio_goles
+            predicciones.loc[idx, 'Total_Goles_Historicos'] = df_hist['Goles'].sum()
+            predicciones.loc[idx, 'Total_Partidos'] = len(df_hist)
+            predicciones.loc[idx, 'Promedio_Goles_Local'] = goles_local or 0.0
+            predicciones.loc[idx, 'Promedio_Goles_Visitante'] = goles_visitante or 0.0
+            predicciones.loc[idx, 'Partidos_vs_Oponente'] = partidos_vs_oponente
+            predicciones.loc[idx, 'Promedio_Historico_vs_Oponente'] = promedio_vs_oponente
+            predicciones.loc[idx, 'Factor_Oponente'] = factor_oponente
+
+            tiros_puerta = df_hist['Tiros_a_puerta'].mean() if 'Tiros_a_puerta' in df_hist.columns else 1.5
+            tiros_totales = df_hist['Tiros_totales'].mean() if 'Tiros_totales' in df_hist.columns else 2.5
+            n_recientes = min(5, len(df_hist))
+            goles_prom_recientes = df_hist.sort_values('Fecha', ascending=False).head(n_recientes)['Goles'].mean()
+            predicciones.loc[idx, 'Tiros_Puerta_Estimados'] = tiros_puerta
+            predicciones.loc[idx, 'Tiros_Totales_Estimados'] = tiros_totales
+
+            predict_data = pd.DataFrame(index=[0])
+            if 'Sede_Local' in features:
+                predict_data['Sede_Local'] = [1 if es_local else 0]
+            if 'Sede_Visitante' in features:
+                predict_data['Sede_Visitante'] = [0 if es_local else 1]
+            for feature in features:
+                if feature in ['Sede_Local', 'Sede_Visitante'] or feature in predict_data.columns:
+                    continue
+                if feature.endswith('_norm'):
+                    base_feature = feature.replace('_norm', '')
+                    if base_feature.startswith('Tiros_totales') or base_feature.startswith('Tiros_Totales'):
+                        base_val = tiros_totales
+                    elif base_feature.startswith('Tiros_a_puerta') or base_feature.startswith('Tiros_Puerta'):
+                        base_val = tiros_puerta
+                    elif base_feature.startswith('Minutos'):
+                        base_val = 90.0
+                    elif base_feature.startswith('Goles_Prom_3') or base_feature.startswith('Goles_Prom_5'):
+                        base_val = goles_prom_recientes
+                    elif base_feature.startswith('Factor_Oponente'):
+                        base_val = factor_oponente
+                    elif base_feature.startswith('Indice_Ofensivo'):
+                        base_val = df_hist['Indice_Ofensivo'].mean() if 'Indice_Ofensivo' in df_hist.columns else 2.0
+                    else:
+                        base_val = 0
+                    if base_feature in normalization_info:
+                        mean_val = normalization_info[base_feature]['mean']
+                        std_val = normalization_info[base_feature]['std']
+                        normalized_val = (base_val - mean_val) / std_val if std_val > 0 else 0
+                    else:
+                        normalized_val = base_val
+                    predict_data[feature] = [normalized_val]
+                else:
+                    predict_data[feature] = [0]
+
+            lambda_pred = modelo_entrenado.predict(predict_data[features].copy())
+            valor_predicho_raw = float(lambda_pred.iloc[0]) if hasattr(lambda_pred, 'iloc') else float(lambda_pred[0])
+            valor_predicho = min(max(0, valor_predicho_raw), 5.0)
+            predicciones.loc[idx, 'Prediccion_Goles'] = round(valor_predicho, 2)
+            for i in range(5):
+                prob = poisson.pmf(i, valor_predicho) if i < 4 else 1 - poisson.cdf(3, valor_predicho)
+                predicciones.loc[idx, f'P{i}'] = round(prob, 3)
+
+    return formatear_predicciones(predicciones)
+
+def generar_datos_sinteticos(n_jugadores, partidos_historicos, semilla=42):
+    """
+    Genera datos históricos, un calendario de liga completa y un modelo Poisson
+    (con la misma estructura que los del notebook) para cada jugador.
+    """
+    rng = np.random.default_rng(semilla)
+    equipos = sorted(NOMBRES_EQUIPOS)
+    jugadores = list(MAPEO_JUGADORES_CALENDARIO)[:n_jugadores] + [f"Jugador_{i}" for i in range(max(0, n_jugadores - 5))]
+
+    filas = []
+    for jugador in jugadores:
+        n = partidos_historicos
+        filas.append(pd.DataFrame({
+            'Jugador': jugador,
+            'Fecha': pd.Timestamp('2021-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 1500, n)), unit='D'),
+            'Oponente_Estandarizado': rng.choice(equipos, n),
+            'Sede_Local': rng.integers(0, 2, n),
+            'Goles': rng.poisson(0.4, n),
+            'Tiros_a_puerta': rng.poisson(1.2, n),
+            'Tiros_totales': rng.poisson(2.5, n),
+            'Minutos': rng.integers(10, 91, n),
+        }))
+    historicos = pd.concat(filas, ignore_index=True)
+    historicos['Sede_Visitante'] = 1 - historicos['Sede_Local']
+
+    # Un modelo por jugador con variables normalizadas, de sede y de oponente
+    modelos = {}
+    for jugador, df_hist in historicos.groupby('Jugador'):
+        df_hist = df_hist.copy()
+        df_hist['Goles_Prom_3'] = df_hist['Goles'].rolling(3, min_periods=1).mean()
+        normalization_info = {}
+        for base in ['Tiros_a_puerta', 'Tiros_totales', 'Minutos', 'Goles_Prom_3']:
+            normalization_info[base] = {'mean': df_hist[base].mean(), 'std': df_hist[base].std()}
+            df_hist[f'{base}_norm'] = (df_hist[base] - normalization_info[base]['mean']) / normalization_info[base]['std']
+        df_hist['Oponente_Junior'] = (df_hist['Oponente_Estandarizado'] == 'Junior').astype(int)
+        features = ['Tiros_a_puerta_norm', 'Tiros_totales_norm', 'Minutos_norm', 'Goles_Prom_3_norm',
+                    'Sede_Local', 'Oponente_Junior']
+        modelo = smf.glm("Goles ~ " + " + ".join(features), data=df_hist, family=sm.families.Poisson()).fit()
+        nombre = MAPEO_JUGADORES_CALENDARIO.get(jugador, jugador)
+        modelos[nombre] = {
+            'modelo_entrenado': modelo,
+            'modelo_config': {'formula': "Goles ~ " + " + ".join(features), 'features': features,
+                              'tipo_modelo': 'Poisson', 'num_coeficientes': len(modelo.params)},
+            'metricas': {'RMSE': rng.uniform(0.4, 1.0), 'Acierto': rng.uniform(60, 90)},
+            'normalization_info': normalization_info,
+        }
+
+    # Calendario: todos los partidos de ida y vuelta, cada jugador en los partidos de su equipo
+    calendario = []
+    # En el calendario cada equipo aparece con su primer alias, como en la fuente original
+    nombres_calendario = {entrada['nombre']: (entrada['alias'] or [entrada['nombre']])[0] for entrada in REGISTRO_EQUIPOS.values()}
+    for jugador in jugadores:
+        equipo = EQUIPOS_JUGADORES.get(MAPEO_JUGADORES_CALENDARIO.get(jugador, jugador), rng.choice(equipos))
+        for fecha, rival in enumerate(e for e in equipos if e != equipo):
+            local, visitante = (equipo, rival) if fecha % 2 == 0 else (rival, equipo)
+            calendario.append({
+                'Fecha_Numero': fecha + 1,
+                'Fecha': pd.Timestamp('2025-01-20') + pd.Timedelta(days=7 * fecha),
+                'Equipo_Local': nombres_calendario.get(local, local),
+                'Equipo_Visitante': nombres_calendario.get(visitante, visitante),
+                'Jugador': jugador,
+            })
+    calendario = pd.DataFrame(calendario)
+
+    return historicos, calendario, modelos
+
+def medir(funcion, repeticiones):
+    """Devuelve el mejor tiempo (en segundos) de varias ejecuciones y el último resultado"""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la predicción del calendario con modelos Poisson')
+    parser.add_argument('--jugadores', type=int, default=20, help='Jugadores en el calendario')
+    parser.add_argument('--partidos', type=int, default=150, help='Partidos históricos por jugador')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Ejecuciones de la versión vectorizada')
+    args = parser.parse_args()
+
+    historicos, calendario, modelos = generar_datos_sinteticos(args.jugadores, args.partidos)
+    print(f"Datos sintéticos: {len(historicos)} partidos históricos, {len(calendario)} filas de calendario, "
+          f"{len(modelos)} modelos")
+
+    tiempo_iterativo, resultado_iterativo = medir(
+        lambda: puntuar_calendario_iterativo(calendario, historicos, modelos), 1)
+    tiempo_vectorizado, resultado_vectorizado = medir(
+        lambda: formatear_predicciones(puntuar_calendario_poisson(preparar_calendario(calendario), historicos, modelos)),
+        args.repeticiones)
+
+    # El CSV debe ser idéntico
+    csv_iterativo = resultado_iterativo.to_csv(index=False)
+    csv_vectorizado = resultado_vectorizado.to_csv(index=False)
+    assert csv_iterativo == csv_vectorizado, "Los CSV de ambas implementaciones no coinciden"
+    print("✓ Los CSV de ambas implementaciones coinciden")
+
+    print(f"Iterativo:   {tiempo_iterativo:.3f} s")
+    print(f"Vectorizado: {tiempo_vectorizado:.3f} s")
+    print(f"Aceleración: {tiempo_iterativo / tiempo_vectorizado:.1f}x")
+
+if __name__ == "__main__":
+    main()
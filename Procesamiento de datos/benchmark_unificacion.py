@@ -0,0 +1,107 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from Unificacion import unificar_jugadores_duplicados
+
+# Tamaño aproximado del archivo combinado actual (cinco torneos)
+FILAS_ACTUALES = 3000
+
+def unificar_jugadores_duplicados_iterativo(df):
+    """
+    Implementación anterior (un bucle por grupo y columna), usada como referencia
+    para comprobar que la versión vectorizada da el mismo resultado.
+    """
+    columnas_clave = ['Team', 'Name', 'Torneo']
+    filas_procesadas = []
+
+    for nombre_grupo, grupo in df.groupby(columnas_clave):
+        fila_unificada = {}
+
+        for i, col in enumerate(columnas_clave):
+            fila_unificada[col] = nombre_grupo[i]
+
+        for columna in df.columns:
+            if columna not in columnas_clave and columna != 'Position':
+                valores_no_nulos = grupo[columna].dropna()
+                if not valores_no_nulos.empty:
+                    fila_unificada[columna] = valores_no_nulos.iloc[0]
+                else:
+                    fila_unificada[columna] = None
+
+        filas_procesadas.append(fila_unificada)
+
+    return pd.DataFrame(filas_procesadas)
+
+def generar_datos_sinteticos(n_filas, semilla=42):
+    """
+    Genera un DataFrame con la estructura del archivo combinado del scraper:
+    cada jugador aparece varias veces por torneo (una fila por categoría)
+    con estadísticas parciales y muchos valores nulos.
+    """
+    rng = np.random.default_rng(semilla)
+
+    torneos = ["Apertura 2023A", "Clausura 2023B", "Apertura 2024A", "Clausura 2024B", "Apertura 2025A"]
+    equipos = [f"Equipo {i}" for i in range(20)]
+    estadisticas = ['Goals', 'Assists', 'Expected Goals (xG)', 'Successful Dribbles', 'Tackles',
+                    'Accurate Passes %', 'Clearances', 'Saves', 'Big Chances Created', 'Interceptions',
+                    'Total Shots', 'Shots on Target', 'Key Passes', 'Minutes Played', 'Appearances']
+
+    n_jugadores = max(1, n_filas // 4)
+    jugadores = rng.integers(0, n_jugadores, n_filas)
+
+    df = pd.DataFrame({
+        'Team': np.array(equipos)[jugadores % len(equipos)],
+        'Name': [f"Jugador {j}" for j in jugadores],
+        'Position': rng.choice(['F', 'M', 'D', 'G'], n_filas),
+        'Torneo': rng.choice(torneos, n_filas),
+    })
+
+    for estadistica in estadisticas:
+        valores = rng.gamma(2.0, 3.0, n_filas).round(2)
+        valores[rng.random(n_filas) < 0.7] = np.nan
+        df[estadistica] = valores
+
+    return df
+
+def medir(funcion, df, repeticiones):
+    """Devuelve el mejor tiempo (en segundos) de varias ejecuciones y el último resultado"""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(df)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la unificación de jugadores duplicados')
+    parser.add_argument('--filas', type=int, default=FILAS_ACTUALES, help='Número de filas del volumen actual')
+    parser.add_argument('--factor', type=int, default=10, help='Multiplicador del volumen actual')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Ejecuciones por implementación')
+    args = parser.parse_args()
+
+    n_filas = args.filas * args.factor
+    df = generar_datos_sinteticos(n_filas)
+    n_grupos = df.groupby(['Team', 'Name', 'Torneo']).ngroups
+    print(f"Datos sintéticos: {n_filas} filas, {n_grupos} grupos (Team, Name, Torneo), {len(df.columns)} columnas")
+
+    tiempo_iterativo, resultado_iterativo = medir(unificar_jugadores_duplicados_iterativo, df, args.repeticiones)
+    tiempo_vectorizado, resultado_vectorizado = medir(unificar_jugadores_duplicados, df, args.repeticiones)
+
+    # Ambas versiones deben producir exactamente los mismos valores
+    pd.testing.assert_frame_equal(
+        resultado_iterativo.astype({col: 'float64' for col in resultado_iterativo.columns[3:]}),
+        resultado_vectorizado,
+        check_dtype=False
+    )
+    print("✓ Los resultados de ambas implementaciones coinciden")
+
+    print(f"Iterativo:   {tiempo_iterativo:.3f} s")
+    print(f"Vectorizado: {tiempo_vectorizado:.3f} s")
+    print(f"Aceleración: {tiempo_iterativo / tiempo_vectorizado:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import poisson
+
+from equipos import estandarizar_equipos
+
+# Nombres de jugadores del calendario -> nombres usados en el registro de modelos
+MAPEO_JUGADORES_CALENDARIO = {
+    'Carlos_Bacca': 'Carlos Bacca',
+    'Dayro_Moreno': 'Dayro Moreno',
+    'Hugo_Rodallega': 'Hugo Rodallega',
+    'Leonardo_Castro': 'Leonardo Castro',
+    'Marco_Perez': 'Marco Perez'
+}
+
+# Nombres del registro -> identificadores de la columna 'Jugador' de los datos históricos
+MAPEO_JUGADORES_HISTORICOS = {estandar: original for original, estandar in MAPEO_JUGADORES_CALENDARIO.items()}
+
+# Equipo de cada jugador
+EQUIPOS_JUGADORES = {
+    'Carlos Bacca': 'Junior',
+    'Dayro Moreno': 'Once Caldas',
+    'Hugo Rodallega': 'Independiente Santa Fe',
+    'Leonardo Castro': 'Millonarios',
+    'Marco Perez': 'Junior'
+}
+
+# Columnas numéricas que se redondean a 2 decimales en el CSV final
+COLUMNAS_REDONDEADAS = ['Prediccion_Goles', 'Tiros_Puerta_Estimados', 'Tiros_Totales_Estimados',
+                        'Promedio_Historico_vs_Oponente', 'RMSE_Modelo', 'Porcentaje_Acierto_Modelo',
+                        'Promedio_Goles_General', 'Promedio_Goles_Local', 'Promedio_Goles_Visitante']
+
+def _mapear(serie, mapeo):
+    """
+    Traduce una columna con una tabla de equivalencias; los valores sin entrada se conservan.
+    """
+    return serie.map(mapeo).fillna(serie)
+
+def preparar_calendario(calendario):
+    """
+    Estandariza equipos y jugadores del calendario y calcula, para cada fila,
+    si el jugador juega como local y cuál es su oponente.
+
+    Returns:
+        DataFrame: Calendario con las columnas *_Estandarizado, Equipo_Jugador, Es_Local y Oponente
+    """
+    calendario = calendario.copy()
+    calendario['Equipo_Local_Estandarizado'] = estandarizar_equipos(calendario['Equipo_Local'])
+    calendario['Equipo_Visitante_Estandarizado'] = estandarizar_equipos(calendario['Equipo_Visitante'])
+    calendario['Jugador_Estandarizado'] = _mapear(calendario['Jugador'], MAPEO_JUGADORES_CALENDARIO)
+    calendario['Equipo_Jugador'] = calendario['Jugador_Estandarizado'].map(EQUIPOS_JUGADORES)
+
+    calendario['Es_Local'] = (calendario['Equipo_Local_Estandarizado'] == calendario['Equipo_Jugador']).to_numpy(dtype=bool)
+    calendario['Oponente'] = np.where(
+        calendario['Es_Local'],
+        calendario['Equipo_Visitante_Estandarizado'],
+        calendario['Equipo_Local_Estandarizado']
+    )
+    return calendario
+
+def estadisticas_historicas(datos_historicos):
+    """
+    Estadísticas históricas de todos los jugadores (las que no dependen del partido
+    a predecir) calculadas con una sola agrupación.
+
+    Returns:
+        DataFrame: Una fila por valor de 'Jugador' con promedio_goles, total_goles,
+                   total_partidos, goles_local, goles_visitante, tiros_puerta,
+                   tiros_totales, goles_prom_recientes e indice_ofensivo
+    """
+    grupos = datos_historicos.groupby('Jugador')
+    stats = pd.DataFrame({
+        'promedio_goles': grupos['Goles'].mean(),
+        'total_goles': grupos['Goles'].sum(),
+        'total_partidos': grupos.size(),
+    })
+
+    # Rendimiento local/visitante (NaN si el jugador no tiene partidos en esa sede)
+    for columna, sede in (('goles_local', 'Sede_Local'), ('goles_visitante', 'Sede_Visitante')):
+        if sede in datos_historicos.columns:
+            en_sede = datos_historicos[datos_historicos[sede] == 1]
+            stats[columna] = en_sede.groupby('Jugador')['Goles'].mean().reindex(stats.index)
+        else:
+            stats[columna] = 0.0
+
+    # Promedios de tiros e índice ofensivo, con valores por defecto si faltan las columnas
+    for columna, origen, defecto in (('tiros_puerta', 'Tiros_a_puerta', 1.5),
+                                     ('tiros_totales', 'Tiros_totales', 2.5),
+                                     ('indice_ofensivo', 'Indice_Ofensivo', 2.0)):
+        stats[columna] = grupos[origen].mean() if origen in datos_historicos.columns else defecto
+
+    # Goles promedio de los últimos 5 partidos de cada jugador
+    recientes = datos_historicos.sort_values('Fecha', ascending=False, kind='stable').groupby('Jugador').head(5)
+    stats['goles_prom_recientes'] = recientes.groupby('Jugador')['Goles'].mean()
+
+    return stats
+
+def _valor_base(base_feature, stats, factor_oponente):
+    """
+    Valor sin normalizar de una característica '_norm' estimado a partir del historial.
+    """
+    if base_feature.startswith('Tiros_totales') or base_feature.startswith('Tiros_Totales'):
+        return stats['tiros_totales']
+    if base_feature.startswith('Tiros_a_puerta') or base_feature.startswith('Tiros_Puerta'):
+        return stats['tiros_puerta']
+    if base_feature.startswith('Minutos'):
+        return 90.0
+    if base_feature.startswith('Goles_Prom_3') or base_feature.startswith('Goles_Prom_5'):
+        return stats['goles_prom_recientes']
+    if base_feature.startswith('Factor_Oponente'):
+        return factor_oponente
+    if base_feature.startswith('Indice_Ofensivo'):
+        return stats['indice_ofensivo']
+    # Valor predeterminado para otras variables
+    return 0
+
+def construir_matriz_prediccion(features, normalization_info, stats, es_local, factor_oponente):
+    """
+    Construye de una vez las características de todos los partidos de un jugador.
+
+    Args:
+        features: Variables del modelo (en el orden de la fórmula)
+        normalization_info: Media y desviación de cada variable base usadas en el entrenamiento
+        stats: Estadísticas de estadisticas_jugador
+        es_local: Arreglo booleano, una posición por partido
+        factor_oponente: Arreglo con el factor del oponente de cada partido
+
+    Returns:
+        dict: Característica -> arreglo con un valor por partido
+    """
+    n = len(es_local)
+    columnas = {}
+
+    for feature in features:
+        if feature == 'Sede_Local':
+            columnas[feature] = es_local.astype(int)
+        elif feature == 'Sede_Visitante':
+            columnas[feature] = (~es_local).astype(int)
+        elif feature.endswith('_norm'):
+            base_feature = feature.replace('_norm', '')
+            base_val = _valor_base(base_feature, stats, factor_oponente)
+
+            # Normalizar usando la información guardada si está disponible
+            if base_feature in normalization_info:
+                mean_val = normalization_info[base_feature]['mean']
+                std_val = normalization_info[base_feature]['std']
+                valor = (base_val - mean_val) / std_val if std_val > 0 else 0
+            else:
+                valor = base_val
+            columnas[feature] = np.broadcast_to(np.asarray(valor, dtype='float64'), (n,)).copy()
+        else:
+            # Variables de oponente u otras categóricas: valor por defecto
+            columnas[feature] = np.zeros(n, dtype=int)
+
+    return columnas
+
+def predecir_tasas(modelo_entrenado, X):
+    """
+    Calcula la tasa lambda de todas las filas con un único producto matriz-vector.
+
+    Cuando la fórmula solo usa columnas numéricas (el caso de los modelos del notebook)
+    se arma la matriz de diseño directamente en el orden de los coeficientes y se
+    evita patsy, que domina el tiempo de predict con muchos modelos; en otro caso
+    se usa predict del modelo.
+
+    Args:
+        modelo_entrenado: Resultado de smf.glm(...).fit()
+        X: Diccionario característica -> arreglo (construir_matriz_prediccion)
+    """
+    nombres = list(modelo_entrenado.model.exog_names)
+    n = len(next(iter(X.values()))) if X else 0
+    if all(nombre == 'Intercept' or nombre in X for nombre in nombres):
+        exog = np.column_stack([
+            np.ones(n) if nombre == 'Intercept' else np.asarray(X[nombre], dtype='float64')
+            for nombre in nombres
+        ])
+        return modelo_entrenado.model.predict(np.asarray(modelo_entrenado.params), exog)
+    return np.asarray(modelo_entrenado.predict(pd.DataFrame(X)), dtype='float64')
+
+def redondear(valores, decimales):
+    """
+    Redondea como round() de Python pero vectorizado: np.round solo puede diferir
+    cerca de la mitad entre dos valores, y esos pocos casos se redondean con round().
+    """
+    valores = np.asarray(valores, dtype='float64')
+    redondeados = np.round(valores, decimales)
+    escalados = np.abs(valores * 10.0 ** decimales)
+    cerca_de_la_mitad = np.abs(escalados - np.floor(escalados) - 0.5) < 1e-6
+    redondeados[cerca_de_la_mitad] = [round(v, decimales) for v in valores[cerca_de_la_mitad]]
+    return redondeados
+
+def puntuar_calendario_poisson(calendario, datos_historicos, modelos):
+    """
+    Predice los goles de cada (partido, jugador) del calendario. Las estadísticas
+    históricas y el historial contra cada oponente se calculan para todas las
+    filas a la vez y cada modelo se evalúa con una sola operación matricial.
+
+    Args:
+        calendario: Calendario preparado con preparar_calendario
+        datos_historicos: Datos históricos con las columnas sin espacios
+        modelos: Diccionario jugador estandarizado -> modelo guardado (registro de modelos)
+
+    Returns:
+        DataFrame: Predicciones con las mismas columnas que el cálculo fila a fila
+    """
+    predicciones = calendario[['Fecha_Numero', 'Fecha', 'Jugador_Estandarizado', 'Equipo_Local_Estandarizado',
+                               'Equipo_Visitante_Estandarizado', 'Es_Local', 'Oponente']].copy()
+    n = len(predicciones)
+    jugadores = predicciones['Jugador_Estandarizado']
+    oponentes = predicciones['Oponente'].to_numpy()
+    es_local = predicciones['Es_Local'].to_numpy(dtype=bool)
+
+    # Información del modelo de cada fila (filas sin modelo quedan en cero)
+    con_modelo = jugadores.isin(list(modelos)).to_numpy()
+    info_modelos = pd.DataFrame({
+        'Num_Coeficientes': {j: m['modelo_config'].get('num_coeficientes', 0) for j, m in modelos.items()},
+        'RMSE_Modelo': {j: m.get('metricas', {}).get('RMSE', 0.0) for j, m in modelos.items()},
+        'Porcentaje_Acierto_Modelo': {j: m.get('metricas', {}).get('Acierto', 0.0) for j, m in modelos.items()},
+    }).reindex(jugadores)
+
+    # Estadísticas históricas por jugador y por (jugador, oponente), alineadas con las filas
+    jugador_id = jugadores.map(MAPEO_JUGADORES_HISTORICOS).fillna(jugadores)
+    stats = estadisticas_historicas(datos_historicos)
+    stats_filas = stats.reindex(jugador_id)
+    con_historial = con_modelo & jugador_id.isin(stats.index).to_numpy()
+
+    por_oponente = datos_historicos.groupby(['Jugador', 'Oponente_Estandarizado'])['Goles'].agg(['size', 'mean'])
+    vs_oponente = por_oponente.reindex(pd.MultiIndex.from_arrays([jugador_id, oponentes]))
+    partidos_vs_oponente = vs_oponente['size'].fillna(0).to_numpy(dtype=int)
+    promedio_goles = stats_filas['promedio_goles'].to_numpy(dtype='float64')
+    promedio_vs_oponente = np.where(partidos_vs_oponente > 0, vs_oponente['mean'].to_numpy(dtype='float64'), promedio_goles)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        factor_oponente = np.where(promedio_goles > 0, (promedio_vs_oponente + 0.1) / (promedio_goles + 0.1), 1.0)
+
+    # Predicción: una evaluación por modelo sobre todas sus filas
+    valor_predicho = np.zeros(n)
+    respaldo = np.zeros(n, dtype=bool)
+    posiciones = pd.Series(np.arange(n)).groupby(jugadores.to_numpy()).indices
+
+    for jugador, modelo_guardado in modelos.items():
+        filas = posiciones.get(jugador)
+        if filas is None:
+            continue
+        if not con_historial[filas[0]]:
+            print(f"    No se encontraron datos históricos para {jugador}")
+            continue
+
+        config = modelo_guardado['modelo_config']
+        try:
+            X = construir_matriz_prediccion(config['features'], modelo_guardado.get('normalization_info', {}),
+                                            stats_filas.iloc[filas[0]].to_dict(), es_local[filas], factor_oponente[filas])
+            valores_raw = predecir_tasas(modelo_guardado['modelo_entrenado'], X)
+
+            # La predicción es la tasa lambda de Poisson: limitarla a un rango razonable para goles
+            valor_predicho[filas] = np.minimum(np.maximum(0, valores_raw), 5.0)
+            extremos = valores_raw > 5.0
+            for oponente, raw, valor in zip(oponentes[filas][extremos], valores_raw[extremos], valor_predicho[filas][extremos]):
+                print(f"    ⚠️ Valor predicho extremo para {jugador} vs {oponente}: {raw:.2f} → {valor:.2f}")
+        except Exception as e:
+            print(f"    Error al predecir para {jugador}: {str(e)}")
+            # Valor de respaldo basado en el historial (máximo 2 goles)
+            valor_predicho[filas] = np.minimum(promedio_vs_oponente[filas], 2.0)
+            respaldo[filas] = True
+
+    # Columnas de salida (mismo orden y valores por defecto que el cálculo fila a fila)
+    def con_historial_o(valores, defecto=0.0):
+        return np.where(con_historial, valores, defecto)
+
+    predicciones['Prediccion_Goles'] = con_historial_o(np.where(respaldo, valor_predicho, redondear(valor_predicho, 2)))
+    predicciones['Tiros_Puerta_Estimados'] = con_historial_o(stats_filas['tiros_puerta'].to_numpy(dtype='float64'))
+    predicciones['Tiros_Totales_Estimados'] = con_historial_o(stats_filas['tiros_totales'].to_numpy(dtype='float64'))
+    predicciones['Factor_Oponente'] = con_historial_o(factor_oponente)
+    predicciones['Promedio_Historico_vs_Oponente'] = con_historial_o(promedio_vs_oponente)
+    predicciones['Tipo_Modelo'] = np.where(con_modelo, 'Poisson', '').astype(object)
+    predicciones['Num_Coeficientes'] = info_modelos['Num_Coeficientes'].fillna(0).to_numpy(dtype=int)
+    predicciones['RMSE_Modelo'] = info_modelos['RMSE_Modelo'].fillna(0.0).to_numpy(dtype='float64')
+    predicciones['Porcentaje_Acierto_Modelo'] = info_modelos['Porcentaje_Acierto_Modelo'].fillna(0.0).to_numpy(dtype='float64')
+
+    probabilidades = [poisson.pmf(i, valor_predicho) for i in range(4)] + [1 - poisson.cdf(3, valor_predicho)]
+    for i, probabilidad in enumerate(probabilidades):
+        predicciones[f'P{i}'] = con_historial_o(redondear(probabilidad, 3))
+
+    predicciones['Promedio_Goles_General'] = con_historial_o(promedio_goles)
+    predicciones['Total_Goles_Historicos'] = con_historial_o(stats_filas['total_goles'].fillna(0).to_numpy(dtype=int), 0)
+    predicciones['Total_Partidos'] = con_historial_o(stats_filas['total_partidos'].fillna(0).to_numpy(dtype=int), 0)
+    predicciones['Promedio_Goles_Local'] = con_historial_o(stats_filas['goles_local'].to_numpy(dtype='float64'))
+    predicciones['Promedio_Goles_Visitante'] = con_historial_o(stats_filas['goles_visitante'].to_numpy(dtype='float64'))
+    predicciones['Partidos_vs_Oponente'] = con_historial_o(partidos_vs_oponente, 0)
+
+    return predicciones
+
+def formatear_predicciones(predicciones):
+    """
+    Ordena, redondea y renombra las predicciones al formato del CSV
+    predicciones_calendario_poisson2025.csv.
+    """
+    predicciones = predicciones.sort_values(by=['Fecha', 'Jugador_Estandarizado'])
+
+    for col in COLUMNAS_REDONDEADAS:
+        if col in predicciones.columns:
+            predicciones[col] = predicciones[col].round(2)
+
+    predicciones_final = predicciones.rename(columns={
+        'Jugador_Estandarizado': 'Jugador',
+        'Equipo_Local_Estandarizado': 'Equipo_Local',
+        'Equipo_Visitante_Estandarizado': 'Equipo_Visitante',
+        'Es_Local': 'Juega_Local',
+        'Prediccion_Goles': 'Goles_Predichos'
+    })
+
+    # Columnas calculadas adicionales para análisis
+    predicciones_final['Diferencia_vs_Promedio'] = predicciones_final['Goles_Predichos'] - predicciones_final['Promedio_Historico_vs_Oponente']
+    predicciones_final['Factor_Confianza'] = (100 - predicciones_final['RMSE_Modelo'] * 10).clip(0, 100)
+    predicciones_final['Gol_Mas_Probable'] = predicciones_final[['P0', 'P1', 'P2', 'P3', 'P4']].idxmax(axis=1).str.replace('P', '').astype(int)
+
+    return predicciones_final
@@ -0,0 +1,283 @@
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from esquemas import COLUMNAS_TEXTO_SOFASCORE, COLUMNAS_CONTEO_GOLEADORES, COLUMNAS_CONTEO_PORTEROS
+from equipos import codificar_equipos
+
+# Valor que asigna el scraper de SofaScore cuando no identifica el equipo o el nombre
+VALOR_DESCONOCIDO = "Unknown"
+
+# Textos que representan una estadística vacía (no cuentan como valores no numéricos)
+VALORES_VACIOS = ['', '-', 'nan', 'NaN', 'None', 'N/A']
+
+# Filas por página de la tabla de SofaScore
+FILAS_POR_PAGINA = 20
+
+# Estadísticas de SofaScore que pueden ser negativas (no se les aplica el mínimo)
+COLUMNAS_CON_SIGNO = ['Goals prevented']
+
+# Reglas por conjunto de datos. Los umbrales son proporciones de filas; None omite la comprobación
+REGLAS = {
+    # Tabla de una categoría o archivo combinado del scraper de SofaScore
+    'sofascore': {
+        'claves': ['Name', 'Team'],
+        'texto': COLUMNAS_TEXTO_SOFASCORE,
+        'columna_equipo': 'Team',
+        'columna_nombre': 'Name',
+        'max_desconocidos': 0.02,
+        'max_equipos_invalidos': 0.02,
+        'max_nombres_equipo': 0.0,
+        'max_no_numericos': 0.01,
+        'max_fuera_de_rango': 0.0,
+        'rangos': {'Average Sofascore Rating': (0, 10), **{col: (None, None) for col in COLUMNAS_CON_SIGNO}},
+        'rango_porcentajes': (0, 100),
+        'minimo': 0,
+        'min_filas': 1,
+    },
+    # Salida de Unificacion.py
+    'jugadores_unificados': {
+        'claves': ['Name', 'Team', 'Torneo'],
+        'texto': COLUMNAS_TEXTO_SOFASCORE,
+        'columna_equipo': 'Team',
+        'columna_nombre': 'Name',
+        'max_desconocidos': 0.02,
+        'max_equipos_invalidos': 0.02,
+        'max_nombres_equipo': 0.0,
+        'max_no_numericos': 0.0,
+        'max_fuera_de_rango': 0.0,
+        'rangos': {col: (None, None) for col in COLUMNAS_CON_SIGNO},
+        'rango_porcentajes': (0, 100),
+        'minimo': 0,
+        'min_filas': 1,
+    },
+    # Salida de Unificacion_año_jugador.py (los equipos pueden ser internacionales)
+    'goleadores_unificados': {
+        'claves': ['Jugador', 'Fecha'],
+        'columnas_numericas': COLUMNAS_CONTEO_GOLEADORES,
+        'max_no_numericos': 0.0,
+        'max_fuera_de_rango': 0.0,
+        'rangos': {'Minutos': (0, 130)},
+        'minimo': 0,
+        'min_filas': 1,
+    },
+    # Salida de Unificacion_año_GoalKeeper.py
+    'porteros_unificados': {
+        'claves': ['Portero', 'Fecha'],
+        'columnas_numericas': COLUMNAS_CONTEO_PORTEROS + ['Porcentaje de paradas'],
+        'max_no_numericos': 0.0,
+        'max_fuera_de_rango': 0.0,
+        'rangos': {'Minutos': (0, 130), 'Porcentaje de paradas': (0, 100)},
+        'minimo': 0,
+        'min_filas': 1,
+    },
+}
+
+class ErrorCalidadDatos(ValueError):
+    """Los datos no superaron las comprobaciones de calidad; el informe está en .reporte"""
+
+    def __init__(self, reporte):
+        fallidas = [c for c in reporte['comprobaciones'] if c['estado'] == 'error']
+        detalle = "; ".join(f"{c['comprobacion']}" + (f" ({c['columna']})" if c['columna'] else "")
+                            + f": {c['detalle']}" for c in fallidas[:5])
+        super().__init__(f"Datos de '{reporte['conjunto']}' rechazados por calidad: {detalle}")
+        self.reporte = reporte
+
+def _resultado(comprobaciones, comprobacion, valor, limite, detalle, columna=None, correcto=None):
+    """
+    Añade el resultado de una comprobación. Por defecto es correcta si el valor
+    (proporción o conteo) no supera el límite.
+    """
+    if correcto is None:
+        correcto = limite is None or valor <= limite
+    estado = 'ok' if correcto else 'error'
+    comprobaciones.append({
+        'comprobacion': comprobacion,
+        'columna': columna,
+        'estado': estado,
+        'valor': round(float(valor), 6),
+        'limite': limite,
+        'detalle': detalle,
+    })
+
+def convertir_numerica(serie):
+    """
+    Convierte una columna de estadísticas en texto ('45%', '1,234', '7.1') a números.
+
+    Returns:
+        tuple: (valores numéricos, máscara de valores que no se pudieron convertir)
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype('float64'), pd.Series(False, index=serie.index)
+    texto = serie.astype(str).str.strip()
+    vacios = serie.isna() | texto.isin(VALORES_VACIOS)
+    numeros = pd.to_numeric(texto.str.replace('%', '', regex=False).str.replace(',', '', regex=False),
+                            errors='coerce')
+    return numeros, numeros.isna() & ~vacios
+
+def comprobar_paginas(filas_por_pagina, filas_esperadas=FILAS_POR_PAGINA):
+    """
+    Comprueba las filas extraídas por página: todas salvo la última deben estar
+    completas y la última no puede estar vacía ni tener más filas que las demás.
+
+    Returns:
+        list: Páginas (desde 1) con un número de filas inesperado
+    """
+    incorrectas = []
+    for pagina, filas in enumerate(filas_por_pagina, start=1):
+        ultima = pagina == len(filas_por_pagina)
+        if (not ultima and filas != filas_esperadas) or (ultima and not 0 < filas <= filas_esperadas):
+            incorrectas.append(pagina)
+    return incorrectas
+
+def validar(df, reglas='sofascore', nombre=None, filas_por_pagina=None):
+    """
+    Ejecuta las comprobaciones de calidad columna a columna (sin recorrer filas).
+
+    Comprobaciones: número de filas, unicidad de las claves, proporción de equipos y
+    nombres 'Unknown', equipos que no están en el registro, nombres que son equipos
+    (equipo y nombre invertidos), estadísticas no numéricas, rangos y filas por página.
+
+    Args:
+        df: Datos a validar
+        reglas: Nombre de un conjunto de REGLAS o diccionario con el mismo formato
+        nombre: Nombre del conjunto en el informe
+        filas_por_pagina: Filas extraídas en cada página (solo para datos del scraper)
+
+    Returns:
+        dict: Informe con 'conjunto', 'filas', 'valido' y la lista de 'comprobaciones'
+    """
+    nombre_reglas = reglas if isinstance(reglas, str) else 'personalizadas'
+    reglas = REGLAS[reglas] if isinstance(reglas, str) else reglas
+    comprobaciones = []
+    n = len(df)
+    proporcion = lambda conteo: conteo / n if n else 0.0
+
+    min_filas = reglas.get('min_filas', 1)
+    _resultado(comprobaciones, 'filas_minimas', n, min_filas, f"{n} filas (mínimo {min_filas})",
+               correcto=n >= min_filas)
+
+    # Claves únicas: las filas repetidas entre páginas aparecen aquí
+    claves = [col for col in reglas.get('claves', []) if col in df.columns]
+    if claves:
+        duplicadas = int(df.duplicated(subset=claves).sum())
+        _resultado(comprobaciones, 'claves_unicas', duplicadas, 0,
+                   f"{duplicadas} filas con {'/'.join(claves)} repetidos", columna='/'.join(claves))
+
+    columna_equipo = reglas.get('columna_equipo')
+    columna_nombre = reglas.get('columna_nombre')
+    for columna in (columna_equipo, columna_nombre):
+        if columna in df.columns and reglas.get('max_desconocidos') is not None:
+            desconocidos = int((df[columna] == VALOR_DESCONOCIDO).sum())
+            _resultado(comprobaciones, 'desconocidos', proporcion(desconocidos), reglas['max_desconocidos'],
+                       f"{desconocidos} filas con '{VALOR_DESCONOCIDO}'", columna=columna)
+
+    # Equipos fuera del registro (equipos.json); cada escritura se resuelve una sola vez
+    if columna_equipo in df.columns and reglas.get('max_equipos_invalidos') is not None:
+        conocidos = df[columna_equipo] != VALOR_DESCONOCIDO
+        codigos = codificar_equipos(df.loc[conocidos, columna_equipo]).cat.codes
+        invalidos = df.loc[conocidos, columna_equipo][codigos.to_numpy() < 0]
+        _resultado(comprobaciones, 'equipos_validos', proporcion(len(invalidos)), reglas['max_equipos_invalidos'],
+                   f"{len(invalidos)} filas con equipos fuera del registro: {sorted(invalidos.astype(str).unique())[:5]}",
+                   columna=columna_equipo)
+
+    # Nombres de jugador que son nombres de equipo: la heurística de extracción los invirtió
+    if columna_nombre in df.columns and reglas.get('max_nombres_equipo') is not None:
+        codigos = codificar_equipos(df[columna_nombre], aproximado=False).cat.codes
+        invertidos = df.loc[codigos.to_numpy() >= 0, columna_nombre]
+        _resultado(comprobaciones, 'nombre_equipo_invertido', proporcion(len(invertidos)),
+                   reglas['max_nombres_equipo'],
+                   f"{len(invertidos)} jugadores con nombre de equipo: {sorted(invertidos.astype(str).unique())[:5]}",
+                   columna=columna_nombre)
+
+    # Estadísticas: conversión numérica y rangos
+    if 'columnas_numericas' in reglas:
+        numericas = [col for col in reglas['columnas_numericas'] if col in df.columns]
+    else:
+        numericas = [col for col in df.columns if col not in set(reglas.get('texto', [])) | set(claves)]
+    rango_porcentajes = reglas.get('rango_porcentajes')
+    for columna in numericas:
+        valores, no_numericos = convertir_numerica(df[columna])
+        if reglas.get('max_no_numericos') is not None:
+            conteo = int(no_numericos.sum())
+            if conteo:
+                ejemplos = sorted(df.loc[no_numericos, columna].astype(str).unique())[:3]
+                detalle = f"{conteo} valores no numéricos: {ejemplos}"
+            else:
+                detalle = "0 valores no numéricos"
+            _resultado(comprobaciones, 'numerica', proporcion(conteo), reglas['max_no_numericos'], detalle,
+                       columna=columna)
+
+        es_porcentaje = '%' in columna or 'percentage' in columna.lower() or 'porcentaje' in columna.lower()
+        minimo, maximo = reglas.get('rangos', {}).get(
+            columna, rango_porcentajes if (es_porcentaje and rango_porcentajes) else (reglas.get('minimo'), None))
+        if minimo is None and maximo is None:
+            continue
+        fuera = ((valores < minimo) if minimo is not None else False) | ((valores > maximo) if maximo is not None else False)
+        conteo = int(np.sum(fuera))
+        _resultado(comprobaciones, 'rango', proporcion(conteo), reglas.get('max_fuera_de_rango'),
+                   f"{conteo} valores fuera de [{minimo}, {maximo}]", columna=columna)
+
+    if filas_por_pagina is not None:
+        incorrectas = comprobar_paginas(filas_por_pagina)
+        _resultado(comprobaciones, 'filas_por_pagina', len(incorrectas), 0,
+                   f"páginas con filas inesperadas: {incorrectas} (filas por página: {list(filas_por_pagina)})")
+
+    return {
+        'conjunto': nombre or nombre_reglas,
+        'reglas': nombre_reglas,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'filas': n,
+        'valido': all(c['estado'] == 'ok' for c in comprobaciones),
+        'comprobaciones': comprobaciones,
+    }
+
+def exigir_calidad(reporte):
+    """Lanza ErrorCalidadDatos si alguna comprobación del informe falló"""
+    if not reporte['valido']:
+        raise ErrorCalidadDatos(reporte)
+    return reporte
+
+def guardar_reportes(reportes, ruta):
+    """Guarda uno o varios informes de calidad en un archivo JSON"""
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(reportes if isinstance(reportes, list) else [reportes], f, indent=2, ensure_ascii=False)
+    return ruta
+
+def imprimir_reporte(reporte):
+    estado = "✓ superó" if reporte['valido'] else "✗ NO superó"
+    print(f"{estado} las comprobaciones de calidad: {reporte['conjunto']} ({reporte['filas']} filas)")
+    for comprobacion in reporte['comprobaciones']:
+        if comprobacion['estado'] != 'ok':
+            columna = f" [{comprobacion['columna']}]" if comprobacion['columna'] else ""
+            print(f"  - {comprobacion['comprobacion']}{columna}: {comprobacion['detalle']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Valida la calidad de un CSV del scraper o de la unificación')
+    parser.add_argument('archivos', nargs='+', help='Archivos CSV a validar')
+    parser.add_argument('--reglas', type=str, default='sofascore', choices=list(REGLAS),
+                        help='Conjunto de reglas')
+    parser.add_argument('--reporte', type=str, default=None, help='Ruta del informe JSON')
+    args = parser.parse_args()
+
+    reportes = []
+    for ruta in args.archivos:
+        # Se lee como texto para detectar los valores que no son numéricos
+        reporte = validar(pd.read_csv(ruta, dtype=str, keep_default_na=False), args.reglas, nombre=ruta)
+        imprimir_reporte(reporte)
+        reportes.append(reporte)
+
+    if args.reporte:
+        print(f"Informe guardado en {guardar_reportes(reportes, args.reporte)}")
+    sys.exit(0 if all(reporte['valido'] for reporte in reportes) else 1)
+
+if __name__ == "__main__":
+    main()
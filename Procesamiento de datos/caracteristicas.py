@@ -0,0 +1,490 @@
+import os
+import json
+import pickle
+import argparse
+import hashlib
+import numpy as np
+import pandas as pd
+
+from equipos import PREFIJOS_PAISES, REGISTRO_EQUIPOS, estandarizar_equipos
+from elo_equipos import caracteristicas_elo
+from esquemas import ESQUEMAS, cargar_dataset
+
+# Versión de las funciones de características: incrementarla invalida la caché
+VERSION_CARACTERISTICAS = 5
+
+# Carpeta donde se guardan las matrices de características ya calculadas
+CARPETA_CACHE = "cache_caracteristicas"
+
+# Configuración predeterminada de construir_matriz_caracteristicas
+CONFIG_CARACTERISTICAS = {
+    'columnas_a_eliminar': ['Resultado', 'Ronda o Fase', 'Posición', 'Partido', 'partido', 'Competición'],
+    'componentes_fecha': True,
+    'metricas_avanzadas': True,
+    'forma': {
+        'variables': ['Goles', 'Tiros totales', 'Tiros a puerta', 'Minutos'],
+        'ventanas': [3, 5, 10],
+        'spans': [5, 10],
+        'ventana_tendencia': 5,
+    },
+    'elo': True,
+}
+
+def promedio_historico(df, claves=('Jugador', 'Oponente_Estandarizado'), valor='Goles',
+                       fecha='Fecha', valor_sin_historial=0.0):
+    """
+    Calcula para cada partido el promedio de `valor` en los partidos ANTERIORES
+    con las mismas claves (por defecto jugador y oponente), sin fuga de información.
+
+    Solo cuentan los partidos con fecha estrictamente anterior: los partidos del
+    mismo día no se incluyen entre sí. Las filas sin historial (o con alguna clave
+    o fecha vacía) reciben `valor_sin_historial`.
+
+    Se calcula en una sola pasada: se agregan los valores por (claves, fecha), se
+    acumulan por claves y se resta el día actual (media expansiva desplazada).
+
+    Args:
+        df: DataFrame con una fila por partido
+        claves: Columnas que definen el historial (por ejemplo ['Jugador', 'Sede'] o
+            ['Jugador', 'Competición'])
+        valor: Columna a promediar
+        fecha: Columna con la fecha del partido
+        valor_sin_historial: Valor para los partidos sin partidos previos
+
+    Returns:
+        Series: Promedio histórico alineado con el índice de df
+    """
+    claves = list(claves)
+    columnas_grupo = claves + [fecha]
+
+    # Las filas con clave o fecha vacía no tienen historial ni forman parte de él
+    validas = df[columnas_grupo].notna().all(axis=1)
+    datos = df.loc[validas, columnas_grupo].copy()
+    datos[valor] = pd.to_numeric(df.loc[validas, valor], errors='coerce').astype('float64')
+
+    resultado = np.full(len(df), valor_sin_historial, dtype='float64')
+    if datos.empty:
+        return pd.Series(resultado, index=df.index)
+
+    # Suma, valores no nulos y número de partidos por (claves, fecha)
+    diario = datos.groupby(columnas_grupo, sort=True)[valor].agg(['sum', 'count', 'size'])
+
+    # Acumulado hasta el día anterior dentro de cada grupo de claves
+    previo = diario.groupby(level=claves, sort=False).cumsum() - diario
+
+    promedio = pd.Series(
+        np.where(
+            previo['size'] == 0,
+            valor_sin_historial,
+            previo['sum'] / previo['count'].where(previo['count'] > 0)
+        ),
+        index=diario.index
+    )
+
+    posiciones = pd.MultiIndex.from_frame(datos[columnas_grupo])
+    resultado[validas.to_numpy()] = promedio.reindex(posiciones).to_numpy()
+
+    return pd.Series(resultado, index=df.index)
+
+def crear_caracteristicas_forma(df, variables=('Goles', 'Tiros totales', 'Tiros a puerta', 'Minutos'),
+                                ventanas=(3, 5, 10), spans=(5, 10), ventana_tendencia=5,
+                                clave_jugador='Jugador', fecha='Fecha', valor_sin_historial=0.0):
+    """
+    Calcula las características de forma reciente de todos los jugadores a la vez,
+    con operaciones rolling/ewm agrupadas por jugador en lugar de un bucle por jugador.
+
+    Cada valor usa solo los partidos ANTERIORES del jugador (las series se desplazan
+    un partido antes de promediar), de modo que el partido que se predice nunca entra
+    en sus propias características.
+
+    Columnas generadas (los espacios del nombre de la variable pasan a '_'):
+    - <variable>_Prom_<n>: media de los últimos n partidos
+    - <variable>_EWM_<span>: media con pesos exponenciales (span en partidos)
+    - Tendencia_Reciente: media de goles de los últimos `ventana_tendencia` partidos de
+      fechas anteriores dividida por la media de todos ellos (1.0 si esta es 0 o no hay
+      goles registrados); los partidos del mismo día no se incluyen entre sí
+    - Dias_Descanso: días desde el partido anterior (NaN en el primer partido)
+
+    Args:
+        df: DataFrame con una fila por jugador y partido
+        variables: Columnas numéricas a promediar (se ignoran las que no existan)
+        ventanas: Tamaños de las ventanas móviles
+        spans: Spans de las medias exponenciales
+        ventana_tendencia: Partidos recientes de Tendencia_Reciente
+        clave_jugador: Columna del jugador
+        fecha: Columna con la fecha del partido
+        valor_sin_historial: Valor de los promedios en el primer partido de cada jugador
+
+    Returns:
+        DataFrame: Características alineadas con el índice de df
+    """
+    variables = [var for var in variables if var in df.columns]
+
+    # Trabajo con posiciones para no depender del índice de df (puede tener duplicados)
+    datos = pd.DataFrame({
+        '_jugador': df[clave_jugador].to_numpy(),
+        '_fecha': pd.to_datetime(df[fecha], errors='coerce').to_numpy(),
+    })
+    for var in variables:
+        datos[var] = pd.to_numeric(df[var], errors='coerce').to_numpy(dtype='float64')
+    datos = datos.sort_values(['_jugador', '_fecha'], kind='mergesort')
+    jugadores = datos['_jugador']
+
+    # Valores del partido anterior de cada jugador: base de todos los promedios
+    previo = datos.groupby(jugadores, sort=False)[variables].shift(1)
+    agrupado = previo.groupby(jugadores, sort=False)
+
+    columnas = {}
+    for ventana in ventanas:
+        medias = agrupado.rolling(ventana, min_periods=1).mean().droplevel(0)
+        for var in variables:
+            columnas[f"{var.replace(' ', '_')}_Prom_{ventana}"] = medias[var]
+    for span in spans:
+        medias = agrupado.ewm(span=span).mean().droplevel(0)
+        for var in variables:
+            columnas[f"{var.replace(' ', '_')}_EWM_{span}"] = medias[var]
+
+    if 'Goles' in variables:
+        reciente = agrupado['Goles'].rolling(ventana_tendencia, min_periods=1).mean().droplevel(0)
+        general = agrupado['Goles'].expanding().mean().droplevel(0)
+        # Sin goles previos la tendencia es neutra (1.0); sin partidos previos no hay tendencia
+        tendencia = (reciente / general).where(general > 0, 1.0).fillna(1.0)
+        tendencia = tendencia.where(datos.groupby(jugadores, sort=False).cumcount() > 0, valor_sin_historial)
+        # Todos los partidos de un mismo día usan el historial del primero (solo fechas
+        # anteriores); las filas sin fecha no tienen historial
+        tendencia = tendencia.groupby([jugadores, datos['_fecha']], sort=False).transform('first')
+        columnas['Tendencia_Reciente'] = tendencia.fillna(valor_sin_historial)
+
+    forma = pd.DataFrame(columnas).reindex(datos.index).fillna(valor_sin_historial)
+    forma['Dias_Descanso'] = datos.groupby(jugadores, sort=False)['_fecha'].diff().dt.days
+    forma = forma.sort_index()
+    forma.index = df.index
+    return forma
+
+def limpiar_goleadores(df):
+    """
+    Limpieza básica del DataFrame de goleadores: elimina columnas sin uso, convierte
+    fechas, añade año y mes, estandariza equipos y calcula la eficiencia ofensiva.
+    """
+    df_limpio = df.copy()
+    
+    # Eliminar columnas específicas
+    columnas_a_eliminar = ['Resultado', 'Ronda o fase', 'Posición', 'Partido']
+    columnas_a_eliminar = [col for col in columnas_a_eliminar if col in df_limpio.columns]
+    if columnas_a_eliminar:
+        df_limpio = df_limpio.drop(columns=columnas_a_eliminar)
+        print(f"Columnas eliminadas: {columnas_a_eliminar}")
+    
+    # Convertir fechas a formato datetime
+    if 'Fecha' in df_limpio.columns:
+        df_limpio['Fecha'] = pd.to_datetime(df_limpio['Fecha'], errors='coerce')
+        
+        # Crear columna de año y mes para facilitar análisis temporales
+        df_limpio['Año'] = df_limpio['Fecha'].dt.year
+        df_limpio['Mes'] = df_limpio['Fecha'].dt.month
+    
+    # Estandarizar nombres de equipos y oponentes
+    if 'Equipo' in df_limpio.columns:
+        df_limpio['Equipo'] = df_limpio['Equipo'].str.upper()
+    
+    if 'Oponente' in df_limpio.columns:
+        df_limpio['Oponente'] = df_limpio['Oponente'].str.upper()
+    
+    # Crear columna de eficiencia ofensiva (goles / tiros totales)
+    if 'Goles' in df_limpio.columns and 'Tiros totales' in df_limpio.columns:
+        # Evitar división por cero
+        df_limpio['Eficiencia_Ofensiva'] = np.where(
+            df_limpio['Tiros totales'] > 0,
+            df_limpio['Goles'] / df_limpio['Tiros totales'],
+            0
+        )
+    
+    return df_limpio
+
+def crear_metricas_avanzadas_goleadores(df):
+    """Crear métricas avanzadas para goleadores incluyendo variables dummy para oponentes colombianos y sede"""
+    df_transformado = df.copy()
+    
+    # Aplicar mapeo de equipos colombianos y crear dummies para oponentes y equipos
+    df_transformado = aplicar_mapeo_equipos(df_transformado)
+    
+    # Crear variable dummy para sede (local/visitante)
+    df_transformado = crear_dummy_sede(df_transformado)
+    
+    # Goles por 90 minutos
+    if 'Goles' in df_transformado.columns and 'Minutos' in df_transformado.columns:
+        df_transformado['Goles_por_90min'] = df_transformado['Goles'] / (df_transformado['Minutos'] / 90)
+        # Corregir infinitos o NaN
+        df_transformado['Goles_por_90min'] = df_transformado['Goles_por_90min'].replace([np.inf, -np.inf], np.nan).fillna(0)
+    
+    # Eficiencia de tiro (porcentaje de tiros que son gol)
+    if 'Goles' in df_transformado.columns and 'Tiros totales' in df_transformado.columns:
+        df_transformado['Eficiencia_Tiro'] = np.where(
+            df_transformado['Tiros totales'] > 0,
+            df_transformado['Goles'] / df_transformado['Tiros totales'] * 100,
+            0
+        )
+    
+    # Precisión de tiro (porcentaje de tiros que van a puerta)
+    if 'Tiros a puerta' in df_transformado.columns and 'Tiros totales' in df_transformado.columns:
+        df_transformado['Precision_Tiro'] = np.where(
+            df_transformado['Tiros totales'] > 0,
+            df_transformado['Tiros a puerta'] / df_transformado['Tiros totales'] * 100,
+            0
+        )
+    
+    # Índice de contribución ofensiva
+    if all(col in df_transformado.columns for col in ['Asistencias', 'Penales ganados', 'Tiros a puerta']):
+        df_transformado['Indice_Ofensivo'] = (
+            df_transformado['Asistencias'] * 2 + 
+            df_transformado['Penales ganados'] * 1 +
+            df_transformado['Tiros a puerta'] * 0.2
+        )
+    
+    # Índice de disciplina
+    if all(col in df_transformado.columns for col in ['Tarjetas amarillas', 'Tarjetas rojas']):
+        df_transformado['Indice_Disciplina'] = 10 - (
+            df_transformado['Tarjetas amarillas'] * 1 + 
+            df_transformado['Tarjetas rojas'] * 3
+        )
+        df_transformado['Indice_Disciplina'] = df_transformado['Indice_Disciplina'].clip(lower=0)
+    
+    # Índice de participación en juego
+    if 'Minutos' in df_transformado.columns:
+        df_transformado['Indice_Participacion'] = df_transformado['Minutos'] / 90 * 10
+    
+    # Score global de ataque
+    if all(col in df_transformado.columns for col in ['Indice_Ofensivo', 'Indice_Disciplina', 'Indice_Participacion']):
+        df_transformado['Score_Global_Ataque'] = (
+            df_transformado['Indice_Ofensivo'] * 0.6 + 
+            df_transformado['Indice_Disciplina'] * 0.1 + 
+            df_transformado['Indice_Participacion'] * 0.3
+        )
+    
+    # Tasa de conversión de penales
+    if 'Penales marcados' in df_transformado.columns and 'Penales intentados' in df_transformado.columns:
+        df_transformado['Tasa_Conversion_Penales'] = np.where(
+            df_transformado['Penales intentados'] > 0,
+            df_transformado['Penales marcados'] / df_transformado['Penales intentados'] * 100,
+            0
+        )
+    
+    # Ratio de faltas (recibidas/cometidas)
+    if 'Faltas recibidas' in df_transformado.columns and 'Faltas cometidas' in df_transformado.columns:
+        df_transformado['Ratio_Faltas'] = np.where(
+            df_transformado['Faltas cometidas'] > 0,
+            df_transformado['Faltas recibidas'] / df_transformado['Faltas cometidas'],
+            df_transformado['Faltas recibidas']  # Si no hay faltas cometidas, usar faltas recibidas
+        )
+    
+    return df_transformado
+
+def crear_dummy_sede(df):
+    """
+    Crea variables dummy para local/visitante basadas en la columna 'Sede'
+    """
+    # Verificar si la columna 'Sede' existe
+    if 'Sede' not in df.columns:
+        print("Advertencia: Columna 'Sede' no encontrada, no se pueden crear variables dummy de local/visitante")
+        return df
+    
+    # Estandarizar valores de Sede (convertir a mayúsculas)
+    df['Sede'] = df['Sede'].str.upper()
+    
+    # Crear variables dummy para Home (Local) y Away (Visitante)
+    df['Sede_Local'] = 0
+    df['Sede_Visitante'] = 0
+    
+    # Mapear diferentes formas de indicar local/visitante
+    locales = ['HOME', 'H', 'LOCAL', 'L', 'LOC']
+    visitantes = ['AWAY', 'A', 'VISITANTE', 'V', 'VIS']
+    
+    for valor in locales:
+        df.loc[df['Sede'] == valor, 'Sede_Local'] = 1
+    
+    for valor in visitantes:
+        df.loc[df['Sede'] == valor, 'Sede_Visitante'] = 1
+    
+    # Para valores que no están en ninguna de las listas, intentar inferir
+    sin_mapeo = (df['Sede_Local'] == 0) & (df['Sede_Visitante'] == 0)
+    
+    if sin_mapeo.sum() > 0:
+        print(f"Advertencia: {sin_mapeo.sum()} registros con valores de sede no reconocidos")
+        print("Valores no reconocidos:", df.loc[sin_mapeo, 'Sede'].unique())
+        
+        # Intentar mapear por contenido parcial
+        for idx in df[sin_mapeo].index:
+            sede = df.loc[idx, 'Sede']
+            if any(local in sede for local in ['HOME', 'LOCAL', 'H ']):
+                df.loc[idx, 'Sede_Local'] = 1
+            elif any(visitante in sede for visitante in ['AWAY', 'VISIT', 'A ']):
+                df.loc[idx, 'Sede_Visitante'] = 1
+    
+    # Verificar si hay registros sin clasificar después de la inferencia
+    sin_clasificar = (df['Sede_Local'] == 0) & (df['Sede_Visitante'] == 0)
+    if sin_clasificar.sum() > 0:
+        print(f"Advertencia: {sin_clasificar.sum()} registros sin clasificar como local o visitante")
+        
+        # Asignar un valor predeterminado a registros sin clasificar
+        df.loc[sin_clasificar, 'Sede_Neutral'] = 1
+    else:
+        df['Sede_Neutral'] = 0
+    
+    return df
+
+def aplicar_mapeo_equipos(df):
+    """
+    Aplica el mapeo de nombres de equipos colombianos y crea variables dummy
+    para los oponentes y equipos colombianos.
+    """
+    df_procesado = df.copy()
+    
+    # Verificar si las columnas necesarias existen
+    columnas_necesarias = ['Equipo', 'Oponente']
+    columnas_faltantes = [col for col in columnas_necesarias if col not in df_procesado.columns]
+    
+    if columnas_faltantes:
+        print(f"Advertencia: Columnas faltantes: {columnas_faltantes}. No se puede aplicar mapeo completo.")
+        return df_procesado
+    
+    # Procesar tanto Equipo como Oponente
+    for campo in ['Equipo', 'Oponente']:
+        # Prefijos de país de FBref ('co ', 'ar ', 'br ', ...)
+        prefijos = df_procesado[campo].str.lower().str[:3]
+        
+        # Eliminar prefijo para equipos colombianos
+        mascara = prefijos == 'co '
+        df_procesado.loc[mascara, campo] = df_procesado.loc[mascara, campo].str[3:]
+        
+        # Nombre canónico del registro de equipos (equipos.py); los equipos que no son
+        # colombianos conservan su nombre original
+        estandar = estandarizar_equipos(df_procesado[campo], conservar_desconocidos=False)
+        df_procesado[f'{campo}_Estandarizado'] = estandar.fillna(df_procesado[campo])
+        df_procesado[f'{campo}_Es_Colombiano'] = estandar.notna()
+        
+        # Marcar equipos internacionales por su prefijo de país
+        df_procesado.loc[prefijos.isin([f"{prefijo} " for prefijo in PREFIJOS_PAISES]), f'{campo}_Es_Internacional'] = True
+        
+        # Crear variables dummy solo para oponentes/equipos colombianos
+        # Filtrar primero las filas con valores colombianos
+        df_colombianos = df_procesado[df_procesado[f'{campo}_Es_Colombiano']].copy()
+        
+        if len(df_colombianos) > 0:
+            # Crear dummies solo para equipos colombianos
+            dummies = pd.get_dummies(df_colombianos[f'{campo}_Estandarizado'], prefix=campo)
+            
+            # Añadir dummies al DataFrame original
+            df_procesado = pd.merge(
+                df_procesado.drop(columns=[col for col in df_procesado.columns if col.startswith(f'{campo}_') and col not in [f'{campo}_Original', f'{campo}_Estandarizado', f'{campo}_Es_Colombiano']]),
+                dummies,
+                left_index=True,
+                right_index=True,
+                how='left'
+            )
+            
+            # Rellenar NAs en columnas dummy con 0
+            for col in dummies.columns:
+                if col in df_procesado.columns:
+                    df_procesado[col] = df_procesado[col].fillna(0)
+    
+    return df_procesado
+
+def huella_datos(df):
+    """
+    Calcula un hash estable del contenido de un DataFrame (valores, índice, columnas y tipos).
+    """
+    huella = hashlib.sha256()
+    huella.update(json.dumps([[str(col) for col in df.columns], [str(tipo) for tipo in df.dtypes]]).encode('utf-8'))
+    huella.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return huella.hexdigest()
+
+def huella_config(config):
+    """
+    Calcula un hash estable de una configuración junto con la versión de las características
+    y el registro de equipos cargado (equipos.json), que decide los nombres estandarizados.
+    """
+    contenido = json.dumps({'config': config, 'version': VERSION_CARACTERISTICAS, 'equipos': REGISTRO_EQUIPOS},
+                           sort_keys=True, default=str)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+def construir_matriz_caracteristicas(df, config=None, carpeta_cache=CARPETA_CACHE, usar_cache=True):
+    """
+    Construye la matriz de características de goleadores a partir de los datos unificados.
+    El resultado se guarda en disco con una clave derivada del hash de los datos de
+    entrada, de la configuración y del registro de equipos, de modo que las ejecuciones siguientes lo cargan
+    directamente sin recalcular.
+
+    Args:
+        df: DataFrame de goleadores unificados (data/Goleadores_Unificados.csv)
+        config: Diccionario que sobrescribe claves de CONFIG_CARACTERISTICAS
+        carpeta_cache: Carpeta de la caché en disco
+        usar_cache: Si es False se recalcula siempre y no se escribe en la caché
+
+    Returns:
+        DataFrame: Datos con las métricas avanzadas, las variables dummy, la forma reciente y los ratings Elo
+    """
+    config = {**CONFIG_CARACTERISTICAS, **(config or {})}
+    clave = hashlib.sha256((huella_datos(df) + huella_config(config)).encode('utf-8')).hexdigest()[:16]
+    ruta_cache = os.path.join(carpeta_cache, f"caracteristicas_{clave}.pkl")
+
+    if usar_cache and os.path.exists(ruta_cache):
+        with open(ruta_cache, 'rb') as f:
+            df_caracteristicas = pickle.load(f)
+        print(f"Características cargadas desde caché: {ruta_cache}")
+        return df_caracteristicas
+
+    df_caracteristicas = df.copy()
+
+    # Eliminar columnas no necesarias
+    columnas_a_eliminar = [col for col in config['columnas_a_eliminar'] if col in df_caracteristicas.columns]
+    if columnas_a_eliminar:
+        df_caracteristicas = df_caracteristicas.drop(columns=columnas_a_eliminar)
+        print(f"Columnas eliminadas: {columnas_a_eliminar}")
+
+    # Convertir fechas a formato datetime y crear columnas de año y mes
+    if config['componentes_fecha'] and 'Fecha' in df_caracteristicas.columns:
+        df_caracteristicas['Fecha'] = pd.to_datetime(df_caracteristicas['Fecha'], errors='coerce')
+        df_caracteristicas['Año'] = df_caracteristicas['Fecha'].dt.year
+        df_caracteristicas['Mes'] = df_caracteristicas['Fecha'].dt.month
+
+    # Crear métricas avanzadas para goleadores
+    if config['metricas_avanzadas']:
+        df_caracteristicas = crear_metricas_avanzadas_goleadores(df_caracteristicas)
+
+    # Forma reciente de cada jugador (promedios móviles sin el partido actual)
+    if config['forma'] and 'Jugador' in df_caracteristicas.columns:
+        forma = crear_caracteristicas_forma(df_caracteristicas, **config['forma'])
+        df_caracteristicas = df_caracteristicas.drop(columns=[col for col in forma.columns if col in df_caracteristicas.columns])
+        df_caracteristicas = pd.concat([df_caracteristicas, forma], axis=1)
+
+    # Rating Elo previo al partido del equipo y del oponente (elo_equipos.py); se calcula
+    # sobre los datos originales porque 'Resultado' ya se eliminó
+    if config['elo'] and {'Resultado', 'Oponente'} <= set(df.columns):
+        elo = caracteristicas_elo(df)
+        df_caracteristicas[list(elo.columns)] = elo
+
+    if usar_cache:
+        os.makedirs(carpeta_cache, exist_ok=True)
+        with open(ruta_cache, 'wb') as f:
+            pickle.dump(df_caracteristicas, f)
+        print(f"Características guardadas en caché: {ruta_cache}")
+
+    return df_caracteristicas
+
+def main():
+    parser = argparse.ArgumentParser(description='Construye Goleadores_Procesados.csv a partir de los goleadores unificados')
+    parser.add_argument('--entrada', type=str, default=ESQUEMAS['goleadores_unificados']['ruta'],
+                        help='CSV de goleadores unificados')
+    parser.add_argument('--salida', type=str, default=ESQUEMAS['goleadores_procesados']['ruta'],
+                        help='CSV de la matriz de características')
+    parser.add_argument('--sin-cache', action='store_true', help='Recalcular sin usar la caché')
+    args = parser.parse_args()
+
+    df_goleadores = cargar_dataset('goleadores_unificados', args.entrada)
+    df_procesado = construir_matriz_caracteristicas(df_goleadores, usar_cache=not args.sin_cache)
+    df_procesado.to_csv(args.salida, index=False)
+    print(f"✓ Matriz de características guardada en {args.salida} "
+          f"({df_procesado.shape[0]} filas, {df_procesado.shape[1]} columnas)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+# Variables que no entran en la matriz de correlación global (dummies de equipo, oponente y sede)
+PREFIJOS_EXCLUIDOS = ('Equipo_', 'Oponente_', 'Sede_')
+
+# Filas leídas por bloque al procesar un CSV
+TAMANO_BLOQUE = 50_000
+
+# Archivo donde se guardan las estadísticas acumuladas
+RUTA_ACUMULADOR = "estadisticas_correlacion.pkl"
+
+# Bytes anteriores a la posición procesada que se comparan para saber si el CSV se reescribió
+VENTANA_VERIFICACION = 64 * 1024
+
+def detectar_columnas_numericas(ruta, prefijos_excluidos=PREFIJOS_EXCLUIDOS, filas=1000, **kwargs):
+    """
+    Detecta las columnas numéricas de un CSV a partir de sus primeras filas,
+    sin las dummies de equipo, oponente y sede.
+    """
+    muestra = pd.read_csv(ruta, nrows=filas, **kwargs)
+    return [col for col in muestra.select_dtypes(include='number').columns
+            if not col.startswith(tuple(prefijos_excluidos))]
+
+def crear_acumulador(columnas, clave_jugador='Jugador', clave_oponente='Oponente_Estandarizado', valor='Goles'):
+    """
+    Crea un acumulador vacío de estadísticas suficientes.
+
+    Para cada par de columnas (i, j) se guardan el número de filas con ambos valores
+    y las sumas de x, x² y x·y sobre esas filas, igual que df.corr() usa las filas
+    completas de cada par. Los valores se acumulan centrados en una referencia (la
+    media del primer bloque) para no perder precisión al restar sumas grandes.
+    Por cada (jugador, oponente) se guardan la suma y el conteo de 'valor'.
+
+    Args:
+        columnas: Columnas numéricas de la matriz de correlación
+        clave_jugador: Columna del jugador
+        clave_oponente: Columna del oponente
+        valor: Columna promediada por jugador y oponente
+
+    Returns:
+        dict: Acumulador vacío
+    """
+    k = len(columnas)
+    return {
+        'columnas': list(columnas),
+        'clave_jugador': clave_jugador,
+        'clave_oponente': clave_oponente,
+        'valor': valor,
+        'referencia': None,
+        'n': np.zeros((k, k)),
+        'suma_x': np.zeros((k, k)),
+        'suma_x2': np.zeros((k, k)),
+        'suma_xy': np.zeros((k, k)),
+        'suma_pares': None,
+        'conteo_pares': None,
+        'archivos': {},
+        'filas': 0,
+    }
+
+def actualizar_acumulador(acumulador, df):
+    """
+    Suma al acumulador las filas nuevas de un DataFrame. El costo depende solo del
+    número de filas nuevas (más los pares jugador-oponente que aparecen en ellas).
+
+    Args:
+        acumulador: Acumulador creado con crear_acumulador
+        df: Filas nuevas
+
+    Returns:
+        dict: El mismo acumulador actualizado
+    """
+    if df.empty:
+        return acumulador
+
+    valores = df[acumulador['columnas']].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+    if acumulador['referencia'] is None:
+        acumulador['referencia'] = np.nan_to_num(np.nanmean(valores, axis=0)) if len(valores) else 0.0
+    valores = valores - acumulador['referencia']
+
+    # presente[:, j] indica si la columna j tiene valor; x queda en 0 donde falta, así
+    # x.T @ presente suma x_i solo en las filas donde también existe x_j
+    presente = (~np.isnan(valores)).astype('float64')
+    x = np.nan_to_num(valores)
+    acumulador['n'] += presente.T @ presente
+    acumulador['suma_x'] += x.T @ presente
+    acumulador['suma_x2'] += (x ** 2).T @ presente
+    acumulador['suma_xy'] += x.T @ x
+
+    # Suma y conteo por (jugador, oponente) de las filas nuevas
+    claves = [acumulador['clave_jugador'], acumulador['clave_oponente']]
+    if all(col in df.columns for col in claves):
+        agrupado = df.assign(_valor=pd.to_numeric(df[acumulador['valor']], errors='coerce')) \
+                     .groupby(claves)['_valor'].agg(['sum', 'count'])
+        if acumulador['suma_pares'] is None:
+            acumulador['suma_pares'] = agrupado['sum'].astype('float64')
+            acumulador['conteo_pares'] = agrupado['count'].astype('float64')
+        else:
+            acumulador['suma_pares'] = acumulador['suma_pares'].add(agrupado['sum'], fill_value=0)
+            acumulador['conteo_pares'] = acumulador['conteo_pares'].add(agrupado['count'], fill_value=0)
+
+    acumulador['filas'] += len(df)
+    return acumulador
+
+def _huella_tramo(file, inicio, fin):
+    """Hash de los bytes [inicio, fin) de un archivo abierto en modo binario"""
+    file.seek(inicio)
+    return hashlib.sha1(file.read(fin - inicio)).hexdigest()
+
+def _reiniciar_acumulador(acumulador):
+    """Vacía las estadísticas del acumulador conservando su configuración"""
+    acumulador.update(crear_acumulador(acumulador['columnas'], acumulador['clave_jugador'],
+                                       acumulador['clave_oponente'], acumulador['valor']))
+
+def actualizar_desde_csv(acumulador, ruta, tamano_bloque=TAMANO_BLOQUE, **kwargs):
+    """
+    Procesa un CSV por bloques (sirve para archivos más grandes que la memoria) y
+    suma solo las filas añadidas desde la última llamada: por cada archivo se guarda
+    la posición en bytes hasta la que se leyó y se continúa desde ahí, así que el
+    costo depende solo de las filas nuevas.
+
+    Antes de continuar se compara la cabecera y los últimos bytes ya procesados; si
+    el archivo se reescribió (filas editadas, reordenadas o eliminadas) no se pueden
+    restar las filas antiguas, así que el acumulador se vacía y el archivo se procesa
+    de nuevo completo. Los demás archivos del acumulador se vuelven a sumar en su
+    siguiente llamada.
+
+    Args:
+        acumulador: Acumulador creado con crear_acumulador
+        ruta: Ruta del CSV (por ejemplo Goleadores_Procesados.csv)
+        tamano_bloque: Filas por bloque
+        **kwargs: Argumentos adicionales para pd.read_csv
+
+    Returns:
+        int: Número de filas nuevas procesadas
+    """
+    archivos = acumulador.setdefault('archivos', {})
+    acumulador.pop('huellas', None)  # acumuladores guardados con la versión anterior
+
+    disponibles = pd.read_csv(ruta, nrows=0, **kwargs).columns
+    columnas = acumulador['columnas'] + [acumulador['clave_jugador'], acumulador['clave_oponente']]
+    columnas = [col for col in dict.fromkeys(columnas + [acumulador['valor']]) if col in disponibles]
+
+    clave_archivo = os.path.abspath(ruta)
+    with open(ruta, 'rb') as file:
+        cabecera = file.readline()
+        inicio_datos = file.tell()
+        tamano = os.fstat(file.fileno()).st_size
+
+        estado = archivos.get(clave_archivo)
+        if estado is not None:
+            inicio_ventana = max(inicio_datos, estado['posicion'] - VENTANA_VERIFICACION)
+            sin_cambios = (estado['cabecera'] == cabecera and estado['posicion'] <= tamano
+                           and estado['huella'] == _huella_tramo(file, inicio_ventana, estado['posicion']))
+            if not sin_cambios:
+                print(f"⚠️ {ruta} cambió desde la última actualización; se recalculan las estadísticas")
+                _reiniciar_acumulador(acumulador)
+                archivos = acumulador['archivos']
+                estado = None
+
+        posicion = estado['posicion'] if estado is not None else inicio_datos
+        nuevas = 0
+        if posicion < tamano:
+            file.seek(posicion)
+            lector = pd.read_csv(file, header=None, names=list(disponibles), usecols=columnas,
+                                 chunksize=tamano_bloque, **kwargs)
+            for bloque in lector:
+                actualizar_acumulador(acumulador, bloque)
+                nuevas += len(bloque)
+            posicion = file.tell()
+
+        inicio_ventana = max(inicio_datos, posicion - VENTANA_VERIFICACION)
+        archivos[clave_archivo] = {
+            'cabecera': cabecera,
+            'posicion': posicion,
+            'huella': _huella_tramo(file, inicio_ventana, posicion),
+        }
+
+    return nuevas
+
+def matriz_correlacion(acumulador):
+    """
+    Calcula la matriz de correlación de Pearson a partir de las estadísticas
+    acumuladas; coincide con df[columnas].corr() sobre todas las filas procesadas.
+    """
+    n = acumulador['n']
+    sx, sx2, sxy = acumulador['suma_x'], acumulador['suma_x2'], acumulador['suma_xy']
+    sy, sy2 = sx.T, sx2.T
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covarianza = n * sxy - sx * sy
+        varianza_x = n * sx2 - sx ** 2
+        varianza_y = n * sy2 - sy ** 2
+        correlacion = covarianza / np.sqrt(varianza_x * varianza_y)
+
+    correlacion[(n < 2) | (varianza_x <= 0) | (varianza_y <= 0)] = np.nan
+    correlacion = np.clip(correlacion, -1, 1)
+    np.fill_diagonal(correlacion, np.where(np.diag(varianza_x) > 0, 1.0, np.nan))
+    return pd.DataFrame(correlacion, index=acumulador['columnas'], columns=acumulador['columnas'])
+
+def promedio_jugador_oponente(acumulador, jugadores=None, oponentes=None):
+    """
+    Devuelve la matriz jugador x oponente con el promedio de 'valor' (0 si no se
+    enfrentaron), equivalente al groupby + pivot_table del notebook.
+
+    Args:
+        acumulador: Acumulador con las sumas por (jugador, oponente)
+        jugadores: Jugadores a incluir (por defecto todos)
+        oponentes: Oponentes a incluir (por defecto todos)
+
+    Returns:
+        DataFrame: Promedio por jugador (filas) y oponente (columnas)
+    """
+    promedio = (acumulador['suma_pares'] / acumulador['conteo_pares']).dropna()
+    matriz = promedio.unstack(fill_value=0)
+    matriz.index.name, matriz.columns.name = acumulador['clave_jugador'], acumulador['clave_oponente']
+
+    if jugadores is not None:
+        matriz = matriz.loc[matriz.index.isin(jugadores)]
+    if oponentes is not None:
+        matriz = matriz[[col for col in matriz.columns if col in set(oponentes)]]
+    return matriz
+
+def total_por_jugador(acumulador):
+    """
+    Devuelve el total de 'valor' por jugador (por ejemplo goles), de mayor a menor.
+    """
+    return acumulador['suma_pares'].groupby(level=0).sum().sort_values(ascending=False)
+
+def guardar_acumulador(acumulador, ruta=RUTA_ACUMULADOR):
+    """
+    Guarda el acumulador en disco de forma atómica.
+    """
+    ruta_temporal = f"{ruta}.tmp"
+    with open(ruta_temporal, 'wb') as file:
+        pickle.dump(acumulador, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(ruta_temporal, ruta)
+
+def cargar_acumulador(ruta=RUTA_ACUMULADOR):
+    """
+    Carga un acumulador guardado o devuelve None si no existe.
+    """
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, 'rb') as file:
+        return pickle.load(file)
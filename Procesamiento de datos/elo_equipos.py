@@ -0,0 +1,213 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from equipos import estandarizar_equipos
+
+# Archivo con el estado de los ratings (ratings actuales y partidos ya procesados)
+RUTA_ESTADO_ELO = "modelos_elo/estado_elo.json"
+
+# Parámetros del rating: valor inicial de un equipo nuevo, factor K y ventaja de jugar en casa
+CONFIG_ELO = {
+    'inicial': 1500.0,
+    'k': 20.0,
+    'ventaja_local': 60.0,
+}
+
+# Valores de la columna Sede (FBref en inglés o español) por primera letra
+SEDES_LOCAL = ('H', 'L')
+SEDES_VISITANTE = ('A', 'V')
+
+# Prefijo de país de FBref de los equipos de la liga; los rivales de otro país
+# (Libertadores, Sudamericana) no tienen rating en la liga y se descartan
+PREFIJO_PAIS_LIGA = 'co'
+
+def crear_estado(config=None):
+    """
+    Crea un estado vacío: ratings por equipo, ratings previos de cada partido
+    procesado (clave -> [rating local, rating visitante]) y parámetros.
+    """
+    return {
+        'config': {**CONFIG_ELO, **(config or {})},
+        'ratings': {},
+        'partidos': {},
+        'ultima_fecha': None,
+    }
+
+def cargar_estado(ruta=RUTA_ESTADO_ELO, config=None):
+    """
+    Carga el estado guardado o crea uno vacío si el archivo no existe.
+    """
+    if not os.path.exists(ruta):
+        return crear_estado(config)
+    with open(ruta, 'r', encoding='utf-8') as f:
+        estado = json.load(f)
+    if config and any(estado['config'].get(clave) != valor for clave, valor in config.items()):
+        raise ValueError(f"El estado de {ruta} se calculó con otros parámetros: {estado['config']}")
+    return estado
+
+def guardar_estado(estado, ruta=RUTA_ESTADO_ELO):
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False)
+
+def _nombres_equipos(serie):
+    """
+    Nombre canónico del equipo sin el prefijo de país de FBref ('co Millonarios').
+    Los equipos con prefijo de otro país quedan vacíos para no confundirlos con un
+    equipo de la liga de nombre parecido.
+    """
+    texto = serie.astype(str).str.strip()
+    prefijo = texto.str.extract(r'^([a-z]{2}) ', expand=False)
+    nombres = estandarizar_equipos(texto.str.replace(r'^[a-z]{2} ', '', regex=True), aproximado=False)
+    return nombres.where(prefijo.isna() | (prefijo == PREFIJO_PAIS_LIGA), '')
+
+def extraer_partidos(df):
+    """
+    Obtiene los partidos de los registros de FBref (una fila por jugador y partido).
+    Cada fila se orienta del lado del equipo del jugador; la clave del partido es la
+    misma desde los dos lados, así que los registros de jugadores de ambos equipos
+    producen un único partido.
+
+    Returns:
+        DataFrame: Una fila por registro con 'Clave', 'Fecha', 'Equipo', 'Oponente',
+            'Es_Local' (1 local, -1 visitante, 0 neutral), 'Goles_Favor', 'Goles_Contra'
+            e 'Invertido' (True si el equipo es el segundo de la clave). Las filas sin
+            fecha, equipos o marcador, o contra un equipo de otro país, quedan con Clave vacía.
+    """
+    equipo_col = 'Equipo_Estandarizado' if 'Equipo_Estandarizado' in df.columns else 'Equipo'
+    oponente_col = 'Oponente_Estandarizado' if 'Oponente_Estandarizado' in df.columns else 'Oponente'
+
+    # Marcador desde el lado del equipo: 'W 2–1', 'D 1–1 (4–3)' -> 2, 1 (se ignora la tanda de penales)
+    marcador = df['Resultado'].astype(str).str.extract(r'(\d+)\s*[–\-]\s*(\d+)')
+    sede = df['Sede'].astype(str).str.strip().str.upper().str[:1] if 'Sede' in df.columns else pd.Series('', index=df.index)
+
+    partidos = pd.DataFrame({
+        'Fecha': pd.to_datetime(df['Fecha'], errors='coerce'),
+        'Equipo': _nombres_equipos(df[equipo_col]),
+        'Oponente': _nombres_equipos(df[oponente_col]),
+        'Es_Local': np.select([sede.isin(SEDES_LOCAL), sede.isin(SEDES_VISITANTE)], [1, -1], 0),
+        'Goles_Favor': pd.to_numeric(marcador[0], errors='coerce'),
+        'Goles_Contra': pd.to_numeric(marcador[1], errors='coerce'),
+    }, index=df.index)
+
+    validas = (partidos[['Fecha', 'Goles_Favor', 'Goles_Contra']].notna().all(axis=1)
+               & partidos['Equipo'].notna() & partidos['Oponente'].notna()
+               & ~partidos['Equipo'].isin(['', 'nan']) & ~partidos['Oponente'].isin(['', 'nan']))
+    partidos['Invertido'] = partidos['Equipo'] > partidos['Oponente']
+    primero = partidos['Equipo'].where(~partidos['Invertido'], partidos['Oponente'])
+    segundo = partidos['Oponente'].where(~partidos['Invertido'], partidos['Equipo'])
+    partidos['Clave'] = (partidos['Fecha'].dt.strftime('%Y-%m-%d') + '|' + primero.astype(str) + '|'
+                         + segundo.astype(str)).where(validas)
+    return partidos
+
+def factor_margen(diferencia):
+    """Multiplicador de K según la diferencia de goles (World Football Elo)"""
+    diferencia = abs(diferencia)
+    if diferencia <= 1:
+        return 1.0
+    if diferencia == 2:
+        return 1.5
+    return (11.0 + diferencia) / 8.0
+
+def actualizar_estado(estado, df):
+    """
+    Procesa en orden cronológico los partidos de df que el estado aún no conoce y
+    actualiza los ratings (O(1) por partido). Los partidos ya procesados no se
+    repiten, así que basta con pasar los registros nuevos o todos los registros.
+
+    Args:
+        estado: Estado creado con crear_estado o cargar_estado
+        df: Registros de FBref con 'Fecha', 'Equipo', 'Oponente', 'Sede' y 'Resultado'
+
+    Returns:
+        int: Número de partidos nuevos procesados
+    """
+    config = estado['config']
+    ratings = estado['ratings']
+    partidos_procesados = estado['partidos']
+
+    partidos = extraer_partidos(df)
+    nuevos = partidos[partidos['Clave'].notna() & ~partidos['Clave'].isin(list(partidos_procesados))]
+    nuevos = nuevos.drop_duplicates('Clave').sort_values(['Fecha', 'Clave'], kind='mergesort')
+
+    if len(nuevos) and estado['ultima_fecha'] and nuevos['Fecha'].min() < pd.Timestamp(estado['ultima_fecha']):
+        print(f"Advertencia: hay partidos anteriores al último procesado ({estado['ultima_fecha']}); "
+              f"se aplican al final sin recalcular el historial")
+
+    for clave, equipo, oponente, es_local, favor, contra in zip(
+            nuevos['Clave'], nuevos['Equipo'], nuevos['Oponente'], nuevos['Es_Local'],
+            nuevos['Goles_Favor'], nuevos['Goles_Contra']):
+        rating_equipo = ratings.get(equipo, config['inicial'])
+        rating_oponente = ratings.get(oponente, config['inicial'])
+
+        diferencia = rating_equipo - rating_oponente + es_local * config['ventaja_local']
+        esperado = 1.0 / (1.0 + 10.0 ** (-diferencia / 400.0))
+        resultado = 1.0 if favor > contra else (0.5 if favor == contra else 0.0)
+        cambio = config['k'] * factor_margen(favor - contra) * (resultado - esperado)
+
+        ratings[equipo] = rating_equipo + cambio
+        ratings[oponente] = rating_oponente - cambio
+
+        # Ratings previos en el orden de la clave (primer equipo, segundo equipo)
+        previos = [rating_equipo, rating_oponente] if equipo <= oponente else [rating_oponente, rating_equipo]
+        partidos_procesados[clave] = [round(valor, 2) for valor in previos]
+
+    if len(nuevos):
+        ultima = nuevos['Fecha'].max().strftime('%Y-%m-%d')
+        estado['ultima_fecha'] = max(ultima, estado['ultima_fecha'] or ultima)
+    return len(nuevos)
+
+def caracteristicas_elo(df, estado=None):
+    """
+    Rating previo al partido del equipo del jugador y del oponente para cada fila.
+    Si no se pasa un estado, los ratings se calculan desde cero con los datos de df
+    (el resultado solo depende de los datos, como el resto de la matriz de características).
+
+    Returns:
+        DataFrame: 'Elo_Equipo', 'Elo_Oponente' y 'Elo_Diferencia' alineadas con df
+            (NaN en las filas sin partido identificable)
+    """
+    if estado is None:
+        estado = crear_estado()
+    actualizar_estado(estado, df)
+
+    partidos = extraer_partidos(df)
+    previos = partidos['Clave'].map(lambda clave: estado['partidos'].get(clave) if isinstance(clave, str) else None)
+    primero = previos.map(lambda valores: valores[0] if valores else np.nan).astype('float64')
+    segundo = previos.map(lambda valores: valores[1] if valores else np.nan).astype('float64')
+
+    invertido = partidos['Invertido'].to_numpy()
+    elo_equipo = np.where(invertido, segundo, primero)
+    elo_oponente = np.where(invertido, primero, segundo)
+    return pd.DataFrame({
+        'Elo_Equipo': elo_equipo,
+        'Elo_Oponente': elo_oponente,
+        'Elo_Diferencia': elo_equipo - elo_oponente,
+    }, index=df.index)
+
+def actualizar_elo(df, ruta_estado=RUTA_ESTADO_ELO, config=None):
+    """
+    Carga el estado guardado, procesa solo los partidos nuevos de df, guarda el
+    estado y devuelve las características de df.
+
+    Args:
+        df: Registros de FBref (pueden incluir partidos ya procesados)
+        ruta_estado: Archivo del estado
+        config: Parámetros del rating (solo se usan al crear el estado)
+
+    Returns:
+        DataFrame: Características Elo alineadas con df (ver caracteristicas_elo)
+    """
+    estado = cargar_estado(ruta_estado, config)
+    nuevos = actualizar_estado(estado, df)
+    guardar_estado(estado, ruta_estado)
+    print(f"✓ Ratings Elo actualizados con {nuevos} partidos nuevos ({len(estado['partidos'])} en total)")
+    return caracteristicas_elo(df, estado)
+
+def ratings_actuales(estado):
+    """Ratings vigentes de todos los equipos, de mayor a menor (para partidos futuros)"""
+    return pd.Series(estado['ratings'], name='Elo', dtype='float64').sort_values(ascending=False)
@@ -0,0 +1,152 @@
+import difflib
+import json
+import os
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Registro de equipos: código estable -> nombre canónico y alias. Para añadir un equipo
+# basta con agregar su entrada en equipos.json con el siguiente código libre.
+RUTA_REGISTRO_EQUIPOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "equipos.json")
+
+# Prefijos de país de FBref ('co MILLONARIOS', 'ar Boca Juniors'); solo 'co' es colombiano
+PREFIJOS_PAISES = ['ar', 'br', 'cl', 'co', 'ec', 'pe', 'uy', 'bo']
+
+# Palabras que se eliminan al comparar nombres por coincidencia parcial
+PALABRAS_GENERICAS = [" FC", "DEPORTIVO", "DEPORTES", "ATLETICO"]
+
+# Similitud mínima (difflib) para aceptar una escritura nueva de un equipo
+SIMILITUD_MINIMA = 0.85
+
+# Palabras que delatan un nombre de equipo en las tablas de SofaScore
+INDICADORES_EQUIPO = ["FC", "Independiente", "Atlético", "Deportivo", "Junior", "Caldas",
+                      "Santa Fe", "Magdalena", "Medellín", "Cali", "Nacional", "Bucaramanga",
+                      "Chicó", "Tolima", "Millonarios", "Fortaleza", "Águilas", "Envigado",
+                      "Alianza", "Pasto", "Equidad", "Pereira", "Rionegro", "Llaneros",
+                      "Unión", "América", "Barranquilla", "Valledupar", "Doradas", "CEIF"]
+
+def cargar_registro_equipos(ruta_registro=RUTA_REGISTRO_EQUIPOS):
+    """
+    Carga el registro de equipos desde un archivo JSON.
+
+    Args:
+        ruta_registro: Ruta al JSON con el formato {"<código>": {"nombre": ..., "alias": [...]}}
+
+    Returns:
+        dict: Registro indexado por código entero, en orden de código
+    """
+    with open(ruta_registro, encoding='utf-8') as f:
+        registro = {int(codigo): entrada for codigo, entrada in json.load(f).items()}
+
+    # Los códigos deben ser 0..n-1 para coincidir con los códigos de pd.Categorical
+    if sorted(registro) != list(range(len(registro))):
+        raise ValueError(f"Los códigos de {ruta_registro} deben ser consecutivos desde 0")
+    return dict(sorted(registro.items()))
+
+def normalizar_texto(nombre):
+    """
+    Clave de comparación de un nombre: sin tildes, en mayúsculas y con espacios simples.
+    """
+    sin_tildes = unicodedata.normalize('NFKD', str(nombre)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sin_tildes.upper().split())
+
+REGISTRO_EQUIPOS = cargar_registro_equipos()
+NOMBRES_EQUIPOS = [entrada['nombre'] for entrada in REGISTRO_EQUIPOS.values()]
+CODIGOS_EQUIPOS = {entrada['nombre']: codigo for codigo, entrada in REGISTRO_EQUIPOS.items()}
+
+# Clave normalizada de cada nombre canónico y alias -> nombre canónico
+ALIAS_EQUIPOS = {
+    normalizar_texto(alias): entrada['nombre']
+    for entrada in REGISTRO_EQUIPOS.values()
+    for alias in [entrada['nombre']] + entrada['alias']
+}
+
+def _simplificar(clave):
+    for palabra in PALABRAS_GENERICAS:
+        clave = clave.replace(palabra, "")
+    return clave.strip()
+
+def _coincidencia_aproximada(clave):
+    """
+    Busca el equipo de una escritura desconocida: primero por contención de los
+    nombres sin palabras genéricas y después por similitud de texto con los alias.
+    """
+    simple = _simplificar(clave)
+    if simple:
+        for nombre in NOMBRES_EQUIPOS:
+            nombre_simple = _simplificar(normalizar_texto(nombre))
+            if nombre_simple in simple or simple in nombre_simple:
+                return nombre
+
+    parecidos = difflib.get_close_matches(clave, list(ALIAS_EQUIPOS), n=1, cutoff=SIMILITUD_MINIMA)
+    return ALIAS_EQUIPOS[parecidos[0]] if parecidos else None
+
+@lru_cache(maxsize=None)
+def estandarizar_equipo(nombre, aproximado=True):
+    """
+    Devuelve el nombre canónico de un equipo colombiano o None si no se reconoce.
+    Los equipos con prefijo de otro país ('ar ', 'br ', ...) son internacionales y no
+    se mapean. El resultado se guarda en caché, así que la búsqueda aproximada solo
+    se hace una vez por escritura.
+
+    Args:
+        nombre: Nombre del equipo tal como aparece en la fuente
+        aproximado: Si es True, intenta una coincidencia aproximada cuando no hay alias exacto
+
+    Returns:
+        str: Nombre canónico del registro o None
+    """
+    if nombre is None or (isinstance(nombre, float) and np.isnan(nombre)):
+        return None
+
+    texto = str(nombre).strip()
+    if len(texto) > 3 and texto[2] == ' ' and texto[:2].lower() in PREFIJOS_PAISES:
+        if texto[:2].lower() != 'co':
+            return None
+        texto = texto[3:]
+
+    clave = normalizar_texto(texto)
+    if clave in ALIAS_EQUIPOS:
+        return ALIAS_EQUIPOS[clave]
+    return _coincidencia_aproximada(clave) if aproximado else None
+
+def estandarizar_equipos(serie, conservar_desconocidos=True, aproximado=True):
+    """
+    Estandariza una columna completa de nombres de equipos. Cada escritura distinta
+    se resuelve una sola vez y el resultado se reparte a todas sus filas.
+
+    Args:
+        serie: Serie con nombres de equipos
+        conservar_desconocidos: Si es True, los equipos no reconocidos conservan su nombre;
+                                si es False quedan como nulos
+        aproximado: Si es True, usa la coincidencia aproximada para escrituras nuevas
+
+    Returns:
+        Series: Nombres canónicos con el mismo índice que la serie original
+    """
+    codigos, unicos = pd.factorize(serie)
+    estandar = [estandarizar_equipo(valor, aproximado) for valor in unicos]
+    if conservar_desconocidos:
+        estandar = [canonico if canonico is not None else valor for canonico, valor in zip(estandar, unicos)]
+    estandar = np.array(estandar + [None], dtype=object)[:-1]
+
+    resultado = np.full(len(codigos), None, dtype=object)
+    resultado[codigos >= 0] = estandar[codigos[codigos >= 0]]
+    return pd.Series(resultado, index=serie.index, name=serie.name)
+
+def codificar_equipos(serie, aproximado=True):
+    """
+    Convierte una columna de nombres en una categórica con las categorías del registro;
+    sus códigos (.cat.codes) son los códigos estables de equipos.json y -1 para
+    equipos desconocidos.
+    """
+    estandar = estandarizar_equipos(serie, conservar_desconocidos=False, aproximado=aproximado)
+    return pd.Series(pd.Categorical(estandar, categories=NOMBRES_EQUIPOS), index=serie.index, name=serie.name)
+
+def parece_equipo(texto):
+    """
+    Indica si un texto de SofaScore parece el nombre de un equipo y no el de un jugador.
+    """
+    return any(indicador in texto for indicador in INDICADORES_EQUIPO)
@@ -0,0 +1,287 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Filas leídas para detectar qué columnas sin tipo declarado son numéricas
+FILAS_MUESTRA_TIPOS = 1000
+
+# Filas por bloque cuando algún valor no encaja en el tipo declarado
+TAMANO_BLOQUE_CONVERSION = 100_000
+
+# Columnas de conteo por partido de los jugadores de campo (FBref)
+COLUMNAS_CONTEO_GOLEADORES = [
+    "Minutos", "Goles", "Asistencias", "Penales marcados",
+    "Penales intentados", "Tiros totales", "Tiros a puerta",
+    "Tarjetas amarillas", "Tarjetas rojas", "Faltas cometidas",
+    "Faltas recibidas", "Fuera de juego", "Centros",
+    "Entradas ganadas", "Intercepciones", "Goles en propia",
+    "Penales ganados", "Penales concedidos"
+]
+
+# Columnas de conteo por partido de los porteros (FBref)
+COLUMNAS_CONTEO_PORTEROS = [
+    "Minutos", "Tiros a puerta recibidos", "Goles encajados", "Paradas",
+    "Porterías a cero", "Penales recibidos", "Penales permitidos",
+    "Penales atajados", "Penales fallados"
+]
+
+# Columnas de texto de los archivos de SofaScore; el resto son estadísticas
+COLUMNAS_TEXTO_SOFASCORE = ["Team", "Name", "Position", "All_Positions", "Torneo"]
+
+# Los conteos por partido caben en int16; las columnas de texto se dejan como las
+# infiere pandas porque los notebooks las reasignan y agrupan libremente. Los totales
+# acumulados (minutos de una temporada, goles históricos) no caben en int16: sum(),
+# cumsum() y groupby().sum() de pandas devuelven int64, y caracteristicas.py acumula
+# en float64; no acumular con operaciones de numpy que conserven el tipo de entrada
+ESQUEMAS = {
+    # Salida de Unificacion_año_jugador.py
+    'goleadores_unificados': {
+        'ruta': "data/Goleadores_Unificados.csv",
+        'tipos': {columna: 'int16' for columna in COLUMNAS_CONTEO_GOLEADORES},
+        'fechas': ['Fecha'],
+    },
+    # Salida de Unificacion_año_GoalKeeper.py
+    'porteros_unificados': {
+        'ruta': "data/porteros_unificados.csv",
+        'tipos': {
+            **{columna: 'int16' for columna in COLUMNAS_CONTEO_PORTEROS},
+            'Porcentaje de paradas': 'float32',
+        },
+        'fechas': ['Fecha'],
+    },
+    # Salida de procesar_goleadores (Analisis_goleadores_Sarimax.ipynb)
+    'goleadores_procesados': {
+        'ruta': "Goleadores_Procesados.csv",
+        'tipos': {
+            **{columna: 'int16' for columna in COLUMNAS_CONTEO_GOLEADORES},
+            'Año': 'int16',
+            'Mes': 'int8',
+            'Sede_Local': 'int8',
+            'Sede_Visitante': 'int8',
+        },
+        'fechas': ['Fecha'],
+    },
+    # Calendario de partidos a predecir
+    'calendario': {
+        'ruta': "calendario_2025.csv",
+        'tipos': {'Fecha_Numero': 'int16'},
+        'fechas': ['Fecha'],
+    },
+    # Predicciones de los modelos ARIMAX y Poisson (mismas columnas base)
+    'predicciones_arima': {
+        'ruta': "predicciones_calendario_2025.csv",
+        'tipos': {
+            'Fecha_Numero': 'int16',
+            'Juega_Local': 'bool',
+            'Num_Coeficientes': 'int16',
+            'Total_Goles_Historicos': 'int16',
+            'Total_Partidos': 'int16',
+            'Partidos_vs_Oponente': 'int16',
+        },
+        'fechas': ['Fecha'],
+    },
+    'predicciones_poisson': {
+        'ruta': "predicciones_calendario_poisson2025.csv",
+        'tipos': {
+            'Fecha_Numero': 'int16',
+            'Juega_Local': 'bool',
+            'Num_Coeficientes': 'int16',
+            'Total_Goles_Historicos': 'int16',
+            'Total_Partidos': 'int16',
+            'Partidos_vs_Oponente': 'int16',
+            'Gol_Mas_Probable': 'int8',
+        },
+        'fechas': ['Fecha'],
+    },
+    # Estadísticas de SofaScore (por torneo y unificadas por Unificacion.py)
+    'jugadores_sofascore': {
+        'ruta': "data/jugadores_unificados_cinco_torneos.csv",
+        'tipos': {},
+        'fechas': [],
+        'texto': COLUMNAS_TEXTO_SOFASCORE,
+        'numericas_por_defecto': 'float32',
+    },
+    'evolucion_jugadores': {
+        'ruta': "data/evolucion_jugadores_2025A.csv",
+        'tipos': {},
+        'fechas': [],
+        'texto': COLUMNAS_TEXTO_SOFASCORE,
+        'numericas_por_defecto': 'float32',
+    },
+}
+
+def _tipo_con_nulos(tipo):
+    """
+    Devuelve un tipo de numpy que admite nulos para un tipo entero ('int16' -> 'float32').
+    Se usan flotantes y no los enteros nulables de pandas ('Int16'), que statsmodels
+    no acepta; float32 representa exactamente los enteros de int8 e int16.
+    """
+    if isinstance(tipo, str) and tipo.startswith('int'):
+        return 'float32' if np.dtype(tipo).itemsize <= 2 else 'float64'
+    return tipo
+
+def _a_numerico(serie, tipo):
+    """
+    Convierte una serie a un tipo numérico; los valores no numéricos quedan nulos.
+
+    Returns:
+        tuple: (serie convertida, número de valores no nulos que se convirtieron en nulos)
+    """
+    valores = pd.to_numeric(serie, errors='coerce')
+    forzados = int((valores.isna() & serie.notna()).sum())
+    if valores.isna().any():
+        tipo = _tipo_con_nulos(tipo)
+    return valores.astype(tipo), forzados
+
+def _avisar_forzados(forzados, nombre=None):
+    """Avisa de los valores no numéricos que se convirtieron en nulos, por columna"""
+    forzados = {columna: n for columna, n in forzados.items() if n}
+    if forzados:
+        origen = f"{nombre}: " if nombre else ""
+        warnings.warn(f"{origen}valores no numéricos convertidos en nulos por columna: {forzados}", stacklevel=3)
+
+def aplicar_tipos(df, tipos, nombre=None):
+    """
+    Convierte las columnas presentes del DataFrame a los tipos indicados.
+    Los valores no numéricos se convierten en nulos (con un aviso que indica cuántos
+    por columna) y los enteros con nulos pasan a flotante (ver _tipo_con_nulos).
+
+    Args:
+        df: DataFrame a convertir
+        tipos: Diccionario columna -> tipo
+        nombre: Nombre de los datos en el aviso (por ejemplo la ruta del archivo)
+
+    Returns:
+        DataFrame: El mismo DataFrame con los tipos aplicados
+    """
+    forzados = {}
+    for columna, tipo in tipos.items():
+        if columna not in df.columns or df[columna].dtype == tipo:
+            continue
+
+        if tipo == 'bool':
+            valores = df[columna].astype(str).str.strip().str.lower()
+            df[columna] = valores.isin(['true', '1', '1.0'])
+            continue
+
+        df[columna], forzados[columna] = _a_numerico(df[columna], tipo)
+
+    _avisar_forzados(forzados, nombre)
+    return df
+
+def _columnas_numericas(ruta, columnas, excluidas, **kwargs):
+    """
+    Devuelve las columnas no excluidas que son numéricas en las primeras filas del
+    archivo, para leerlas directamente con el tipo por defecto. Las columnas con
+    texto (por ejemplo '45%') se dejan como las infiere pandas.
+    """
+    candidatas = [col for col in columnas if col not in excluidas]
+    if not candidatas:
+        return []
+    muestra = pd.read_csv(ruta, usecols=candidatas, nrows=FILAS_MUESTRA_TIPOS, **kwargs)
+    return [col for col in candidatas if pd.api.types.is_numeric_dtype(muestra[col])
+            and not pd.api.types.is_bool_dtype(muestra[col])]
+
+def leer_csv(ruta, tipos=None, columnas=None, fechas=None, texto=None, numericas_por_defecto=None, **kwargs):
+    """
+    Lee un CSV aplicando los tipos en la lectura y cargando solo las columnas pedidas.
+
+    Los tipos se pasan a pd.read_csv para no construir antes columnas float64/int64.
+    Si algún valor no encaja (vacíos en enteros, texto), el archivo se lee una sola
+    vez por bloques: cada bloque pasa las columnas numéricas a un flotante común y
+    el tipo final se aplica una sola vez sobre el resultado, así que todas las filas
+    tienen el mismo tipo (flotante si la columna entera tiene nulos, ver aplicar_tipos).
+    Los valores no numéricos quedan nulos y se avisa de cuántos hay por columna.
+
+    Args:
+        ruta: Ruta del archivo CSV
+        tipos: Diccionario columna -> tipo (se ignoran las columnas que no estén en el archivo)
+        columnas: Lista de columnas a cargar (None para cargar todas)
+        fechas: Columnas que se convierten a datetime
+        texto: Columnas que se leen siempre como texto
+        numericas_por_defecto: Tipo para el resto de columnas numéricas (por ejemplo 'float32'),
+                               detectadas en las primeras filas del archivo; si más adelante
+                               tienen texto, esos valores quedan nulos con un aviso
+        **kwargs: Argumentos adicionales para pd.read_csv (encoding, sep, ...)
+
+    Returns:
+        DataFrame: Datos cargados con los tipos del esquema
+    """
+    tipos = tipos or {}
+    fechas = fechas or []
+    texto = texto or []
+
+    # Leer solo el encabezado para proyectar columnas y tipos
+    disponibles = pd.read_csv(ruta, nrows=0, **kwargs).columns.tolist()
+
+    if columnas is not None:
+        faltantes = [col for col in columnas if col not in disponibles]
+        if faltantes:
+            raise KeyError(f"Columnas no encontradas en {ruta}: {faltantes}")
+        seleccionadas = [col for col in disponibles if col in columnas]
+    else:
+        seleccionadas = disponibles
+
+    tipos_lectura = {col: tipo for col, tipo in tipos.items() if col in seleccionadas}
+    tipos_texto = {col: 'object' for col in texto if col in seleccionadas}
+    if numericas_por_defecto:
+        excluidas = set(tipos_lectura) | set(fechas) | set(texto)
+        numericas = _columnas_numericas(ruta, seleccionadas, excluidas, **kwargs)
+        tipos_lectura.update({col: numericas_por_defecto for col in numericas})
+
+    try:
+        df = pd.read_csv(ruta, usecols=seleccionadas, dtype={**tipos_lectura, **tipos_texto}, **kwargs)
+    except (ValueError, TypeError, OverflowError):
+        # Algún valor no encaja en el tipo declarado: cada bloque pasa a un flotante común
+        # (con nulos) y el tipo final se decide una vez con todas las filas
+        numericas = {col: _tipo_con_nulos(tipo) for col, tipo in tipos_lectura.items() if tipo != 'bool'}
+        forzados = dict.fromkeys(numericas, 0)
+        partes = []
+        for bloque in pd.read_csv(ruta, usecols=seleccionadas, dtype=tipos_texto,
+                                  chunksize=TAMANO_BLOQUE_CONVERSION, **kwargs):
+            for columna, tipo in numericas.items():
+                bloque[columna], n = _a_numerico(bloque[columna], tipo)
+                forzados[columna] += n
+            partes.append(bloque)
+        df = aplicar_tipos(pd.concat(partes, ignore_index=True), tipos_lectura)
+        _avisar_forzados(forzados, ruta)
+
+    for columna in fechas:
+        if columna in df.columns:
+            df[columna] = pd.to_datetime(df[columna], errors='coerce')
+
+    return df
+
+def cargar_dataset(nombre, ruta=None, columnas=None, **kwargs):
+    """
+    Carga uno de los conjuntos de datos del proyecto con su esquema de tipos.
+
+    Args:
+        nombre: Clave del conjunto de datos en ESQUEMAS (por ejemplo 'goleadores_procesados')
+        ruta: Ruta del archivo (por defecto la del esquema)
+        columnas: Lista de columnas a cargar (None para cargar todas)
+        **kwargs: Argumentos adicionales para pd.read_csv
+
+    Returns:
+        DataFrame: Datos cargados
+    """
+    if nombre not in ESQUEMAS:
+        raise KeyError(f"Conjunto de datos desconocido: {nombre}. Disponibles: {list(ESQUEMAS)}")
+
+    esquema = ESQUEMAS[nombre]
+    ruta = ruta or esquema['ruta']
+
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No se encontró el archivo {ruta}")
+
+    return leer_csv(
+        ruta,
+        tipos=esquema.get('tipos'),
+        columnas=columnas,
+        fechas=esquema.get('fechas'),
+        texto=esquema.get('texto'),
+        numericas_por_defecto=esquema.get('numericas_por_defecto'),
+        **kwargs
+    )
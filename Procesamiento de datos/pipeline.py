@@ -0,0 +1,485 @@
+"""
+Ejecución de la cadena completa de datos por etapas, al estilo de make.
+
+Cada etapa declara sus entradas y salidas (rutas o patrones glob relativos a la
+raíz del repositorio). Una etapa se vuelve a ejecutar solo si cambió la huella
+de sus entradas (hash del contenido de los archivos y del comando) o si falta
+alguna de sus salidas. Las dependencias se deducen de las rutas: una etapa
+depende de las que producen alguna de sus entradas. Las etapas independientes
+se ejecutan en paralelo.
+
+Uso:
+    python pipeline.py                        # todas las etapas desactualizadas
+    python pipeline.py modelos_poisson        # una etapa y las que necesita
+    python pipeline.py --simular              # muestra qué se ejecutaría
+    python pipeline.py --sin-interactivas     # omite scrapers y unificadores interactivos
+"""
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+# Raíz del repositorio: las rutas de las etapas son relativas a ella
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Estado (huellas de las etapas y hashes de archivos), registros de salida e informes
+CARPETA_PIPELINE = os.path.join(RAIZ, "Procesamiento de datos", "pipeline")
+RUTA_ESTADO_PIPELINE = os.path.join(CARPETA_PIPELINE, "estado.json")
+
+# Etapas en orden de la cadena. '{python}' se sustituye por el intérprete actual.
+# Las etapas interactivas piden datos por consola: usan la terminal y se ejecutan de
+# una en una; el resto escribe su salida en pipeline/logs/<etapa>.log
+ETAPAS = [
+    {
+        'nombre': 'scraping_sofascore',
+        'directorio': "scraper",
+        'comando': ['{python}', 'main.py', '--visible'],
+        'entradas': [],
+        'salidas': ["scraper/data/*/all/jugadores_liga_colombiana_completo.csv"],
+        'interactiva': True,
+    },
+    {
+        'nombre': 'scraping_fbref_jugadores',
+        'directorio': "scraper",
+        'comando': ['{python}', 'Fbref/FbrefPlayers_scraper.py'],
+        'entradas': [],
+        'salidas': ["scraper/data/Jugadores seleccionados/*/*.csv"],
+        'interactiva': True,
+    },
+    {
+        'nombre': 'scraping_fbref_porteros',
+        'directorio': "scraper",
+        'comando': ['{python}', 'Fbref/FbrefGoalkeeper_scraper.py'],
+        'entradas': [],
+        'salidas': ["scraper/data/Porteros seleccionados/*/*.csv"],
+        'interactiva': True,
+    },
+    {
+        'nombre': 'unificacion_goleadores',
+        'directorio': "Procesamiento de datos",
+        'comando': ['{python}', '../scraper/Fbref/Unificacion_año_jugador.py',
+                    '--salida', 'data/Goleadores_Unificados.csv'],
+        'entradas': ["scraper/data/Jugadores seleccionados/*/*.csv",
+                     "scraper/Fbref/Unificacion_año_jugador.py",
+                     "Procesamiento de datos/esquemas.py"],
+        'salidas': ["Procesamiento de datos/data/Goleadores_Unificados.csv"],
+        'interactiva': True,
+    },
+    {
+        'nombre': 'unificacion_porteros',
+        'directorio': "Procesamiento de datos",
+        'comando': ['{python}', '../scraper/Fbref/Unificacion_año_GoalKeeper.py',
+                    '--salida', 'data/porteros_unificados.csv'],
+        'entradas': ["scraper/data/Porteros seleccionados/*/*.csv",
+                     "scraper/Fbref/Unificacion_año_GoalKeeper.py",
+                     "Procesamiento de datos/esquemas.py"],
+        'salidas': ["Procesamiento de datos/data/porteros_unificados.csv"],
+        'interactiva': True,
+    },
+    {
+        'nombre': 'unificacion_sofascore',
+        'directorio': "Procesamiento de datos",
+        'comando': ['{python}', 'Unificacion.py'],
+        'entradas': ["scraper/data/*/all/jugadores_liga_colombiana_completo.csv",
+                     "Procesamiento de datos/torneos.json",
+                     "Procesamiento de datos/Unificacion.py",
+                     "Procesamiento de datos/calidad_datos.py",
+                     "Procesamiento de datos/esquemas.py",
+                     "Procesamiento de datos/equipos.py",
+                     "Procesamiento de datos/equipos.json"],
+        'salidas': ["Procesamiento de datos/data/jugadores_unificados_cinco_torneos.csv"],
+    },
+    {
+        'nombre': 'preprocesamiento',
+        'directorio': "Procesamiento de datos",
+        'comando': ['{python}', 'caracteristicas.py'],
+        'entradas': ["Procesamiento de datos/data/Goleadores_Unificados.csv",
+                     "Procesamiento de datos/caracteristicas.py",
+                     "Procesamiento de datos/elo_equipos.py",
+                     "Procesamiento de datos/equipos.py",
+                     "Procesamiento de datos/equipos.json",
+                     "Procesamiento de datos/esquemas.py"],
+        'salidas': ["Procesamiento de datos/Goleadores_Procesados.csv"],
+    },
+    {
+        # Ajuste de los modelos de Poisson y predicción del calendario
+        'nombre': 'modelos_poisson',
+        'directorio': "Procesamiento de datos",
+        'comando': ['{python}', '-m', 'jupyter', 'nbconvert', '--to', 'notebook', '--execute',
+                    '--ExecutePreprocessor.timeout=-1', '--output-dir', 'pipeline/notebooks',
+                    'Analisis_goleadores_Poisson.ipynb'],
+        'entradas': ["Procesamiento de datos/Goleadores_Procesados.csv",
+                     "Procesamiento de datos/calendario_2025.csv",
+                     "Procesamiento de datos/Analisis_goleadores_Poisson.ipynb",
+                     # Módulos que importa el notebook (directa o indirectamente)
+                     "Procesamiento de datos/poisson_agrupado.py",
+                     "Procesamiento de datos/calendario_poisson.py",
+                     "Procesamiento de datos/registro_modelos.py",
+                     "Procesamiento de datos/simulacion_temporada.py",
+                     "Procesamiento de datos/caracteristicas.py",
+                     "Procesamiento de datos/elo_equipos.py",
+                     "Procesamiento de datos/esquemas.py",
+                     "Procesamiento de datos/equipos.py",
+                     "Procesamiento de datos/equipos.json"],
+        'salidas': ["Procesamiento de datos/predicciones_calendario_poisson2025.csv"],
+    },
+    {
+        # Ajuste de los modelos ARIMA/ARIMAX y predicción del calendario
+        'nombre': 'modelos_arima',
+        'directorio': "Procesamiento de datos",
+        'comando': ['{python}', '-m', 'jupyter', 'nbconvert', '--to', 'notebook', '--execute',
+                    '--ExecutePreprocessor.timeout=-1', '--output-dir', 'pipeline/notebooks',
+                    'Analisis_goleadores_Sarimax.ipynb'],
+        'entradas': ["Procesamiento de datos/Goleadores_Procesados.csv",
+                     "Procesamiento de datos/calendario_2025.csv",
+                     "Procesamiento de datos/data/Goleadores_Unificados.csv",
+                     "Procesamiento de datos/Analisis_goleadores_Sarimax.ipynb",
+                     # Módulos que importa el notebook (directa o indirectamente)
+                     "Procesamiento de datos/series_arima.py",
+                     "Procesamiento de datos/caracteristicas.py",
+                     "Procesamiento de datos/elo_equipos.py",
+                     "Procesamiento de datos/correlacion_incremental.py",
+                     "Procesamiento de datos/registro_modelos.py",
+                     "Procesamiento de datos/esquemas.py",
+                     "Procesamiento de datos/equipos.py",
+                     "Procesamiento de datos/equipos.json"],
+        'salidas': ["Procesamiento de datos/predicciones_calendario_2025.csv"],
+    },
+]
+
+# Tolerancia (segundos) al comparar la fecha de modificación de las salidas con el
+# inicio de la etapa, por la resolución de las fechas del sistema de archivos
+MARGEN_FECHA_SALIDAS = 2.0
+
+# Tamaño de bloque para calcular el hash de los archivos
+TAMANO_BLOQUE_HASH = 1 << 20
+
+# Símbolo de cada estado de etapa en la consola
+SIMBOLOS_ESTADO = {'al_dia': '✓', 'ejecutada': '✓', 'se_ejecutaria': '→', 'omitida': '-', 'error': '✗',
+                   'bloqueada': '✗'}
+
+def cargar_estado_pipeline(ruta=RUTA_ESTADO_PIPELINE):
+    """Huellas de la última ejecución correcta de cada etapa y hashes de archivos"""
+    if not os.path.exists(ruta):
+        return {'etapas': {}, 'archivos': {}}
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def guardar_estado_pipeline(estado, ruta=RUTA_ESTADO_PIPELINE):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, indent=1, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+def expandir(patrones, raiz=RAIZ):
+    """Archivos (rutas relativas a la raíz, ordenadas) que coinciden con los patrones"""
+    archivos = set()
+    for patron in patrones:
+        for ruta in glob.glob(os.path.join(raiz, patron)):
+            if os.path.isfile(ruta):
+                archivos.add(os.path.relpath(ruta, raiz).replace(os.sep, '/'))
+    return sorted(archivos)
+
+def hash_archivo(ruta_relativa, cache_archivos, raiz=RAIZ):
+    """
+    Hash SHA-256 del contenido de un archivo. Solo se recalcula si cambió su fecha
+    de modificación o su tamaño (se guarda en el estado del pipeline).
+    """
+    ruta = os.path.join(raiz, ruta_relativa)
+    info = os.stat(ruta)
+    guardado = cache_archivos.get(ruta_relativa)
+    if guardado and guardado['mtime'] == info.st_mtime and guardado['tamano'] == info.st_size:
+        return guardado['hash']
+
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE_HASH), b''):
+            sha.update(bloque)
+    cache_archivos[ruta_relativa] = {'mtime': info.st_mtime, 'tamano': info.st_size, 'hash': sha.hexdigest()}
+    return sha.hexdigest()
+
+def huella_etapa(etapa, cache_archivos, raiz=RAIZ):
+    """Huella de la definición de la etapa y del contenido de sus entradas"""
+    contenido = {
+        'directorio': etapa['directorio'],
+        'comando': etapa['comando'],
+        'entradas': {ruta: hash_archivo(ruta, cache_archivos, raiz) for ruta in expandir(etapa['entradas'], raiz)},
+    }
+    return hashlib.sha256(json.dumps(contenido, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def _coinciden(patron_a, patron_b):
+    return patron_a == patron_b or fnmatch.fnmatch(patron_a, patron_b) or fnmatch.fnmatch(patron_b, patron_a)
+
+def dependencias(etapas=ETAPAS):
+    """
+    Deduce las dependencias: una etapa depende de las etapas anteriores que
+    producen alguna de sus entradas.
+
+    Returns:
+        dict: Nombre de etapa -> lista de etapas de las que depende
+    """
+    grafo = {}
+    for posicion, etapa in enumerate(etapas):
+        grafo[etapa['nombre']] = [
+            anterior['nombre'] for anterior in etapas[:posicion]
+            if any(_coinciden(entrada, salida) for entrada in etapa['entradas'] for salida in anterior['salidas'])
+        ]
+    return grafo
+
+def seleccionar_etapas(objetivos, grafo):
+    """Etapas objetivo y todas las etapas de las que dependen (en el orden de ETAPAS)"""
+    if not objetivos:
+        return list(grafo)
+    desconocidas = [nombre for nombre in objetivos if nombre not in grafo]
+    if desconocidas:
+        raise KeyError(f"Etapas desconocidas: {desconocidas}. Disponibles: {list(grafo)}")
+
+    seleccionadas = set()
+    pendientes = list(objetivos)
+    while pendientes:
+        nombre = pendientes.pop()
+        if nombre not in seleccionadas:
+            seleccionadas.add(nombre)
+            pendientes.extend(grafo[nombre])
+    return [nombre for nombre in grafo if nombre in seleccionadas]
+
+def motivo_ejecucion(etapa, estado, huella, raiz=RAIZ):
+    """
+    Motivo por el que la etapa está desactualizada, o None si está al día.
+    Si no hay huella guardada (primera ejecución del pipeline) se comparan las
+    fechas de modificación como make: la etapa está al día si sus salidas son
+    posteriores a todas sus entradas.
+    """
+    faltantes = [patron for patron in etapa['salidas'] if not expandir([patron], raiz)]
+    if faltantes:
+        return f"faltan salidas: {faltantes}"
+
+    guardado = estado['etapas'].get(etapa['nombre'])
+    if guardado is None:
+        entradas = expandir(etapa['entradas'], raiz)
+        salidas = expandir(etapa['salidas'], raiz)
+        ultima_entrada = max((os.path.getmtime(os.path.join(raiz, ruta)) for ruta in entradas), default=0.0)
+        primera_salida = min(os.path.getmtime(os.path.join(raiz, ruta)) for ruta in salidas)
+        return None if primera_salida >= ultima_entrada else "entradas posteriores a las salidas"
+
+    if guardado['huella'] != huella:
+        return "cambiaron las entradas"
+    return None
+
+def salidas_no_actualizadas(etapa, desde, raiz=RAIZ):
+    """
+    Patrones de salida sin ningún archivo modificado desde el instante 'desde'
+    (time.time()); un patrón glob basta con que actualice uno de sus archivos.
+    """
+    return [patron for patron in etapa['salidas']
+            if not any(os.path.getmtime(os.path.join(raiz, ruta)) >= desde - MARGEN_FECHA_SALIDAS
+                       for ruta in expandir([patron], raiz))]
+
+def _comando(etapa):
+    return [sys.executable if parte == '{python}' else parte for parte in etapa['comando']]
+
+def ejecutar_comando(etapa, bloqueo_interactivo, raiz=RAIZ, carpeta=CARPETA_PIPELINE):
+    """
+    Ejecuta el comando de una etapa.
+
+    Returns:
+        tuple: (código de salida, ruta del registro o None si usó la terminal)
+    """
+    directorio = os.path.join(raiz, etapa['directorio'])
+    if etapa.get('interactiva'):
+        with bloqueo_interactivo:
+            print(f"\n=== Etapa interactiva: {etapa['nombre']} ===")
+            return subprocess.run(_comando(etapa), cwd=directorio).returncode, None
+
+    carpeta_logs = os.path.join(carpeta, "logs")
+    os.makedirs(carpeta_logs, exist_ok=True)
+    ruta_log = os.path.join(carpeta_logs, f"{etapa['nombre']}.log")
+    with open(ruta_log, 'w', encoding='utf-8') as log:
+        codigo = subprocess.run(_comando(etapa), cwd=directorio, stdin=subprocess.DEVNULL,
+                                stdout=log, stderr=subprocess.STDOUT).returncode
+    return codigo, ruta_log
+
+def procesar_etapa(etapa, estado, opciones, bloqueo_interactivo, raiz=RAIZ, carpeta=CARPETA_PIPELINE):
+    """
+    Comprueba si la etapa está al día y la ejecuta si hace falta. Se llama cuando
+    todas sus dependencias terminaron, así que las entradas ya son las definitivas.
+
+    Returns:
+        dict: Resultado con 'etapa', 'estado' ('al_dia', 'ejecutada', 'omitida', 'error'),
+            'motivo', 'segundos', 'huella' y 'log'
+    """
+    inicio = time.perf_counter()
+    resultado = {'etapa': etapa['nombre'], 'motivo': None, 'huella': None, 'log': None}
+    # Las tareas comparten la caché de hashes; cada una trabaja sobre una copia
+    cache_archivos = dict(estado['archivos'])
+    huella = huella_etapa(etapa, cache_archivos, raiz)
+    resultado['huella'] = huella
+    resultado['archivos'] = cache_archivos
+
+    motivo = "forzada" if etapa['nombre'] in opciones['forzar'] else motivo_ejecucion(etapa, estado, huella, raiz)
+    resultado['motivo'] = motivo
+
+    if motivo is None:
+        resultado.update(estado='al_dia', segundos=time.perf_counter() - inicio)
+    elif opciones['simular']:
+        resultado.update(estado='se_ejecutaria', segundos=0.0)
+    elif etapa.get('interactiva') and opciones['sin_interactivas']:
+        resultado.update(estado='omitida', segundos=0.0)
+    else:
+        inicio_ejecucion = time.time()
+        codigo, ruta_log = ejecutar_comando(etapa, bloqueo_interactivo, raiz, carpeta)
+        resultado['log'] = ruta_log
+        faltantes = [patron for patron in etapa['salidas'] if not expandir([patron], raiz)]
+        # Salidas que siguen siendo las de una ejecución anterior: no se guarda la huella nueva
+        antiguas = salidas_no_actualizadas(etapa, inicio_ejecucion, raiz) if not faltantes else []
+        if codigo != 0:
+            resultado.update(estado='error', motivo=f"código de salida {codigo}")
+        elif faltantes:
+            resultado.update(estado='error', motivo=f"no generó las salidas: {faltantes}")
+        elif antiguas:
+            resultado.update(estado='error', motivo=f"no actualizó las salidas: {antiguas}")
+        else:
+            resultado['estado'] = 'ejecutada'
+        resultado['segundos'] = time.perf_counter() - inicio
+
+    return resultado
+
+def ejecutar_pipeline(objetivos=None, forzar=(), simular=False, sin_interactivas=False, max_workers=None,
+                      etapas=ETAPAS, raiz=RAIZ, carpeta=CARPETA_PIPELINE):
+    """
+    Ejecuta las etapas seleccionadas respetando sus dependencias. Cuando una etapa
+    termina se lanzan en paralelo todas las que ya tienen sus dependencias listas;
+    si una etapa falla, las que dependen de ella no se ejecutan.
+
+    Args:
+        objetivos: Etapas a actualizar junto con sus dependencias (None para todas)
+        forzar: Etapas que se ejecutan aunque estén al día
+        simular: Si es True solo se informa qué etapas se ejecutarían
+        sin_interactivas: Si es True no se ejecutan las etapas interactivas
+        max_workers: Número máximo de etapas simultáneas
+        etapas: Definición de las etapas (ver ETAPAS)
+        raiz: Carpeta respecto de la que se resuelven las rutas de las etapas
+        carpeta: Carpeta del estado, los registros y el informe
+
+    Returns:
+        dict: Informe con la lista de 'etapas' (resultado y segundos de cada una) y el tiempo total
+    """
+    por_nombre = {etapa['nombre']: etapa for etapa in etapas}
+    grafo = dependencias(etapas)
+    seleccionadas = seleccionar_etapas(objetivos, grafo)
+    forzar = set(forzar)
+    opciones = {'forzar': forzar, 'simular': simular, 'sin_interactivas': sin_interactivas}
+
+    ruta_estado = os.path.join(carpeta, "estado.json")
+    estado = cargar_estado_pipeline(ruta_estado)
+    bloqueo_interactivo = threading.Lock()
+    resultados = {}
+    inicio = time.perf_counter()
+
+    pendientes = list(seleccionadas)
+    en_curso = {}
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        while pendientes or en_curso:
+            for nombre in list(pendientes):
+                previas = [previa for previa in grafo[nombre] if previa in seleccionadas]
+                if not all(previa in resultados for previa in previas):
+                    continue
+                pendientes.remove(nombre)
+
+                fallidas = [previa for previa in previas if resultados[previa]['estado'] in ('error', 'bloqueada')]
+                if fallidas:
+                    resultados[nombre] = {'etapa': nombre, 'estado': 'bloqueada', 'segundos': 0.0,
+                                          'motivo': f"fallaron: {fallidas}", 'log': None}
+                    continue
+                # En una simulación, una etapa que depende de otra que se ejecutaría también se ejecutaría
+                if simular and any(resultados[previa]['estado'] == 'se_ejecutaria' for previa in previas):
+                    resultados[nombre] = {'etapa': nombre, 'estado': 'se_ejecutaria', 'segundos': 0.0,
+                                          'motivo': "se ejecutarían sus dependencias", 'log': None}
+                    continue
+                futuro = executor.submit(procesar_etapa, por_nombre[nombre], estado, opciones,
+                                         bloqueo_interactivo, raiz, carpeta)
+                en_curso[futuro] = nombre
+
+            if not en_curso:
+                continue
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                nombre = en_curso.pop(futuro)
+                resultado = futuro.result()
+                resultados[nombre] = resultado
+                estado['archivos'].update(resultado.pop('archivos'))
+                huella = resultado.pop('huella')
+                if resultado['estado'] in ('ejecutada', 'al_dia'):
+                    estado['etapas'][nombre] = {
+                        'huella': huella,
+                        'fecha': datetime.now().isoformat(timespec='seconds'),
+                        'segundos': round(resultado['segundos'], 3)
+                        if resultado['estado'] == 'ejecutada'
+                        else estado['etapas'].get(nombre, {}).get('segundos'),
+                    }
+                if not simular:
+                    guardar_estado_pipeline(estado, ruta_estado)
+                print(f"{SIMBOLOS_ESTADO[resultado['estado']]} {nombre}: {resultado['estado']}"
+                      + (f" ({resultado['motivo']})" if resultado['motivo'] else "")
+                      + f" [{resultado['segundos']:.2f} s]")
+
+    informe = {
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'segundos': time.perf_counter() - inicio,
+        'etapas': [resultados[nombre] for nombre in seleccionadas],
+    }
+    if not simular:
+        os.makedirs(carpeta, exist_ok=True)
+        with open(os.path.join(carpeta, "ultimo_informe.json"), 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+    return informe
+
+def imprimir_informe(informe):
+    """Tabla de tiempos por etapa"""
+    print("\n=== Informe del pipeline ===")
+    print(f"{'Etapa':<28}{'Estado':<16}{'Segundos':>10}")
+    for resultado in informe['etapas']:
+        print(f"{resultado['etapa']:<28}{resultado['estado']:<16}{resultado['segundos']:>10.2f}")
+    print(f"{'Total':<44}{informe['segundos']:>10.2f}")
+    for resultado in informe['etapas']:
+        if resultado['estado'] == 'error' and resultado['log']:
+            print(f"Registro de {resultado['etapa']}: {resultado['log']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Ejecuta las etapas desactualizadas de la cadena de datos')
+    parser.add_argument('etapas', nargs='*', help='Etapas a actualizar junto con sus dependencias (por defecto todas)')
+    parser.add_argument('--forzar', nargs='*', default=None,
+                        help='Ejecutar estas etapas aunque estén al día (sin nombres: todas las seleccionadas)')
+    parser.add_argument('--simular', action='store_true', help='Mostrar qué etapas se ejecutarían sin ejecutarlas')
+    parser.add_argument('--sin-interactivas', action='store_true',
+                        help='No ejecutar los scrapers ni los unificadores interactivos')
+    parser.add_argument('--hilos', type=int, default=None, help='Número máximo de etapas simultáneas')
+    parser.add_argument('--listar', action='store_true', help='Mostrar las etapas y sus dependencias')
+    args = parser.parse_args()
+
+    grafo = dependencias()
+    if args.listar:
+        for etapa in ETAPAS:
+            tipo = " (interactiva)" if etapa.get('interactiva') else ""
+            print(f"{etapa['nombre']}{tipo} <- {', '.join(grafo[etapa['nombre']]) or '-'}")
+        return
+
+    forzar = args.forzar
+    if forzar is not None and not forzar:
+        forzar = seleccionar_etapas(args.etapas, grafo)
+    informe = ejecutar_pipeline(args.etapas or None, forzar=forzar or (), simular=args.simular,
+                                sin_interactivas=args.sin_interactivas, max_workers=args.hilos)
+    imprimir_informe(informe)
+    sys.exit(1 if any(resultado['estado'] in ('error', 'bloqueada') for resultado in informe['etapas']) else 0)
+
+if __name__ == "__main__":
+    main()
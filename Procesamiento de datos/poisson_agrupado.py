@@ -0,0 +1,136 @@
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.linear_model import PoissonRegressor
+
+# Variables numéricas por defecto: solo información conocida antes del partido
+VARIABLES_AGRUPADO = ['Sede_Local']
+
+# Fuerza de la penalización L2 de los efectos de jugador y oponente. Un jugador con
+# pocos partidos queda cerca de la media de la liga y se aleja de ella a medida que
+# acumula goles (aproximadamente, con esta cantidad de goles esperados el efecto
+# estimado se reduce a la mitad)
+REGULARIZACION_AGRUPADO = 2.0
+
+def construir_diseno_agrupado(df, jugadores, oponentes, variables, normalizacion):
+    """
+    Construye la matriz de diseño dispersa [variables numéricas | jugador | oponente].
+
+    Los jugadores y oponentes que no están en las categorías del modelo quedan con
+    todas sus columnas en cero, es decir, con el efecto medio de la liga.
+
+    Args:
+        df: DataFrame con las columnas 'Jugador', 'Oponente_Estandarizado' y las variables
+        jugadores: Categorías de jugadores del modelo
+        oponentes: Categorías de oponentes del modelo
+        variables: Lista de variables numéricas
+        normalizacion: Diccionario variable -> {'mean', 'std'}
+
+    Returns:
+        csr_matrix: Matriz de diseño de forma (filas, variables + jugadores + oponentes)
+    """
+    n = len(df)
+
+    # Variables numéricas estandarizadas con la normalización del ajuste
+    numericas = np.empty((n, len(variables)), dtype='float64')
+    for j, variable in enumerate(variables):
+        valores = pd.to_numeric(df[variable], errors='coerce').to_numpy(dtype='float64')
+        stats = normalizacion[variable]
+        numericas[:, j] = np.nan_to_num((valores - stats['mean']) / stats['std'])
+
+    bloques = [sp.csr_matrix(numericas)]
+
+    # Una columna indicadora por jugador y por oponente (códigos de categoría, -1 si no existe)
+    for columna, categorias in (('Jugador', jugadores), ('Oponente_Estandarizado', oponentes)):
+        codigos = pd.Categorical(df[columna], categories=categorias).codes
+        conocidos = codigos >= 0
+        bloques.append(sp.csr_matrix(
+            (np.ones(conocidos.sum()), (np.flatnonzero(conocidos), codigos[conocidos])),
+            shape=(n, len(categorias))
+        ))
+
+    return sp.hstack(bloques, format='csr')
+
+def ajustar_poisson_agrupado(df, variables=None, regularizacion=REGULARIZACION_AGRUPADO, max_iter=1000):
+    """
+    Ajusta un único modelo de Poisson para todos los jugadores de la liga, con un
+    efecto por jugador y otro por oponente codificados en una matriz dispersa.
+
+    Args:
+        df: DataFrame de goleadores procesados (una fila por jugador y partido)
+        variables: Variables numéricas (por defecto VARIABLES_AGRUPADO)
+        regularizacion: Penalización de los efectos en goles equivalentes (ver REGULARIZACION_AGRUPADO)
+        max_iter: Iteraciones máximas del optimizador
+
+    Returns:
+        dict: Modelo con el estimador, las categorías, la normalización y un resumen del ajuste
+    """
+    variables = list(variables if variables is not None else VARIABLES_AGRUPADO)
+    df = df.dropna(subset=['Jugador', 'Oponente_Estandarizado', 'Goles'])
+
+    inicio = time.perf_counter()
+    jugadores = pd.Index(sorted(df['Jugador'].unique()))
+    oponentes = pd.Index(sorted(df['Oponente_Estandarizado'].unique()))
+
+    normalizacion = {}
+    for variable in variables:
+        valores = pd.to_numeric(df[variable], errors='coerce')
+        std = valores.std()
+        normalizacion[variable] = {'mean': valores.mean(), 'std': std if std > 0 else 1.0}
+
+    X = construir_diseno_agrupado(df, jugadores, oponentes, variables, normalizacion)
+    y = df['Goles'].to_numpy(dtype='float64')
+
+    # sklearn minimiza deviance/(2n) + alpha/2 ||w||²: dividir por n deja la
+    # penalización expresada en goles, independiente del tamaño de la liga
+    estimador = PoissonRegressor(alpha=regularizacion / len(y), max_iter=max_iter)
+    estimador.fit(X, y)
+
+    return {
+        'estimador': estimador,
+        'jugadores': jugadores,
+        'oponentes': oponentes,
+        'variables': variables,
+        'normalizacion': normalizacion,
+        'partidos_por_jugador': df['Jugador'].value_counts().to_dict(),
+        'resumen': {
+            'observaciones': len(y),
+            'jugadores': len(jugadores),
+            'oponentes': len(oponentes),
+            'columnas_diseno': X.shape[1],
+            'iteraciones': int(estimador.n_iter_),
+            'tiempo': time.perf_counter() - inicio,
+        },
+    }
+
+def predecir_poisson_agrupado(modelo, df):
+    """
+    Predice la tasa de goles (lambda) de cada fila para cualquier jugador.
+    Los jugadores u oponentes sin historial reciben el efecto medio de la liga.
+
+    Args:
+        modelo: Modelo devuelto por ajustar_poisson_agrupado
+        df: DataFrame con 'Jugador', 'Oponente_Estandarizado' y las variables del modelo
+
+    Returns:
+        ndarray: Goles esperados por fila
+    """
+    X = construir_diseno_agrupado(df, modelo['jugadores'], modelo['oponentes'],
+                                  modelo['variables'], modelo['normalizacion'])
+    return modelo['estimador'].predict(X)
+
+def efectos_jugadores(modelo):
+    """
+    Devuelve el efecto multiplicativo de cada jugador sobre la media de la liga,
+    junto con su número de partidos, ordenado de mayor a menor.
+    """
+    n_variables = len(modelo['variables'])
+    coeficientes = modelo['estimador'].coef_[n_variables:n_variables + len(modelo['jugadores'])]
+    efectos = pd.DataFrame({
+        'Jugador': modelo['jugadores'],
+        'Efecto': np.exp(coeficientes),
+        'Partidos': [modelo['partidos_por_jugador'].get(j, 0) for j in modelo['jugadores']],
+    })
+    return efectos.sort_values('Efecto', ascending=False).reset_index(drop=True)
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Índice de cada carpeta de modelos: nombre del modelo -> clave del modelo vigente
+ARCHIVO_INDICE = "indice.json"
+
+def _normalizar_nombre(nombre):
+    """
+    Normaliza el nombre de un modelo para que 'Carlos Bacca' y 'Carlos_Bacca' coincidan.
+    """
+    return str(nombre).strip().replace(' ', '_')
+
+def _huella_objeto(huella, datos):
+    """
+    Añade al hash el contenido de un DataFrame, Series, arreglo o lista de ellos.
+    """
+    if datos is None:
+        huella.update(b'None')
+    elif isinstance(datos, (list, tuple)):
+        for elemento in datos:
+            _huella_objeto(huella, elemento)
+    elif isinstance(datos, pd.DataFrame):
+        huella.update(json.dumps([[str(col) for col in datos.columns], [str(tipo) for tipo in datos.dtypes]]).encode('utf-8'))
+        huella.update(pd.util.hash_pandas_object(datos, index=True).to_numpy().tobytes())
+    elif isinstance(datos, pd.Series):
+        huella.update(json.dumps([str(datos.name), str(datos.dtype)]).encode('utf-8'))
+        huella.update(pd.util.hash_pandas_object(datos, index=True).to_numpy().tobytes())
+    else:
+        arreglo = np.ascontiguousarray(datos)
+        huella.update(json.dumps([str(arreglo.dtype), list(arreglo.shape)]).encode('utf-8'))
+        huella.update(arreglo.tobytes())
+
+def calcular_clave(datos, caracteristicas, hiperparametros):
+    """
+    Calcula la clave de un modelo a partir de sus datos de entrenamiento, las
+    características usadas y los hiperparámetros. Si alguno cambia, la clave cambia.
+
+    Args:
+        datos: Datos de entrenamiento (DataFrame, Series, arreglo o lista de ellos)
+        caracteristicas: Lista con los nombres de las características
+        hiperparametros: Diccionario de hiperparámetros (serializable a JSON)
+
+    Returns:
+        str: Clave hexadecimal de 16 caracteres
+    """
+    huella = hashlib.sha256()
+    _huella_objeto(huella, datos)
+    huella.update(json.dumps({
+        'caracteristicas': [str(c) for c in (caracteristicas or [])],
+        'hiperparametros': hiperparametros or {},
+    }, sort_keys=True, default=str).encode('utf-8'))
+    return huella.hexdigest()[:16]
+
+def _rutas(carpeta, clave):
+    return os.path.join(carpeta, f"{clave}.pkl"), os.path.join(carpeta, f"{clave}.json")
+
+def leer_indice(carpeta):
+    """
+    Lee el índice de una carpeta de modelos (nombre -> clave vigente).
+    """
+    ruta_indice = os.path.join(carpeta, ARCHIVO_INDICE)
+    if not os.path.exists(ruta_indice):
+        return {}
+    with open(ruta_indice, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _escribir_json(ruta, contenido):
+    """
+    Escribe un JSON en un archivo temporal y lo reemplaza de forma atómica.
+    """
+    ruta_temporal = f"{ruta}.tmp"
+    with open(ruta_temporal, 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(ruta_temporal, ruta)
+
+def existe_modelo(carpeta, clave):
+    """
+    Indica si ya hay un modelo guardado con esa clave.
+    """
+    return os.path.exists(_rutas(carpeta, clave)[0])
+
+def leer_metadatos(carpeta, clave):
+    """
+    Devuelve los metadatos de un modelo guardado o None si no existe.
+    """
+    ruta_metadatos = _rutas(carpeta, clave)[1]
+    if not os.path.exists(ruta_metadatos):
+        return None
+    with open(ruta_metadatos, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def guardar_modelo(carpeta, nombre, clave, modelo, metadatos=None):
+    """
+    Guarda un modelo con su clave, escribe sus metadatos y lo marca como vigente en el índice.
+
+    Args:
+        carpeta: Carpeta de modelos (por ejemplo 'modelos_arima')
+        nombre: Nombre del modelo (por ejemplo el jugador)
+        clave: Clave calculada con calcular_clave
+        modelo: Objeto a guardar (cualquier objeto serializable con pickle)
+        metadatos: Diccionario con información adicional (métricas, periodo, ...)
+
+    Returns:
+        str: Ruta del archivo del modelo
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    ruta_modelo, ruta_metadatos = _rutas(carpeta, clave)
+
+    ruta_temporal = f"{ruta_modelo}.tmp"
+    with open(ruta_temporal, 'wb') as file:
+        pickle.dump(modelo, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(ruta_temporal, ruta_modelo)
+
+    _escribir_json(ruta_metadatos, {
+        'nombre': _normalizar_nombre(nombre),
+        'clave': clave,
+        'fecha_entrenamiento': datetime.now().isoformat(timespec='seconds'),
+        **(metadatos or {}),
+    })
+
+    indice = leer_indice(carpeta)
+    indice[_normalizar_nombre(nombre)] = clave
+    _escribir_json(os.path.join(carpeta, ARCHIVO_INDICE), indice)
+
+    return ruta_modelo
+
+def cargar_modelo(carpeta, clave):
+    """
+    Carga el modelo guardado con esa clave o devuelve None si no existe.
+    """
+    ruta_modelo = _rutas(carpeta, clave)[0]
+    if not os.path.exists(ruta_modelo):
+        return None
+    with open(ruta_modelo, 'rb') as file:
+        return pickle.load(file)
+
+def cargar_modelo_vigente(carpeta, nombre):
+    """
+    Carga el último modelo registrado para un nombre (jugador).
+
+    Returns:
+        tuple: (modelo, metadatos) o (None, None) si no hay modelo registrado
+    """
+    clave = leer_indice(carpeta).get(_normalizar_nombre(nombre))
+    if clave is None:
+        return None, None
+    return cargar_modelo(carpeta, clave), leer_metadatos(carpeta, clave)
+
+def obtener_o_entrenar(carpeta, nombre, datos, caracteristicas, hiperparametros, entrenar, metadatos=None):
+    """
+    Devuelve el modelo guardado para estos datos, características e hiperparámetros,
+    o lo entrena con `entrenar()` y lo guarda si todavía no existe.
+
+    Args:
+        carpeta: Carpeta de modelos
+        nombre: Nombre del modelo (por ejemplo el jugador)
+        datos: Datos de entrenamiento usados para la clave
+        caracteristicas: Lista de características usadas para la clave
+        hiperparametros: Diccionario de hiperparámetros usado para la clave
+        entrenar: Función sin argumentos que entrena y devuelve el modelo
+        metadatos: Función que recibe el modelo y devuelve metadatos adicionales, o un diccionario
+
+    Returns:
+        tuple: (modelo, clave, reutilizado) donde reutilizado indica si se cargó del registro
+    """
+    clave = calcular_clave(datos, caracteristicas, hiperparametros)
+    modelo = cargar_modelo(carpeta, clave)
+
+    if modelo is not None:
+        # El modelo ya existe: solo se actualiza el índice por si el vigente era otro
+        indice = leer_indice(carpeta)
+        if indice.get(_normalizar_nombre(nombre)) != clave:
+            indice[_normalizar_nombre(nombre)] = clave
+            _escribir_json(os.path.join(carpeta, ARCHIVO_INDICE), indice)
+        return modelo, clave, True
+
+    inicio = time.perf_counter()
+    modelo = entrenar()
+    tiempo_entrenamiento = time.perf_counter() - inicio
+
+    extra = metadatos(modelo) if callable(metadatos) else (metadatos or {})
+    guardar_modelo(carpeta, nombre, clave, modelo, {
+        'caracteristicas': list(caracteristicas or []),
+        'hiperparametros': hiperparametros or {},
+        'tiempo_entrenamiento': round(tiempo_entrenamiento, 3),
+        **extra,
+    })
+    return modelo, clave, False
@@ -0,0 +1,325 @@
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.metrics import mean_squared_error
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+# Un candidato se poda si su error mínimo posible supera este múltiplo del error
+# de la predicción ingenua (media del entrenamiento)
+FACTOR_PODA = 2.0
+
+# Modos de la validación cruzada: 'reajuste' ajusta cada fold desde cero; 'continuo'
+# (walk-forward) ajusta una vez y extiende el modelo con las observaciones de cada fold
+MODO_VALIDACION = 'reajuste'
+
+# En modo 'continuo', cada cuántos folds se reestiman los parámetros (partiendo de los
+# anteriores); None los estima solo en la ventana inicial
+REAJUSTE_CADA = None
+
+# Diseños (y, X) de cada jugador, cargados una vez en cada proceso del pool
+_DISENOS = {}
+
+def preparar_diseno(y, X=None):
+    """
+    Convierte la serie objetivo y las variables exógenas en arreglos float una sola vez,
+    para que cada candidato y cada fold solo tengan que cortarlos.
+
+    Args:
+        y: Serie de goles (Series o arreglo)
+        X: Variables exógenas (DataFrame, arreglo o None para un modelo ARIMA simple)
+
+    Returns:
+        dict: Diseño con 'y' y 'X' como arreglos numpy
+    """
+    y = np.asarray(y, dtype='float64')
+    if X is not None:
+        X = np.asarray(X, dtype='float64')
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if X.shape[1] == 0:
+            X = None
+    return {'y': y, 'X': X}
+
+def calcular_folds(n):
+    """
+    Calcula los folds temporales (inicio y fin del bloque de prueba) usados en la
+    validación cruzada. Solo se devuelven los folds con al menos 5 observaciones
+    de entrenamiento.
+
+    Returns:
+        list: Lista de tuplas (test_start, test_end), o None si no hay datos suficientes
+    """
+    n_folds = min(5, n // 3)  # Al menos 3 observaciones por fold
+    if n_folds < 2:
+        return None  # No hay suficientes datos para validación cruzada
+
+    # Tamaño de cada fold
+    size = n // n_folds
+
+    folds = []
+    for i in range(n_folds):
+        test_start = i * size
+        test_end = test_start + size if i < n_folds - 1 else n
+        if test_start < 5:  # Necesitamos al menos 5 observaciones
+            continue
+        folds.append((test_start, test_end))
+    return folds
+
+def error_referencia(diseno, folds):
+    """
+    Error cuadrático medio de predecir la media del entrenamiento en cada fold.
+    Sirve como referencia para podar candidatos claramente peores.
+    """
+    y = diseno['y']
+    errores = [
+        mean_squared_error(y[inicio:fin], np.full(fin - inicio, y[:inicio].mean()))
+        for inicio, fin in folds
+    ]
+    return sum(errores) / len(errores) if errores else None
+
+def generar_candidatos(p_max=3, d_max=2, q_max=3):
+    """
+    Genera las combinaciones (p, d, q) en el mismo orden que la búsqueda original.
+    """
+    return [
+        (p, d, q)
+        for p in range(p_max + 1)
+        for d in range(d_max + 1)
+        for q in range(q_max + 1)
+        if not (p == 0 and q == 0)  # Evitar modelo trivial
+    ]
+
+def ajustar_modelo(y, X, orden, start_params=None):
+    """
+    Ajusta un SARIMAX (con exógenas) o un ARIMA (sin exógenas) con la misma
+    configuración que el entrenamiento final.
+
+    Args:
+        y: Serie de entrenamiento
+        X: Exógenas de entrenamiento o None
+        orden: Tupla (p, d, q)
+        start_params: Parámetros iniciales del optimizador (por ejemplo los de un ajuste
+            anterior sobre menos datos); None usa los predeterminados de statsmodels
+    """
+    if X is not None:
+        modelo = SARIMAX(
+            y,
+            exog=X,
+            order=orden,
+            enforce_stationarity=False,
+            enforce_invertibility=False
+        )
+        return modelo.fit(disp=False, start_params=start_params)
+    modelo = ARIMA(y, order=orden)
+    return modelo.fit(start_params=start_params)
+
+def evaluar_orden(diseno, orden, folds, cota=None, descartar_no_convergidos=True,
+                  modo=MODO_VALIDACION, reajuste_cada=REAJUSTE_CADA):
+    """
+    Evalúa un orden (p, d, q) con validación cruzada temporal.
+
+    En modo 'reajuste' cada fold ajusta el modelo desde cero sobre todo su
+    entrenamiento. En modo 'continuo' (walk-forward) el modelo se ajusta en la
+    ventana del primer fold y en los siguientes solo se extiende con las
+    observaciones nuevas (el filtro de Kalman continúa desde el último estado, sin
+    reestimar), así que cada observación se filtra una sola vez. Cada `reajuste_cada`
+    folds se reestiman los parámetros partiendo de los anteriores.
+
+    El candidato se abandona en cuanto un ajuste falla, no converge (si se pide)
+    o el error acumulado ya garantiza un promedio mayor que `cota`.
+
+    Args:
+        diseno: Diseño creado con preparar_diseno
+        orden: Tupla (p, d, q)
+        folds: Folds devueltos por calcular_folds
+        cota: Error promedio a partir del cual el candidato se descarta (None para no podar)
+        descartar_no_convergidos: Si es True, un ajuste que no converge descarta el candidato
+        modo: 'reajuste' o 'continuo'
+        reajuste_cada: En modo 'continuo', folds entre reestimaciones (None para no reestimar)
+
+    Returns:
+        dict: 'error' (promedio o inf si se descartó), 'estado' y 'tiempo' en segundos
+    """
+    if modo not in ('reajuste', 'continuo'):
+        raise ValueError(f"Modo de validación desconocido: {modo}")
+
+    inicio_tiempo = time.perf_counter()
+    y, X = diseno['y'], diseno['X']
+    errores = []
+    result = None
+    visto = 0
+
+    for k, (test_start, test_end) in enumerate(folds):
+        y_test = y[test_start:test_end]
+        X_test = X[test_start:test_end] if X is not None else None
+        reestimar = (result is None or modo == 'reajuste'
+                     or (reajuste_cada and k % reajuste_cada == 0))
+
+        try:
+            if reestimar:
+                # En modo continuo los parámetros anteriores sirven de punto de partida
+                start_params = result.params if (result is not None and modo == 'continuo') else None
+                result = ajustar_modelo(y[:test_start], X[:test_start] if X is not None else None,
+                                        orden, start_params=start_params)
+            else:
+                result = result.extend(y[visto:test_start], exog=X[visto:test_start] if X is not None else None)
+            pred = result.forecast(steps=len(y_test), exog=X_test)
+        except Exception:
+            return {'error': float('inf'), 'estado': 'fallido', 'tiempo': time.perf_counter() - inicio_tiempo}
+        visto = test_start
+
+        retvals = getattr(result, 'mle_retvals', None) or {}
+        if reestimar and descartar_no_convergidos and not retvals.get('converged', True):
+            return {'error': float('inf'), 'estado': 'no_convergido', 'tiempo': time.perf_counter() - inicio_tiempo}
+
+        errores.append(mean_squared_error(y_test, pred))
+
+        # Los errores son no negativos: la suma parcial ya acota el promedio final
+        if cota is not None and sum(errores) / len(folds) > cota:
+            return {'error': float('inf'), 'estado': 'podado', 'tiempo': time.perf_counter() - inicio_tiempo}
+
+    error = sum(errores) / len(errores) if errores else float('inf')
+    return {'error': error, 'estado': 'evaluado', 'tiempo': time.perf_counter() - inicio_tiempo}
+
+def validacion_cruzada_temporal(y, X, p_max=3, d_max=2, q_max=3, usar_exogenas=True,
+                                descartar_no_convergidos=True, modo=MODO_VALIDACION,
+                                reajuste_cada=REAJUSTE_CADA):
+    """
+    Busca el mejor orden (p, d, q) para un jugador con validación cruzada temporal.
+    Versión secuencial; para varios jugadores usar buscar_ordenes. `modo` y
+    `reajuste_cada` se pasan a evaluar_orden.
+
+    Returns:
+        tuple: (mejores_parametros, mejor_error) o (None, None) si no hay datos suficientes
+    """
+    diseno = preparar_diseno(y, X if usar_exogenas else None)
+    folds = calcular_folds(len(diseno['y']))
+    if folds is None:
+        return None, None
+
+    mejores_parametros = None
+    mejor_error = float('inf')
+
+    for orden in generar_candidatos(p_max, d_max, q_max):
+        # El mejor error encontrado hasta ahora sirve de cota para el resto
+        resultado = evaluar_orden(diseno, orden, folds, cota=mejor_error if mejores_parametros else None,
+                                  descartar_no_convergidos=descartar_no_convergidos,
+                                  modo=modo, reajuste_cada=reajuste_cada)
+        if resultado['error'] < mejor_error:
+            mejor_error = resultado['error']
+            mejores_parametros = orden
+
+    return mejores_parametros, mejor_error
+
+def _inicializar_trabajador(disenos):
+    """
+    Guarda los diseños de todos los jugadores en el proceso trabajador (una sola vez).
+    """
+    global _DISENOS
+    _DISENOS = disenos
+    warnings.filterwarnings('ignore')
+
+def _evaluar_tarea(jugador, orden, folds, cota, descartar_no_convergidos, modo, reajuste_cada):
+    """
+    Tarea del pool: evalúa un orden para un jugador usando el diseño ya cargado.
+    """
+    resultado = evaluar_orden(_DISENOS[jugador], orden, folds, cota, descartar_no_convergidos,
+                              modo, reajuste_cada)
+    return jugador, orden, resultado
+
+def _ejecutar_tareas(executor, tareas, candidatos, resultados, mejores):
+    """
+    Envía las tareas al pool y acumula tiempos, conteos y el mejor orden por jugador.
+    """
+    futuros = [executor.submit(_evaluar_tarea, *tarea) for tarea in tareas]
+
+    for futuro in as_completed(futuros):
+        jugador, orden, resultado = futuro.result()
+        resumen = resultados[jugador]
+        resumen['tiempo'] += resultado['tiempo']
+        if resultado['estado'] == 'evaluado':
+            resumen['evaluados'] += 1
+        else:
+            resumen['podados'] += 1
+
+        # En caso de empate gana el orden que aparece antes en la búsqueda secuencial
+        clave = (resultado['error'], candidatos.index(orden))
+        if resultado['error'] < float('inf') and (jugador not in mejores or clave < mejores[jugador]):
+            mejores[jugador] = clave
+            resumen['orden'] = orden
+            resumen['error'] = resultado['error']
+
+def buscar_ordenes(series, p_max=3, d_max=2, q_max=3, max_workers=None,
+                   factor_poda=FACTOR_PODA, descartar_no_convergidos=True,
+                   modo=MODO_VALIDACION, reajuste_cada=REAJUSTE_CADA):
+    """
+    Busca en paralelo el mejor orden (p, d, q) de varios jugadores.
+
+    Cada par (jugador, orden) es una tarea de un pool de procesos. Los diseños de
+    cada jugador se construyen una vez y se envían a cada proceso al iniciarlo.
+    Se podan los candidatos que fallan, que no convergen o cuyo error mínimo
+    posible supera `factor_poda` veces el error de la predicción ingenua.
+
+    Args:
+        series: Diccionario jugador -> (y, X) con X=None para modelos sin exógenas
+        p_max, d_max, q_max: Órdenes máximos a probar
+        max_workers: Número de procesos (por defecto uno por núcleo)
+        factor_poda: Múltiplo del error de referencia para podar (None para no podar)
+        descartar_no_convergidos: Si es True, los ajustes que no convergen se descartan
+        modo: 'reajuste' (cada fold desde cero) o 'continuo' (walk-forward, ver evaluar_orden)
+        reajuste_cada: En modo 'continuo', folds entre reestimaciones de los parámetros
+
+    Returns:
+        dict: jugador -> {'orden', 'error', 'tiempo', 'evaluados', 'podados'}
+              ('orden' y 'error' son None si no hay datos suficientes o ningún candidato válido)
+    """
+    disenos = {jugador: preparar_diseno(y, X) for jugador, (y, X) in series.items()}
+    candidatos = generar_candidatos(p_max, d_max, q_max)
+
+    resultados = {}
+    tareas = []
+    for jugador, diseno in disenos.items():
+        resultados[jugador] = {'orden': None, 'error': None, 'tiempo': 0.0, 'evaluados': 0, 'podados': 0}
+        folds = calcular_folds(len(diseno['y']))
+        if folds is None:
+            continue
+
+        referencia = error_referencia(diseno, folds)
+        cota = referencia * factor_poda if (factor_poda is not None and referencia) else None
+        tareas.extend((jugador, orden, folds, cota, descartar_no_convergidos, modo, reajuste_cada)
+                      for orden in candidatos)
+
+    if not tareas:
+        return resultados
+
+    max_workers = max_workers or os.cpu_count() or 1
+    print(f"Evaluando {len(tareas)} combinaciones de {len(disenos)} jugadores en {max_workers} procesos...")
+    inicio = time.perf_counter()
+
+    mejores = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializar_trabajador,
+                             initargs=(disenos,)) as executor:
+        _ejecutar_tareas(executor, tareas, candidatos, resultados, mejores)
+
+        # Si la referencia podó todos los candidatos de un jugador, repetir sin cota
+        repetir = [
+            (jugador, orden, folds, None, *opciones)
+            for jugador, orden, folds, cota, *opciones in tareas
+            if cota is not None and jugador not in mejores
+        ]
+        if repetir:
+            jugadores_repetir = sorted({tarea[0] for tarea in repetir})
+            print(f"Ningún candidato superó la poda para {jugadores_repetir}; se evalúan sin cota...")
+            _ejecutar_tareas(executor, repetir, candidatos, resultados, mejores)
+
+    print(f"Búsqueda completada en {time.perf_counter() - inicio:.1f} s")
+    for jugador, resumen in resultados.items():
+        print(f"  - {jugador}: {resumen['tiempo']:.1f} s de ajuste, "
+              f"{resumen['evaluados']} evaluados, {resumen['podados']} podados, "
+              f"mejor orden {resumen['orden']}")
+
+    return resultados
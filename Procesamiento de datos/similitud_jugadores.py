@@ -0,0 +1,249 @@
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree, KDTree
+
+from esquemas import COLUMNAS_TEXTO_SOFASCORE
+from registro_modelos import obtener_o_entrenar
+
+# Grupos de posición a partir de la letra de posición de SofaScore. Si los datos no
+# traen la posición (el CSV unificado la elimina) todos los jugadores van a 'Todos'
+GRUPOS_POSICION = {'G': 'Portero', 'D': 'Defensa', 'M': 'Mediocampista', 'F': 'Delantero'}
+GRUPO_SIN_POSICION = 'Todos'
+
+# Columna de minutos jugados usada por el filtro de minutos (si existe en los datos)
+COLUMNA_MINUTOS = 'Minutes played'
+
+# Columnas que no forman parte del vector de estadísticas
+COLUMNAS_EXCLUIDAS = set(COLUMNAS_TEXTO_SOFASCORE) | {COLUMNA_MINUTOS, 'Average Sofascore Rating'}
+
+# Con pocas dimensiones el KD-tree es más rápido; con muchas se usa un ball tree
+MAX_DIMENSIONES_KDTREE = 15
+
+# Carpeta del registro de índices (registro_modelos.py)
+CARPETA_INDICES = "modelos_similitud"
+
+# Versión de la estructura del índice; forma parte de la clave para no reutilizar índices antiguos
+VERSION_INDICE = 2
+
+def cargar_jugadores_por_90(base_path, registro=None):
+    """
+    Carga los CSV por 90 minutos de todos los torneos descargados por el scraper
+    (data/<tipo>_<id>/per_90_mins/), conservando la posición de cada jugador.
+
+    Args:
+        base_path: Carpeta de datos del scraper
+        registro: Registro de torneos; si es None se carga desde torneos.json
+
+    Returns:
+        DataFrame: Una fila por jugador, equipo, posición y torneo
+    """
+    from Unificacion import descubrir_torneos, cargar_torneos
+
+    torneos = descubrir_torneos(base_path, modo="per_90_mins", registro=registro)
+    if not torneos:
+        raise FileNotFoundError(f"No se encontraron datos por 90 minutos en {base_path}")
+
+    # Del torneo más reciente al más antiguo, para que la primera fila de cada jugador sea la actual
+    torneos = sorted(torneos, key=lambda torneo: torneo['orden'], reverse=True)
+    return pd.concat(cargar_torneos(torneos), ignore_index=True)
+
+def asignar_grupo_posicion(df):
+    """
+    Devuelve el grupo de posición de cada fila a partir de la primera letra de 'Position'.
+    """
+    if 'Position' not in df.columns:
+        return pd.Series(GRUPO_SIN_POSICION, index=df.index)
+    letra = df['Position'].astype(str).str.strip().str[:1].str.upper()
+    return letra.map(GRUPOS_POSICION).fillna(GRUPO_SIN_POSICION)
+
+def columnas_estadisticas(df):
+    """
+    Devuelve las columnas numéricas del vector de estadísticas (sin identificadores ni minutos).
+    """
+    return [col for col in df.columns
+            if col not in COLUMNAS_EXCLUIDAS and pd.api.types.is_numeric_dtype(df[col])]
+
+def construir_indice_similitud(df, columnas=None):
+    """
+    Construye un índice de vecinos más cercanos por grupo de posición sobre los
+    vectores de estadísticas por 90 minutos estandarizados.
+
+    Dentro de cada grupo solo se usan las columnas con datos en ese grupo (un
+    defensa no se compara por atajadas) y los valores faltantes cuentan como cero.
+
+    Args:
+        df: DataFrame de jugadores de SofaScore (una fila por jugador, equipo y torneo)
+        columnas: Columnas de estadísticas a usar (por defecto todas las numéricas)
+
+    Returns:
+        dict: 'jugadores' (identificadores de cada fila), 'grupos' (árbol, columnas,
+              media, desviación y filas de cada grupo), 'posiciones' ((nombre, equipo) ->
+              filas) y 'nombres' (nombre -> filas)
+    """
+    inicio = time.perf_counter()
+    columnas = list(columnas) if columnas is not None else columnas_estadisticas(df)
+
+    identificadores = [col for col in ['Name', 'Team', 'Torneo'] if col in df.columns]
+    jugadores = df[identificadores].reset_index(drop=True).copy()
+    jugadores['Grupo'] = asignar_grupo_posicion(df).to_numpy()
+    if COLUMNA_MINUTOS in df.columns:
+        jugadores['Minutos'] = pd.to_numeric(df[COLUMNA_MINUTOS], errors='coerce').to_numpy()
+
+    valores = df[columnas].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+
+    grupos = {}
+    for grupo, filas in jugadores.groupby('Grupo').indices.items():
+        valores_grupo = valores[filas]
+        con_datos = ~np.isnan(valores_grupo).all(axis=0)
+        matriz = np.nan_to_num(valores_grupo[:, con_datos])
+
+        media = matriz.mean(axis=0)
+        desviacion = matriz.std(axis=0)
+        desviacion[desviacion == 0] = 1.0
+        matriz = (matriz - media) / desviacion
+
+        arbol = KDTree(matriz) if matriz.shape[1] <= MAX_DIMENSIONES_KDTREE else BallTree(matriz)
+        grupos[grupo] = {
+            'arbol': arbol,
+            'columnas': [col for col, usar in zip(columnas, con_datos) if usar],
+            'media': media,
+            'desviacion': desviacion,
+            'filas': filas,
+            'matriz': matriz,
+        }
+
+    return {
+        'jugadores': jugadores,
+        'grupos': grupos,
+        'posiciones': _filas_por_jugador(jugadores),
+        'nombres': jugadores.groupby('Name').indices if 'Name' in jugadores else {},
+        'resumen': {
+            'jugadores': len(jugadores),
+            'grupos': {grupo: len(datos['filas']) for grupo, datos in grupos.items()},
+            'tiempo': time.perf_counter() - inicio,
+        },
+    }
+
+def _filas_por_jugador(jugadores):
+    """Filas de cada jugador identificado por nombre y equipo (dos jugadores pueden llamarse igual)"""
+    if 'Name' not in jugadores:
+        return {}
+    if 'Team' not in jugadores:
+        return {(nombre, None): filas for nombre, filas in jugadores.groupby('Name').indices.items()}
+    return jugadores.groupby(['Name', 'Team']).indices
+
+def obtener_indice_similitud(df, columnas=None, carpeta=CARPETA_INDICES, nombre='indice_similitud'):
+    """
+    Carga el índice guardado para estos datos o lo construye y lo guarda en el
+    registro de modelos; solo se reconstruye cuando cambian los datos o las columnas.
+
+    Returns:
+        tuple: (indice, reutilizado)
+    """
+    columnas = list(columnas) if columnas is not None else columnas_estadisticas(df)
+    indice, _, reutilizado = obtener_o_entrenar(
+        carpeta, nombre, datos=df, caracteristicas=columnas, hiperparametros={'version': VERSION_INDICE},
+        entrenar=lambda: construir_indice_similitud(df, columnas),
+        metadatos=lambda indice: {'resumen': indice['resumen']}
+    )
+    return indice, reutilizado
+
+def _como_lista(valor):
+    if valor is None:
+        return None
+    return [valor] if isinstance(valor, str) or np.isscalar(valor) else list(valor)
+
+def _filtrar_candidatos(jugadores, filas, equipo, torneo, min_minutos):
+    """
+    Devuelve la máscara de las filas del grupo que cumplen los filtros (None si no hay filtros).
+    """
+    mascara = None
+    for columna, valores in (('Team', _como_lista(equipo)), ('Torneo', _como_lista(torneo))):
+        if valores is not None:
+            cumple = jugadores[columna].to_numpy()[filas]
+            cumple = np.isin(cumple, valores)
+            mascara = cumple if mascara is None else mascara & cumple
+
+    if min_minutos is not None:
+        if 'Minutos' not in jugadores.columns:
+            raise ValueError(f"Los datos del índice no tienen la columna '{COLUMNA_MINUTOS}'")
+        cumple = np.nan_to_num(jugadores['Minutos'].to_numpy(dtype='float64')[filas]) >= min_minutos
+        mascara = cumple if mascara is None else mascara & cumple
+
+    return mascara
+
+def jugadores_similares(indice, nombre, k=10, torneo_referencia=None, equipo=None, torneo=None, min_minutos=None,
+                        equipo_jugador=None):
+    """
+    Devuelve los k jugadores más parecidos a un jugador dentro de su grupo de posición.
+
+    Args:
+        indice: Índice construido con construir_indice_similitud u obtener_indice_similitud
+        nombre: Nombre del jugador de referencia
+        k: Número de jugadores a devolver
+        torneo_referencia: Torneo del vector de referencia (por defecto la primera fila del
+                           jugador, que en los datos cargados es la del torneo más reciente)
+        equipo: Equipo o lista de equipos de los candidatos
+        torneo: Torneo o lista de torneos de los candidatos
+        min_minutos: Minutos mínimos jugados por los candidatos
+        equipo_jugador: Equipo del jugador de referencia, para distinguir jugadores con el
+                        mismo nombre (por defecto el de su primera fila)
+
+    Returns:
+        DataFrame: Jugadores similares con su distancia y similitud (1 / (1 + distancia))
+    """
+    jugadores = indice['jugadores']
+    filas_jugador = indice['nombres'].get(nombre)
+    if filas_jugador is None:
+        raise KeyError(f"No se encontró el jugador '{nombre}' en el índice")
+
+    if equipo_jugador is not None:
+        filas_jugador = [fila for fila in filas_jugador if jugadores.at[fila, 'Team'] == equipo_jugador]
+        if not filas_jugador:
+            raise KeyError(f"No se encontró el jugador '{nombre}' del equipo '{equipo_jugador}'")
+    if torneo_referencia is not None:
+        filas_jugador = [fila for fila in filas_jugador if jugadores.at[fila, 'Torneo'] == torneo_referencia]
+        if not filas_jugador:
+            raise KeyError(f"El jugador '{nombre}' no tiene datos en el torneo '{torneo_referencia}'")
+    fila_referencia = filas_jugador[0]
+    clave_jugador = (nombre, jugadores.at[fila_referencia, 'Team'] if 'Team' in jugadores else None)
+    filas_propias = indice['posiciones'][clave_jugador]
+
+    grupo = indice['grupos'][jugadores.at[fila_referencia, 'Grupo']]
+    posicion_en_grupo = np.searchsorted(grupo['filas'], fila_referencia)
+    vector = grupo['matriz'][posicion_en_grupo:posicion_en_grupo + 1]
+
+    # Se excluyen las filas del propio jugador en otros torneos (mismo nombre y equipo)
+    propias = np.isin(grupo['filas'], filas_propias)
+    mascara = _filtrar_candidatos(jugadores, grupo['filas'], equipo, torneo, min_minutos)
+    validos = ~propias if mascara is None else mascara & ~propias
+    n_validos = int(validos.sum())
+    k = min(k, n_validos)
+
+    if k == 0:
+        return pd.DataFrame(columns=list(jugadores.columns) + ['Distancia', 'Similitud'])
+
+    if n_validos < len(grupo['filas']) // 4:
+        # Filtros muy restrictivos: es más rápido medir directamente contra los candidatos
+        candidatos = np.flatnonzero(validos)
+        distancias_candidatos = np.sqrt(((grupo['matriz'][candidatos] - vector) ** 2).sum(axis=1))
+        orden = np.argsort(distancias_candidatos, kind='stable')[:k]
+        posiciones, distancias = candidatos[orden], distancias_candidatos[orden]
+    else:
+        # Se consulta el árbol ampliando k hasta reunir k candidatos que cumplan los filtros
+        k_consulta = min(len(grupo['filas']), k + len(filas_propias))
+        while True:
+            distancias, posiciones = grupo['arbol'].query(vector, k=k_consulta)
+            distancias, posiciones = distancias[0], posiciones[0]
+            cumplen = validos[posiciones]
+            if cumplen.sum() >= k or k_consulta == len(grupo['filas']):
+                break
+            k_consulta = min(len(grupo['filas']), k_consulta * 2)
+        posiciones, distancias = posiciones[cumplen][:k], distancias[cumplen][:k]
+
+    similares = jugadores.iloc[grupo['filas'][posiciones]].reset_index(drop=True)
+    similares['Distancia'] = distancias
+    similares['Similitud'] = 1 / (1 + distancias)
+    return similares
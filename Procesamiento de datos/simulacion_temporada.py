@@ -0,0 +1,172 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# Cuantiles reportados de los goles totales por jugador y por equipo
+CUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+# Máximo de valores muestreados a la vez (temporadas del bloque x pares jugador-equipo);
+# limita la memoria a unas decenas de MB sin importar el número de temporadas
+MAX_ELEMENTOS_BLOQUE = 5_000_000
+
+def preparar_tasas(predicciones, columna_tasa='Goles_Predichos'):
+    """
+    Suma las tasas de goles del calendario por par (jugador, equipo).
+
+    Los goles de un jugador en partidos distintos son Poisson independientes, así
+    que su suma en la temporada es Poisson con la suma de las tasas: muestrear el
+    total de cada par equivale exactamente a muestrear partido a partido y sumar,
+    con una muestra por par en lugar de una por partido.
+
+    Args:
+        predicciones: DataFrame con 'Jugador', 'Equipo_Local', 'Equipo_Visitante',
+                      'Juega_Local' y la columna de tasas
+        columna_tasa: Columna con el número esperado de goles (lambda de Poisson)
+
+    Returns:
+        dict: Tasa total de cada par, código de jugador y de equipo de cada par y categorías
+    """
+    equipo = np.where(predicciones['Juega_Local'].astype(bool),
+                      predicciones['Equipo_Local'], predicciones['Equipo_Visitante'])
+    datos = pd.DataFrame({
+        'Jugador': predicciones['Jugador'].to_numpy(),
+        'Equipo': equipo,
+        'Tasa': pd.to_numeric(predicciones[columna_tasa], errors='coerce').fillna(0).clip(lower=0).to_numpy(dtype='float64'),
+    })
+
+    jugadores = pd.Index(sorted(datos['Jugador'].unique()))
+    equipos = pd.Index(sorted(datos['Equipo'].unique()))
+    datos['Codigo_Jugador'] = jugadores.get_indexer(datos['Jugador'])
+    datos['Codigo_Equipo'] = equipos.get_indexer(datos['Equipo'])
+    pares = datos.groupby(['Codigo_Jugador', 'Codigo_Equipo'])['Tasa'].sum().reset_index()
+
+    return {
+        'tasas': pares['Tasa'].to_numpy(),
+        'jugador_par': pares['Codigo_Jugador'].to_numpy(),
+        'equipo_par': pares['Codigo_Equipo'].to_numpy(),
+        'jugadores': jugadores,
+        'equipos': equipos,
+    }
+
+def _acumular_histograma(histograma, totales):
+    """
+    Suma al histograma (categorías x goles) las apariciones de cada total por
+    categoría, ampliándolo si aparece un total mayor que los vistos hasta ahora.
+    """
+    n_categorias = totales.shape[1]
+    maximo = int(totales.max()) + 1 if totales.size else 1
+    if maximo > histograma.shape[1]:
+        ampliado = np.zeros((n_categorias, maximo), dtype=histograma.dtype)
+        ampliado[:, :histograma.shape[1]] = histograma
+        histograma = ampliado
+
+    ancho = histograma.shape[1]
+    indices = (np.arange(n_categorias) * ancho)[None, :] + totales
+    histograma += np.bincount(indices.ravel(), minlength=n_categorias * ancho).reshape(n_categorias, ancho)
+    return histograma
+
+def resumir_histograma(histograma, cuantiles=CUANTILES):
+    """
+    Calcula media, desviación y cuantiles exactos a partir de un histograma de
+    totales (una fila por categoría). El cuantil q es el menor total cuya
+    frecuencia acumulada alcanza q (método 'inverted_cdf' de numpy).
+
+    Returns:
+        DataFrame: Una fila por categoría con Media, Desviacion y P05, P25, ...
+    """
+    valores = np.arange(histograma.shape[1])
+    n = histograma.sum(axis=1, keepdims=True)
+    probabilidades = histograma / n
+
+    media = probabilidades @ valores
+    desviacion = np.sqrt(np.maximum(probabilidades @ valores ** 2 - media ** 2, 0))
+    acumulada = np.cumsum(histograma, axis=1)
+
+    resumen = {'Media': media, 'Desviacion': desviacion}
+    for q in cuantiles:
+        resumen[f'P{int(round(q * 100)):02d}'] = (acumulada < q * n).sum(axis=1)
+    return pd.DataFrame(resumen)
+
+def simular_temporada(predicciones, n_temporadas=100_000, semilla=42, max_elementos=MAX_ELEMENTOS_BLOQUE,
+                      columna_tasa='Goles_Predichos', cuantiles=CUANTILES):
+    """
+    Simula la temporada completa muestreando con Poisson los goles de cada jugador
+    en los partidos del calendario, por bloques de temporadas (ver preparar_tasas).
+
+    Solo se conservan histogramas de los goles totales por jugador y por equipo y el
+    conteo de goleadores, así que la memoria depende del tamaño del bloque y no del
+    número de temporadas. Cada bloque usa su propio generador derivado de la semilla
+    (SeedSequence.spawn): con la misma semilla y el mismo tamaño de bloque los
+    resultados son idénticos.
+
+    Args:
+        predicciones: Predicciones del calendario (predicciones_calendario_poisson2025.csv)
+        n_temporadas: Número de temporadas a simular
+        semilla: Semilla del generador aleatorio
+        max_elementos: Máximo de valores (temporadas x pares jugador-equipo) muestreados por bloque
+        columna_tasa: Columna con los goles esperados por partido
+        cuantiles: Cuantiles de los goles totales a reportar
+
+    Returns:
+        dict: 'jugadores' (goles esperados, media, desviación, cuantiles y probabilidad de
+              ser goleador), 'equipos' (mismas medidas de los goles del equipo aportados
+              por estos jugadores) y 'resumen' (temporadas, bloques, semilla y tiempo)
+    """
+    inicio = time.perf_counter()
+    datos = preparar_tasas(predicciones, columna_tasa)
+    tasas = datos['tasas']
+    n_pares, n_jugadores, n_equipos = len(tasas), len(datos['jugadores']), len(datos['equipos'])
+
+    # Matrices de pertenencia de cada par (jugador, equipo); en float para usar BLAS
+    # (los totales son enteros pequeños y la suma es exacta)
+    par_a_jugador = np.zeros((n_pares, n_jugadores))
+    par_a_jugador[np.arange(n_pares), datos['jugador_par']] = 1
+    par_a_equipo = np.zeros((n_pares, n_equipos))
+    par_a_equipo[np.arange(n_pares), datos['equipo_par']] = 1
+
+    tamano_bloque = max(1, min(n_temporadas, max_elementos // max(1, n_pares)))
+    # Sin predicciones no hay nada que muestrear: se devuelven tablas vacías
+    n_bloques = -(-n_temporadas // tamano_bloque) if n_pares else 0
+    generadores = [np.random.default_rng(s) for s in np.random.SeedSequence(semilla).spawn(n_bloques)]
+
+    histograma_jugadores = np.zeros((n_jugadores, 1), dtype='int64')
+    histograma_equipos = np.zeros((n_equipos, 1), dtype='int64')
+    goleador = np.zeros(n_jugadores)
+
+    for bloque, rng in enumerate(generadores):
+        n_bloque = min(tamano_bloque, n_temporadas - bloque * tamano_bloque)
+
+        # Goles de cada par (jugador, equipo) en cada temporada del bloque
+        totales_par = rng.poisson(tasas, size=(n_bloque, n_pares)).astype('float64')
+        totales_jugador = (totales_par @ par_a_jugador).astype('int64')
+        totales_equipo = (totales_par @ par_a_equipo).astype('int64')
+
+        histograma_jugadores = _acumular_histograma(histograma_jugadores, totales_jugador)
+        histograma_equipos = _acumular_histograma(histograma_equipos, totales_equipo)
+
+        # Goleador de cada temporada; los empates reparten la temporada entre los empatados
+        es_maximo = totales_jugador == totales_jugador.max(axis=1, keepdims=True)
+        goleador += (es_maximo / es_maximo.sum(axis=1, keepdims=True)).sum(axis=0)
+
+    jugadores = resumir_histograma(histograma_jugadores, cuantiles)
+    jugadores.insert(0, 'Jugador', datos['jugadores'])
+    jugadores.insert(1, 'Goles_Esperados', np.bincount(datos['jugador_par'], weights=tasas, minlength=n_jugadores))
+    jugadores['Prob_Goleador'] = goleador / n_temporadas
+    jugadores = jugadores.sort_values('Prob_Goleador', ascending=False).reset_index(drop=True)
+
+    equipos = resumir_histograma(histograma_equipos, cuantiles)
+    equipos.insert(0, 'Equipo', datos['equipos'])
+    equipos = equipos.sort_values('Media', ascending=False).reset_index(drop=True)
+
+    return {
+        'jugadores': jugadores,
+        'equipos': equipos,
+        'resumen': {
+            'temporadas': n_temporadas,
+            'bloques': n_bloques,
+            'tamano_bloque': tamano_bloque,
+            'semilla': semilla,
+            'tiempo': time.perf_counter() - inicio,
+        },
+    }
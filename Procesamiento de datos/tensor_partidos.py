@@ -0,0 +1,247 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from esquemas import COLUMNAS_CONTEO_GOLEADORES, COLUMNAS_CONTEO_PORTEROS
+
+# Carpeta donde se guarda el tensor (jugadores × partidos × estadísticas)
+CARPETA_TENSOR = "tensor_partidos"
+
+# Archivos del tensor dentro de la carpeta
+ARCHIVO_VALORES = "valores.npy"
+ARCHIVO_MASCARA = "mascara.npy"
+ARCHIVO_FECHAS = "fechas.npy"
+ARCHIVO_INDICES = "indices.json"
+
+# Versión del formato: incrementarla obliga a reconstruir los tensores guardados
+VERSION_TENSOR = 1
+
+def columnas_predeterminadas(df):
+    """
+    Estadísticas del tensor cuando no se indican: los conteos de FBref presentes en
+    los datos (jugadores de campo o porteros) o, si no hay ninguno, todas las
+    columnas numéricas salvo la temporada.
+    """
+    for conteos in (COLUMNAS_CONTEO_GOLEADORES, COLUMNAS_CONTEO_PORTEROS):
+        presentes = [col for col in conteos if col in df.columns]
+        if presentes:
+            return presentes
+    return [col for col in df.select_dtypes(include='number').columns if col != 'Temporada']
+
+def _huella(df, clave_jugador, fecha, columnas, dtype):
+    """Hash del contenido usado para construir el tensor y de sus parámetros"""
+    huella = hashlib.sha256()
+    huella.update(json.dumps([clave_jugador, fecha, list(columnas), str(np.dtype(dtype)), VERSION_TENSOR]).encode('utf-8'))
+    huella.update(pd.util.hash_pandas_object(df[[clave_jugador, fecha] + list(columnas)], index=False).to_numpy().tobytes())
+    return huella.hexdigest()
+
+def construir_tensor(df, columnas=None, carpeta=CARPETA_TENSOR, clave_jugador='Jugador', fecha='Fecha',
+                     dtype='float32', usar_cache=True):
+    """
+    Convierte los partidos unificados (formato largo, una fila por jugador y partido)
+    en un tensor denso en disco de forma (jugadores, partidos, estadísticas).
+
+    Los partidos de cada jugador ocupan las primeras posiciones de su fila, en orden
+    cronológico; las posiciones sobrantes quedan en NaN y con la máscara en False.
+    Los arreglos se guardan como .npy en la carpeta, de modo que varios procesos
+    pueden abrirlos con cargar_tensor() y compartir las mismas páginas de memoria.
+
+    Args:
+        df: DataFrame de partidos (por ejemplo data/Goleadores_Unificados.csv)
+        columnas: Estadísticas del tensor (por defecto, columnas_predeterminadas)
+        carpeta: Carpeta donde se escriben los arreglos y los índices
+        clave_jugador: Columna del jugador ('Jugador' o 'Portero')
+        fecha: Columna con la fecha del partido
+        dtype: Tipo de los valores del tensor
+        usar_cache: Si es True y la carpeta ya contiene el tensor de los mismos datos,
+            se abre sin reconstruirlo
+
+    Returns:
+        dict: Tensor abierto en modo lectura (ver cargar_tensor)
+    """
+    columnas = list(columnas) if columnas is not None else columnas_predeterminadas(df)
+    faltantes = [col for col in [clave_jugador, fecha] + columnas if col not in df.columns]
+    if faltantes:
+        raise KeyError(f"Columnas no encontradas en los datos: {faltantes}")
+
+    huella = _huella(df, clave_jugador, fecha, columnas, dtype)
+    ruta_indices = os.path.join(carpeta, ARCHIVO_INDICES)
+    if usar_cache and os.path.exists(ruta_indices):
+        with open(ruta_indices, 'r', encoding='utf-8') as f:
+            if json.load(f).get('huella') == huella:
+                print(f"Tensor cargado desde {carpeta}")
+                return cargar_tensor(carpeta)
+
+    # Orden cronológico estable dentro de cada jugador; las filas sin jugador no entran
+    datos = df.loc[df[clave_jugador].notna(), [clave_jugador, fecha] + columnas].copy()
+    datos[fecha] = pd.to_datetime(datos[fecha], errors='coerce')
+    datos = datos.sort_values([clave_jugador, fecha], kind='mergesort', na_position='last')
+
+    codigos, jugadores = pd.factorize(datos[clave_jugador], sort=True)
+    posiciones = datos.groupby(codigos, sort=False).cumcount().to_numpy()
+    n_jugadores = len(jugadores)
+    n_partidos = int(posiciones.max()) + 1 if len(posiciones) else 0
+
+    os.makedirs(carpeta, exist_ok=True)
+    # Se borra primero el índice para que un tensor a medio escribir no se use como caché
+    if os.path.exists(ruta_indices):
+        os.remove(ruta_indices)
+
+    forma = (n_jugadores, n_partidos, len(columnas))
+    valores = np.lib.format.open_memmap(os.path.join(carpeta, ARCHIVO_VALORES), mode='w+', dtype=dtype, shape=forma)
+    valores[:] = np.nan
+    valores[codigos, posiciones, :] = (datos[columnas].apply(pd.to_numeric, errors='coerce')
+                                       .to_numpy(dtype='float64'))
+    valores.flush()
+
+    mascara = np.lib.format.open_memmap(os.path.join(carpeta, ARCHIVO_MASCARA), mode='w+', dtype=bool, shape=forma[:2])
+    mascara[:] = False
+    mascara[codigos, posiciones] = True
+    mascara.flush()
+
+    fechas = np.lib.format.open_memmap(os.path.join(carpeta, ARCHIVO_FECHAS), mode='w+',
+                                       dtype='datetime64[D]', shape=forma[:2])
+    fechas[:] = np.datetime64('NaT')
+    fechas[codigos, posiciones] = datos[fecha].to_numpy(dtype='datetime64[D]')
+    fechas.flush()
+    del valores, mascara, fechas
+
+    with open(ruta_indices, 'w', encoding='utf-8') as f:
+        json.dump({
+            'huella': huella,
+            'version': VERSION_TENSOR,
+            'clave_jugador': clave_jugador,
+            'jugadores': [str(jugador) for jugador in jugadores],
+            'estadisticas': columnas,
+            'forma': list(forma),
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"✓ Tensor de {n_jugadores} jugadores × {n_partidos} partidos × {len(columnas)} estadísticas guardado en {carpeta}")
+    return cargar_tensor(carpeta)
+
+def cargar_tensor(carpeta=CARPETA_TENSOR, modo='r'):
+    """
+    Abre un tensor guardado con construir_tensor sin copiarlo a memoria.
+
+    Args:
+        carpeta: Carpeta del tensor
+        modo: Modo de np.load ('r' solo lectura, 'c' copia al escribir, 'r+' lectura y escritura)
+
+    Returns:
+        dict: 'valores' (jugadores × partidos × estadísticas), 'mascara' (partidos válidos),
+            'fechas' (fecha de cada partido), 'jugadores', 'estadisticas' y los índices
+            'indice_jugador' e 'indice_estadistica' (nombre -> posición)
+    """
+    with open(os.path.join(carpeta, ARCHIVO_INDICES), 'r', encoding='utf-8') as f:
+        indices = json.load(f)
+    if indices.get('version') != VERSION_TENSOR:
+        raise ValueError(f"El tensor de {carpeta} tiene un formato antiguo; vuelva a construirlo")
+
+    return {
+        'valores': np.load(os.path.join(carpeta, ARCHIVO_VALORES), mmap_mode=modo),
+        'mascara': np.load(os.path.join(carpeta, ARCHIVO_MASCARA), mmap_mode=modo),
+        'fechas': np.load(os.path.join(carpeta, ARCHIVO_FECHAS), mmap_mode=modo),
+        'jugadores': indices['jugadores'],
+        'estadisticas': indices['estadisticas'],
+        'clave_jugador': indices['clave_jugador'],
+        'indice_jugador': {jugador: i for i, jugador in enumerate(indices['jugadores'])},
+        'indice_estadistica': {estadistica: i for i, estadistica in enumerate(indices['estadisticas'])},
+    }
+
+def serie_jugador(tensor, jugador, estadisticas=None):
+    """
+    Partidos de un jugador como DataFrame indexado por fecha (sustituye a
+    df[df['Jugador'] == jugador] sobre el formato largo).
+
+    Args:
+        tensor: Tensor abierto con cargar_tensor o construir_tensor
+        jugador: Nombre del jugador
+        estadisticas: Estadística o lista de estadísticas (por defecto todas)
+    """
+    if jugador not in tensor['indice_jugador']:
+        raise KeyError(f"El jugador '{jugador}' no está en el tensor")
+    estadisticas = tensor['estadisticas'] if estadisticas is None else (
+        [estadisticas] if isinstance(estadisticas, str) else list(estadisticas))
+
+    i = tensor['indice_jugador'][jugador]
+    validos = tensor['mascara'][i]
+    columnas = [tensor['indice_estadistica'][estadistica] for estadistica in estadisticas]
+    return pd.DataFrame(tensor['valores'][i][validos][:, columnas], columns=estadisticas,
+                        index=pd.DatetimeIndex(tensor['fechas'][i][validos], name='Fecha'))
+
+def agregados_por_jugador(tensor, estadisticas=None):
+    """
+    Partidos, totales y promedios por jugador de todas las estadísticas a la vez.
+
+    Returns:
+        DataFrame: Una fila por jugador con 'Partidos', '<estadística>_total' y '<estadística>_media'
+    """
+    estadisticas = tensor['estadisticas'] if estadisticas is None else list(estadisticas)
+    columnas = [tensor['indice_estadistica'][estadistica] for estadistica in estadisticas]
+    valores = tensor['valores'][:, :, columnas]
+
+    totales = np.nansum(valores, axis=1, dtype='float64')
+    conteos = (~np.isnan(valores)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        medias = totales / conteos
+
+    resultado = pd.DataFrame({'Partidos': tensor['mascara'].sum(axis=1)},
+                             index=pd.Index(tensor['jugadores'], name=tensor['clave_jugador']))
+    for k, estadistica in enumerate(estadisticas):
+        resultado[f"{estadistica}_total"] = totales[:, k]
+        resultado[f"{estadistica}_media"] = medias[:, k]
+    return resultado
+
+def media_movil(tensor, estadistica, ventana, desplazar=True, min_partidos=1):
+    """
+    Media de los últimos `ventana` partidos de cada jugador para todos los jugadores
+    a la vez, con sumas acumuladas sobre el eje de partidos.
+
+    Args:
+        tensor: Tensor abierto
+        estadistica: Estadística a promediar
+        ventana: Número de partidos de la ventana
+        desplazar: Si es True, la media de cada partido usa solo los partidos anteriores
+            (sin fuga de información hacia el propio partido)
+        min_partidos: Partidos con valor necesarios para calcular la media
+
+    Returns:
+        ndarray: Arreglo (jugadores, partidos) con NaN donde no hay media
+    """
+    valores = np.asarray(tensor['valores'][:, :, tensor['indice_estadistica'][estadistica]], dtype='float64')
+    presentes = ~np.isnan(valores)
+
+    # Sumas acumuladas con un cero inicial: la ventana [t - ventana + 1, t] es acumulado[t + 1] - acumulado[t + 1 - ventana]
+    relleno = np.zeros((valores.shape[0], 1))
+    suma = np.concatenate([relleno, np.cumsum(np.where(presentes, valores, 0.0), axis=1)], axis=1)
+    cuenta = np.concatenate([relleno, np.cumsum(presentes, axis=1)], axis=1)
+
+    fin = np.arange(valores.shape[1]) + (0 if desplazar else 1)
+    inicio = np.maximum(fin - ventana, 0)
+    suma_ventana = suma[:, fin] - suma[:, inicio]
+    cuenta_ventana = cuenta[:, fin] - cuenta[:, inicio]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = suma_ventana / cuenta_ventana
+    media[(cuenta_ventana < min_partidos) | ~np.asarray(tensor['mascara'])] = np.nan
+    return media
+
+def a_formato_largo(tensor, arreglo=None, nombre=None):
+    """
+    Devuelve el tensor (o un arreglo (jugadores, partidos) derivado de él, como el de
+    media_movil) al formato largo de los DataFrames, solo con los partidos válidos.
+    """
+    filas, posiciones = np.nonzero(np.asarray(tensor['mascara']))
+    df = pd.DataFrame({
+        tensor['clave_jugador']: np.asarray(tensor['jugadores'], dtype=object)[filas],
+        'Fecha': tensor['fechas'][filas, posiciones],
+    })
+    if arreglo is None:
+        valores = tensor['valores'][filas, posiciones, :]
+        for k, estadistica in enumerate(tensor['estadisticas']):
+            df[estadistica] = valores[:, k]
+    else:
+        df[nombre or 'valor'] = np.asarray(arreglo)[filas, posiciones]
+    return df
@@ -10,13 +10,23 @@ import re
 import traceback
 import datetime
 import csv
+import sys
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.common.by import By
 
+# Instrumentación compartida con el scraper de SofaScore
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from instrumentacion import (medir_fase, fase, ambito, contar, iniciar_ejecucion, finalizar_ejecucion,
+                             instrumentar_driver)
+
 # Configuración base
 DATA_FOLDER = "data/"
+
+# URL base de FBref. FBREF_BASE_URL permite apuntar el scraper al emulador local
+# (emulador_sitio.py), por ejemplo http://127.0.0.1:8765
+FBREF_BASE_URL = os.environ.get("FBREF_BASE_URL", "https://fbref.com").rstrip("/")
 PLAYERS_FOLDER = "Porteros seleccionados"
 
 # Headers para simular un navegador real
@@ -116,6 +126,7 @@ def create_driver(browser_type='firefox', visible=True):
         print(f"Navegador {browser_type} no soportado. Usando Firefox por defecto.")
         return create_driver('firefox', visible)
 
+@medir_fase("navegacion")
 def navigate_to_page(driver, url):
     """Navega a la página del jugador en FBref"""
     try:
@@ -142,6 +153,7 @@ def navigate_to_page(driver, url):
         print(traceback.format_exc())
         return False
 
+@medir_fase("info_jugador")
 def extract_player_info(driver, url):
     """Extrae la información básica del jugador desde la URL y la página"""
     player_info = {
@@ -217,6 +229,7 @@ def extract_player_info(driver, url):
         print(traceback.format_exc())
         return player_info
 
+@medir_fase("extraccion")
 def extract_matches_from_fbref(driver):
     """Extrae datos de partidos directamente de la estructura específica de FBref, omitiendo encabezados"""
     print("Extrayendo datos de partidos de FBref...")
@@ -332,6 +345,7 @@ def extract_matches_from_fbref(driver):
         print(f"Total de partidos extraídos: {len(matches_data)}")
     return matches_data
 
+@medir_fase("procesamiento")
 def process_matches_data(matches_data, player_info):
     """Procesa y limpia los datos de partidos extraídos"""
     if not matches_data:
@@ -463,6 +477,7 @@ def process_matches_data(matches_data, player_info):
     
     return matches_data
 
+@medir_fase("escritura")
 def save_matches_to_csv(matches_data, file_path):
     """Guarda los datos de partidos en un archivo CSV"""
     try:
@@ -487,13 +502,18 @@ def save_matches_to_csv(matches_data, file_path):
         print(traceback.format_exc())
         return False
 
-def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
-    """Función principal de scraping que integra todo el proceso"""
-    driver = None
+def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5, driver=None):
+    """
+    Función principal de scraping que integra todo el proceso. Si se pasa un driver
+    abierto (workers de cola_scraping.py) se reutiliza y no se cierra al terminar
+    """
+    driver_propio = driver is None
     
     try:
         # Inicializar driver
-        driver = create_driver(browser_type, visible)
+        if driver_propio:
+            with fase("inicio_navegador"):
+                driver = instrumentar_driver(create_driver(browser_type, visible))
         driver.set_page_load_timeout(timeout)
         
         # Navegar a la página
@@ -501,7 +521,8 @@ def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
             return False
         
         # Esperar carga completa
-        time.sleep(wait)
+        with fase("espera"):
+            time.sleep(wait)
         
         # Extraer información del jugador
         player_info = extract_player_info(driver, url)
@@ -533,6 +554,7 @@ def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
             
             # Guardar en CSV
             if processed_matches and save_matches_to_csv(processed_matches, file_path):
+                contar("partidos", len(processed_matches))
                 print(f"¡Éxito! Se extrajeron y guardaron {len(processed_matches)} partidos.")
                 return True
         
@@ -545,7 +567,7 @@ def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
         return False
     
     finally:
-        if driver:
+        if driver and driver_propio:
             driver.quit()
             print("Navegador cerrado")
 
@@ -565,6 +587,8 @@ def main():
                         help='Tiempo de espera tras cargar la página')
     parser.add_argument('--retries', type=int, default=3,
                         help='Número de reintentos en caso de error')
+    parser.add_argument('--reporte', type=str, default=None,
+                        help='Ruta del informe JSON de tiempos por fase (por defecto en reportes/)')
     
     args = parser.parse_args()
     
@@ -575,7 +599,7 @@ def main():
         url = input("Introduce la URL de la página del portero (presiona Enter para usar URL predeterminada): ")
         
         if not url:
-            url = "https://fbref.com/en/players/70860ae2/matchlogs/2024/Goalkeeping/Camilo-Vargas-Match-Logs"
+            url = f"{FBREF_BASE_URL}/en/players/70860ae2/matchlogs/2024/Goalkeeping/Camilo-Vargas-Match-Logs"
             print(f"Usando URL predeterminada: {url}")
     
     # Información del proceso
@@ -587,15 +611,23 @@ def main():
     print(f"Reintentos: {args.retries}")
     print("===============================\n")
     
+    # Informe de tiempos por fase de esta ejecución (cada reintento es una categoría)
+    iniciar_ejecucion("fbref_porteros", url=url, navegador=args.browser)
+    
     # Reintentos
     for retry in range(args.retries):
         if retry > 0:
             print(f"\nReintento {retry+1}/{args.retries}...")
         
-        if scrape_fbref(url, args.browser, args.visible, args.timeout, args.wait):
+        with ambito(categoria=f"intento_{retry+1}"):
+            exito = scrape_fbref(url, args.browser, args.visible, args.timeout, args.wait)
+        if exito:
             print("\n¡Proceso completado con éxito!")
+            finalizar_ejecucion(args.reporte)
             return
     
+    finalizar_ejecucion(args.reporte)
+    
     print(f"\nSe alcanzó el máximo de reintentos ({args.retries}) sin éxito.")
     print("Sugerencias:")
     print("- Verifica que la URL sea correcta y corresponda a un portero")
@@ -10,13 +10,24 @@ import re
 import traceback
 import datetime
 import csv
+import sys
+from lxml import html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.common.by import By
 
+# Instrumentación compartida con el scraper de SofaScore
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from instrumentacion import (medir_fase, fase, ambito, contar, iniciar_ejecucion, finalizar_ejecucion,
+                             instrumentar_driver)
+
 # Configuración base
 DATA_FOLDER = "data/"
+
+# URL base de FBref. FBREF_BASE_URL permite apuntar el scraper al emulador local
+# (emulador_sitio.py), por ejemplo http://127.0.0.1:8765
+FBREF_BASE_URL = os.environ.get("FBREF_BASE_URL", "https://fbref.com").rstrip("/")
 PLAYERS_FOLDER = "Jugadores seleccionados"
 
 # Headers para simular un navegador real
@@ -93,6 +104,141 @@ ACRONIMO_A_NOMBRE_COMPLETO = {
     # Se ha eliminado "Match Report": "Informe del partido"
 }
 
+# Script de respaldo que extrae los partidos en el navegador con una sola llamada
+JS_EXTRACT_MATCHES = """
+function extractFBrefMatches() {
+    var matches = [];
+    var matchId = 1;
+    
+    // Definir mapeo de data-stat a campos
+    var dataStatMap = {
+        "date": "Date",
+        "dayofweek": "Day",
+        "comp": "Comp",
+        "round": "Round",
+        "venue": "Venue",
+        "result": "Result",
+        "team": "Squad",
+        "opponent": "Opponent",
+        "game_started": "Start",
+        "position": "Pos",
+        "minutes": "Min",
+        "goals": "Gls",
+        "assists": "Ast",
+        "pens_made": "PK",
+        "pens_att": "PKatt",
+        "shots": "Sh",
+        "shots_on_target": "SoT",
+        "cards_yellow": "CrdY",
+        "cards_red": "CrdR",
+        "fouls": "Fls",
+        "fouled": "Fld",
+        "offsides": "Off",
+        "crosses": "Crs",
+        "tackles_won": "TklW",
+        "interceptions": "Int",
+        "own_goals": "OG",
+        "pens_won": "PKwon",
+        "pens_conceded": "PKcon"
+    };
+    
+    // Buscar todas las celdas de fecha con atributo csk
+    var dateCells = document.querySelectorAll('th[data-stat="date"][csk], td[data-stat="date"][csk]');
+    
+    for (var i = 0; i < dateCells.length; i++) {
+        var dateCell = dateCells[i];
+        var cskDate = dateCell.getAttribute('csk');
+        
+        if (!cskDate) continue;
+        
+        // Formatear la fecha
+        var formattedDate = cskDate;
+        if (cskDate.length === 8) {
+            formattedDate = cskDate.substr(0, 4) + '-' + cskDate.substr(4, 2) + '-' + cskDate.substr(6, 2);
+        }
+        
+        var row = dateCell.parentNode;
+        
+        // Verificar si es una fila válida
+        if (!row || row.classList.contains('thead') || 
+            row.classList.contains('divider') || 
+            row.classList.contains('spacer') || 
+            row.classList.contains('over_header')) {
+            continue;
+        }
+        
+        var match = {
+            partido: matchId.toString(),
+            Date: formattedDate
+        };
+        
+        // Extraer el resto de campos
+        for (var stat in dataStatMap) {
+            if (stat === 'date') continue; // Ya tenemos la fecha
+            
+            var cell = row.querySelector('td[data-stat="' + stat + '"]');
+            if (cell) {
+                match[dataStatMap[stat]] = cell.textContent.trim();
+            } else {
+                match[dataStatMap[stat]] = "";
+            }
+        }
+        
+        matches.push(match);
+        matchId++;
+    }
+    
+    // Si no encontramos nada con csk, intentar con los enlaces
+    if (matches.length === 0) {
+        var dateLinks = document.querySelectorAll('td[data-stat="date"] a');
+        
+        for (var i = 0; i < dateLinks.length; i++) {
+            var link = dateLinks[i];
+            var href = link.getAttribute('href');
+            var dateMatch = href.match(/(\\d{4}-\\d{2}-\\d{2})/);
+            
+            if (!dateMatch) continue;
+            
+            var row = link.closest('tr');
+            
+            if (!row || row.classList.contains('thead') || 
+                row.classList.contains('divider') || 
+                row.classList.contains('spacer') || 
+                row.classList.contains('over_header')) {
+                continue;
+            }
+            
+            var match = {
+                partido: matchId.toString(),
+                Date: dateMatch[1]
+            };
+            
+            // Extraer el resto de campos
+            for (var stat in dataStatMap) {
+                if (stat === 'date') continue;
+                
+                var cell = row.querySelector('td[data-stat="' + stat + '"]');
+                if (cell) {
+                    match[dataStatMap[stat]] = cell.textContent.trim();
+                } else {
+                    match[dataStatMap[stat]] = "";
+                }
+            }
+            
+            matches.push(match);
+            matchId++;
+        }
+    }
+    
+    return matches;
+}
+
+return extractFBrefMatches();
+"""
+
+# Clases de filas de la tabla de FBref que no son partidos
+FILAS_EXCLUIDAS = ["thead", "divider", "spacer", "over_header"]
+
 def create_driver(browser_type='firefox', visible=True):
     """Crea y configura el driver del navegador elegido"""
     print(f"Configurando el navegador {browser_type}...")
@@ -133,6 +279,7 @@ def create_driver(browser_type='firefox', visible=True):
         print(f"Navegador {browser_type} no soportado. Usando Firefox por defecto.")
         return create_driver('firefox', visible)
 
+@medir_fase("navegacion")
 def navigate_to_page(driver, url):
     """Navega a la página del jugador en FBref"""
     try:
@@ -159,6 +306,7 @@ def navigate_to_page(driver, url):
         print(traceback.format_exc())
         return False
 
+@medir_fase("info_jugador")
 def extract_player_info(driver, url):
     """Extrae la información básica del jugador desde la URL y la página"""
     player_info = {
@@ -219,6 +367,7 @@ def extract_player_info(driver, url):
         print(traceback.format_exc())
         return player_info
 
+@medir_fase("extraccion")
 def extract_matches_from_fbref(driver):
     """Extrae datos de partidos directamente de la estructura específica de FBref usando el atributo csk"""
     print("Extrayendo datos de partidos de FBref...")
@@ -258,7 +407,7 @@ def extract_matches_from_fbref(driver):
                 
                 # Verificar si es una fila deseada
                 row_class = row.get_attribute("class") or ""
-                if any(c in row_class for c in ["thead", "divider", "spacer", "over_header"]):
+                if any(c in row_class for c in FILAS_EXCLUIDAS):
                     continue
                 
                 # Crear datos para este partido
@@ -307,7 +456,7 @@ def extract_matches_from_fbref(driver):
                 
                 # Verificar si es una fila deseada
                 row_class = row.get_attribute("class") or ""
-                if any(c in row_class for c in ["thead", "divider", "spacer", "over_header"]):
+                if any(c in row_class for c in FILAS_EXCLUIDAS):
                     continue
                 
                 # Crear datos para este partido
@@ -339,138 +488,7 @@ def extract_matches_from_fbref(driver):
         try:
             print("Intentando extracción con JavaScript...")
             
-            js_script = """
-            function extractFBrefMatches() {
-                var matches = [];
-                var matchId = 1;
-                
-                // Definir mapeo de data-stat a campos
-                var dataStatMap = {
-                    "date": "Date",
-                    "dayofweek": "Day",
-                    "comp": "Comp",
-                    "round": "Round",
-                    "venue": "Venue",
-                    "result": "Result",
-                    "team": "Squad",
-                    "opponent": "Opponent",
-                    "game_started": "Start",
-                    "position": "Pos",
-                    "minutes": "Min",
-                    "goals": "Gls",
-                    "assists": "Ast",
-                    "pens_made": "PK",
-                    "pens_att": "PKatt",
-                    "shots": "Sh",
-                    "shots_on_target": "SoT",
-                    "cards_yellow": "CrdY",
-                    "cards_red": "CrdR",
-                    "fouls": "Fls",
-                    "fouled": "Fld",
-                    "offsides": "Off",
-                    "crosses": "Crs",
-                    "tackles_won": "TklW",
-                    "interceptions": "Int",
-                    "own_goals": "OG",
-                    "pens_won": "PKwon",
-                    "pens_conceded": "PKcon"
-                };
-                
-                // Buscar todas las celdas de fecha con atributo csk
-                var dateCells = document.querySelectorAll('th[data-stat="date"][csk], td[data-stat="date"][csk]');
-                
-                for (var i = 0; i < dateCells.length; i++) {
-                    var dateCell = dateCells[i];
-                    var cskDate = dateCell.getAttribute('csk');
-                    
-                    if (!cskDate) continue;
-                    
-                    // Formatear la fecha
-                    var formattedDate = cskDate;
-                    if (cskDate.length === 8) {
-                        formattedDate = cskDate.substr(0, 4) + '-' + cskDate.substr(4, 2) + '-' + cskDate.substr(6, 2);
-                    }
-                    
-                    var row = dateCell.parentNode;
-                    
-                    // Verificar si es una fila válida
-                    if (!row || row.classList.contains('thead') || 
-                        row.classList.contains('divider') || 
-                        row.classList.contains('spacer') || 
-                        row.classList.contains('over_header')) {
-                        continue;
-                    }
-                    
-                    var match = {
-                        partido: matchId.toString(),
-                        Date: formattedDate
-                    };
-                    
-                    // Extraer el resto de campos
-                    for (var stat in dataStatMap) {
-                        if (stat === 'date') continue; // Ya tenemos la fecha
-                        
-                        var cell = row.querySelector('td[data-stat="' + stat + '"]');
-                        if (cell) {
-                            match[dataStatMap[stat]] = cell.textContent.trim();
-                        } else {
-                            match[dataStatMap[stat]] = "";
-                        }
-                    }
-                    
-                    matches.push(match);
-                    matchId++;
-                }
-                
-                // Si no encontramos nada con csk, intentar con los enlaces
-                if (matches.length === 0) {
-                    var dateLinks = document.querySelectorAll('td[data-stat="date"] a');
-                    
-                    for (var i = 0; i < dateLinks.length; i++) {
-                        var link = dateLinks[i];
-                        var href = link.getAttribute('href');
-                        var dateMatch = href.match(/(\\d{4}-\\d{2}-\\d{2})/);
-                        
-                        if (!dateMatch) continue;
-                        
-                        var row = link.closest('tr');
-                        
-                        if (!row || row.classList.contains('thead') || 
-                            row.classList.contains('divider') || 
-                            row.classList.contains('spacer') || 
-                            row.classList.contains('over_header')) {
-                            continue;
-                        }
-                        
-                        var match = {
-                            partido: matchId.toString(),
-                            Date: dateMatch[1]
-                        };
-                        
-                        // Extraer el resto de campos
-                        for (var stat in dataStatMap) {
-                            if (stat === 'date') continue;
-                            
-                            var cell = row.querySelector('td[data-stat="' + stat + '"]');
-                            if (cell) {
-                                match[dataStatMap[stat]] = cell.textContent.trim();
-                            } else {
-                                match[dataStatMap[stat]] = "";
-                            }
-                        }
-                        
-                        matches.push(match);
-                        matchId++;
-                    }
-                }
-                
-                return matches;
-            }
-            
-            return extractFBrefMatches();
-            """
-            
-            js_matches = driver.execute_script(js_script)
+            js_matches = extract_matches_js(driver)
             print(f"Extracción JavaScript encontró {len(js_matches)} partidos")
             
             if js_matches and len(js_matches) > 0:
@@ -482,6 +500,62 @@ def extract_matches_from_fbref(driver):
     print(f"Total de partidos extraídos: {len(matches_data)}")
     return matches_data
 
+def extract_matches_js(driver):
+    """Extrae los partidos con una sola llamada execute_script (JS_EXTRACT_MATCHES)"""
+    return driver.execute_script(JS_EXTRACT_MATCHES) or []
+
+def extract_matches_from_html(page_source):
+    """
+    Extrae los partidos del HTML de la página (driver.page_source o una página
+    guardada) con lxml. Sigue el mismo orden que extract_matches_from_fbref: celdas
+    de fecha con atributo csk y, si no hay, enlaces de fecha.
+    """
+    matches_data = []
+    tree = lxml_html.fromstring(page_source)
+    
+    date_cells = tree.xpath("//th[@data-stat='date' and @csk] | //td[@data-stat='date' and @csk]")
+    fechas = []
+    if date_cells:
+        for date_cell in date_cells:
+            csk_date = date_cell.get("csk")
+            if not csk_date:
+                continue
+            # Formatear la fecha (el csk suele tener formato YYYYMMDD)
+            formatted_date = f"{csk_date[:4]}-{csk_date[4:6]}-{csk_date[6:8]}" if len(csk_date) == 8 else csk_date
+            fechas.append((formatted_date, date_cell.getparent()))
+    else:
+        for link in tree.xpath("//td[@data-stat='date']//a[@href]"):
+            date_match = re.search(r'(\d{4}-\d{2}-\d{2})', link.get("href"))
+            row = next(link.iterancestors("tr"), None)
+            if date_match and row is not None:
+                fechas.append((date_match.group(1), row))
+    
+    for formatted_date, row in fechas:
+        row_class = row.get("class") or ""
+        if any(c in row_class for c in FILAS_EXCLUIDAS):
+            continue
+        
+        # Celdas de la fila indexadas por data-stat (la primera de cada una, como find_element)
+        celdas = {}
+        for cell in row.xpath(".//td[@data-stat]"):
+            celdas.setdefault(cell.get("data-stat"), cell)
+        
+        match_data = {
+            "partido": str(len(matches_data) + 1),
+            "Date": formatted_date
+        }
+        for campo, data_stat in CAMPO_A_DATA_STAT.items():
+            if campo == "Date":
+                continue
+            cell = celdas.get(data_stat)
+            match_data[campo] = cell.text_content().strip() if cell is not None else ""
+        
+        matches_data.append(match_data)
+    
+    print(f"Total de partidos extraídos: {len(matches_data)}")
+    return matches_data
+
+@medir_fase("procesamiento")
 def process_matches_data(matches_data, player_info):
     """Procesa y limpia los datos de partidos extraídos"""
     if not matches_data:
@@ -593,6 +667,7 @@ def process_matches_data(matches_data, player_info):
     
     return matches_data
 
+@medir_fase("escritura")
 def save_matches_to_csv(matches_data, file_path):
     """Guarda los datos de partidos en un archivo CSV"""
     try:
@@ -617,13 +692,18 @@ def save_matches_to_csv(matches_data, file_path):
         print(traceback.format_exc())
         return False
 
-def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
-    """Función principal de scraping que integra todo el proceso"""
-    driver = None
+def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5, driver=None):
+    """
+    Función principal de scraping que integra todo el proceso. Si se pasa un driver
+    abierto (workers de cola_scraping.py) se reutiliza y no se cierra al terminar
+    """
+    driver_propio = driver is None
     
     try:
         # Inicializar driver
-        driver = create_driver(browser_type, visible)
+        if driver_propio:
+            with fase("inicio_navegador"):
+                driver = instrumentar_driver(create_driver(browser_type, visible))
         driver.set_page_load_timeout(timeout)
         
         # Navegar a la página
@@ -631,7 +711,8 @@ def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
             return False
         
         # Esperar carga completa
-        time.sleep(wait)
+        with fase("espera"):
+            time.sleep(wait)
         
         # Extraer información del jugador
         player_info = extract_player_info(driver, url)
@@ -663,6 +744,7 @@ def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
             
             # Guardar en CSV
             if processed_matches and save_matches_to_csv(processed_matches, file_path):
+                contar("partidos", len(processed_matches))
                 print(f"¡Éxito! Se extrajeron y guardaron {len(processed_matches)} partidos.")
                 return True
         
@@ -675,7 +757,7 @@ def scrape_fbref(url, browser_type='firefox', visible=True, timeout=60, wait=5):
         return False
     
     finally:
-        if driver:
+        if driver and driver_propio:
             driver.quit()
             print("Navegador cerrado")
 
@@ -694,6 +776,8 @@ def main():
                         help='Tiempo de espera tras cargar la página')
     parser.add_argument('--retries', type=int, default=3,
                         help='Número de reintentos en caso de error')
+    parser.add_argument('--reporte', type=str, default=None,
+                        help='Ruta del informe JSON de tiempos por fase (por defecto en reportes/)')
     
     args = parser.parse_args()
     
@@ -704,7 +788,7 @@ def main():
         url = input("Introduce la URL de la página del jugador (presiona Enter para usar URL predeterminada): ")
         
         if not url:
-            url = "https://fbref.com/en/players/09a9e921/matchlogs/2024/Carlos-Bacca-Match-Logs"
+            url = f"{FBREF_BASE_URL}/en/players/09a9e921/matchlogs/2024/Carlos-Bacca-Match-Logs"
             print(f"Usando URL predeterminada: {url}")
     
     # Información del proceso
@@ -716,15 +800,23 @@ def main():
     print(f"Reintentos: {args.retries}")
     print("===============================\n")
     
+    # Informe de tiempos por fase de esta ejecución (cada reintento es una categoría)
+    iniciar_ejecucion("fbref_jugadores", url=url, navegador=args.browser)
+    
     # Reintentos
     for retry in range(args.retries):
         if retry > 0:
             print(f"\nReintento {retry+1}/{args.retries}...")
         
-        if scrape_fbref(url, args.browser, args.visible, args.timeout, args.wait):
+        with ambito(categoria=f"intento_{retry+1}"):
+            exito = scrape_fbref(url, args.browser, args.visible, args.timeout, args.wait)
+        if exito:
             print("\n¡Proceso completado con éxito!")
+            finalizar_ejecucion(args.reporte)
             return
     
+    finalizar_ejecucion(args.reporte)
+    
     print(f"\nSe alcanzó el máximo de reintentos ({args.retries}) sin éxito.")
     print("Sugerencias:")
     print("- Verifica que la URL sea correcta")
@@ -1,8 +1,17 @@
 import pandas as pd
 import os
 import re
+import sys
+import argparse
 import datetime
 
+# Esquemas de tipos compartidos con "Procesamiento de datos"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Procesamiento de datos'))
+from esquemas import ESQUEMAS
+
+# Tipos de las columnas numéricas del archivo unificado
+TIPOS_COLUMNAS = ESQUEMAS['porteros_unificados']['tipos']
+
 # Lista de columnas esperadas en el nuevo formato para porteros
 COLUMNAS_ESPERADAS = [
     "partido", "Fecha", "Día de la semana", "Competición", "Ronda o Fase", 
@@ -189,16 +198,10 @@ def unificar_columnas(df, año, portero):
         if columna not in df.columns:
             df[columna] = ""
     
-    # 6. Convertir columnas numéricas específicas para porteros
-    columnas_numericas = [
-        "Minutos", "Tiros a puerta recibidos", "Goles encajados", "Paradas", 
-        "Porterías a cero", "Penales recibidos", "Penales permitidos", 
-        "Penales atajados", "Penales fallados"
-    ]
-    
-    for col in columnas_numericas:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+    # 6. Convertir columnas numéricas específicas para porteros a los tipos compactos del esquema
+    for col, tipo in TIPOS_COLUMNAS.items():
+        if col in df.columns and tipo.startswith('int'):
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(tipo)
     
     # 7. Tratamiento especial para el porcentaje de paradas
     if 'Porcentaje de paradas' in df.columns:
@@ -209,6 +212,7 @@ def unificar_columnas(df, año, portero):
         df['Porcentaje de paradas'] = df['Porcentaje de paradas'].apply(
             lambda x: x/100 if x > 1 else x
         )
+        df['Porcentaje de paradas'] = df['Porcentaje de paradas'].astype(TIPOS_COLUMNAS['Porcentaje de paradas'])
     
     # 8. Asegurar que la posición es "GK" para todos los porteros
     if 'Posición' in df.columns:
@@ -296,18 +300,46 @@ def procesar_portero(nombre_portero):
         print(f"No se ha podido unificar ningún archivo para {nombre_portero}.")
         return None
 
-def mostrar_resumen(df):
+def _unir_valores(serie):
+    """
+    Une los valores distintos (no vacíos) de una serie en un texto separado por comas.
+    """
+    valores = serie.dropna().astype(str).str.strip()
+    valores = valores[valores != '']
+    return ', '.join(valores.unique())
+
+def calcular_resumen(df):
+    """
+    Calcula el resumen por portero con una sola agregación groupby.
+    Retorna un DataFrame con partidos, goles encajados, porterías a cero, penales,
+    equipos y competiciones por portero, en el orden en que aparecen en el DataFrame.
+    """
+    agregaciones = {'Partidos': ('Portero', 'size')}
+    for columna in ['Goles encajados', 'Porterías a cero', 'Penales atajados', 'Penales recibidos']:
+        if columna in df.columns:
+            agregaciones[columna] = (columna, 'sum')
+    if 'Equipo' in df.columns:
+        agregaciones['Equipos'] = ('Equipo', _unir_valores)
+    if 'Competición' in df.columns:
+        agregaciones['Competiciones'] = ('Competición', _unir_valores)
+    
+    resumen = df.groupby('Portero', sort=False).agg(**agregaciones).reset_index()
+    return resumen
+
+def mostrar_resumen(df, ruta_salida=None):
     """
     Muestra un resumen del DataFrame unificado para porteros.
+    Si se indica ruta_salida, el resumen por portero también se guarda como CSV.
+    Retorna el DataFrame con el resumen por portero.
     """
+    resumen = calcular_resumen(df)
+    
     print("\nResumen de los datos unificados:")
     print(f"Total de registros: {len(df)}")
     
     # Mostrar porteros y partidos por portero
-    porteros = df['Portero'].unique()
-    print(f"\nPorteros incluidos ({len(porteros)}):")
-    for portero in porteros:
-        partidos = df[df['Portero'] == portero].shape[0]
+    print(f"\nPorteros incluidos ({len(resumen)}):")
+    for portero, partidos in zip(resumen['Portero'], resumen['Partidos']):
         print(f"- {portero}: {partidos} partidos")
     
     # Mostrar equipos
@@ -316,45 +348,55 @@ def mostrar_resumen(df):
     for equipo in equipos:
         print(f"- {equipo}")
     
-    # Mostrar competiciones
+    # Mostrar competiciones (un solo conteo para todas)
     if 'Competición' in df.columns:
         competiciones = df['Competición'].unique()
+        partidos_por_competicion = df['Competición'].value_counts()
         print(f"\nCompeticiones incluidas ({len(competiciones)}):")
         for comp in competiciones:
             if pd.notna(comp) and comp != '':
-                partidos = df[df['Competición'] == comp].shape[0]
-                print(f"- {comp}: {partidos} partidos")
+                print(f"- {comp}: {partidos_por_competicion[comp]} partidos")
     
     # Estadísticas de portero
-    if 'Goles encajados' in df.columns:
-        total_goles_encajados = df['Goles encajados'].sum()
-        print(f"\nTotal de goles encajados: {total_goles_encajados}")
-        for portero in porteros:
-            goles_encajados = df[df['Portero'] == portero]['Goles encajados'].sum()
+    if 'Goles encajados' in resumen.columns:
+        print(f"\nTotal de goles encajados: {resumen['Goles encajados'].sum()}")
+        for portero, goles_encajados in zip(resumen['Portero'], resumen['Goles encajados']):
             print(f"- {portero}: {goles_encajados} goles encajados")
     
     # Estadísticas de porterías a cero
-    if 'Porterías a cero' in df.columns:
-        total_porterias_cero = df['Porterías a cero'].sum()
-        print(f"\nTotal de porterías a cero: {total_porterias_cero}")
-        for portero in porteros:
-            porterias_cero = df[df['Portero'] == portero]['Porterías a cero'].sum()
+    if 'Porterías a cero' in resumen.columns:
+        print(f"\nTotal de porterías a cero: {resumen['Porterías a cero'].sum()}")
+        for portero, porterias_cero in zip(resumen['Portero'], resumen['Porterías a cero']):
             print(f"- {portero}: {porterias_cero} porterías a cero")
     
     # Estadísticas de penales atajados
-    if 'Penales atajados' in df.columns:
-        total_penales_atajados = df['Penales atajados'].sum()
+    if 'Penales atajados' in resumen.columns:
+        total_penales_atajados = resumen['Penales atajados'].sum()
         if total_penales_atajados > 0:
             print(f"\nTotal de penales atajados: {total_penales_atajados}")
-            for portero in porteros:
-                penales_atajados = df[df['Portero'] == portero]['Penales atajados'].sum()
-                if penales_atajados > 0:
-                    penales_enfrentados = df[df['Portero'] == portero]['Penales recibidos'].sum()
-                    if penales_enfrentados > 0:
-                        porcentaje = (penales_atajados / penales_enfrentados) * 100
-                        print(f"- {portero}: {penales_atajados} penales atajados ({porcentaje:.1f}%)")
+            if 'Penales recibidos' in resumen.columns:
+                con_atajadas = resumen[(resumen['Penales atajados'] > 0) & (resumen['Penales recibidos'] > 0)]
+                for portero, penales_atajados, penales_enfrentados in zip(
+                    con_atajadas['Portero'], con_atajadas['Penales atajados'], con_atajadas['Penales recibidos']
+                ):
+                    porcentaje = (penales_atajados / penales_enfrentados) * 100
+                    print(f"- {portero}: {penales_atajados} penales atajados ({porcentaje:.1f}%)")
+    
+    # Guardar el resumen si se solicitó
+    if ruta_salida:
+        resumen.to_csv(ruta_salida, index=False)
+        print(f"\nResumen por portero guardado en: {ruta_salida}")
+    
+    return resumen
 
-def main():
+def main(ruta_salida=None):
+    """
+    Unifica los archivos de los porteros indicados por consola.
+
+    Args:
+        ruta_salida: Ruta del CSV unificado; si es None se pide el nombre por consola
+                     y el archivo se guarda en data/
+    """
     print("=== UNIFICADOR DE ESTADÍSTICAS DE PORTEROS DE FÚTBOL ===")
     print("Este programa unifica archivos CSV de estadísticas de porteros en un único archivo.")
     print("Los archivos deben tener el formato: YYYY_NombrePortero_portero.csv")
@@ -415,21 +457,31 @@ def main():
             [col for col in columnas_ordenadas if col in df_unificado_final.columns]
         ]
         
-        # Guardar el dataframe unificado en la carpeta data
-        nombre_salida = input("\nIngrese el nombre para el archivo unificado (ej: porteros_unificados.csv): ")
-        if not nombre_salida.lower().endswith('.csv'):
-            nombre_salida += '.csv'
+        # Guardar el dataframe unificado en la ruta indicada o en la carpeta data
+        if ruta_salida:
+            ruta_completa = ruta_salida
+            if os.path.dirname(ruta_completa):
+                os.makedirs(os.path.dirname(ruta_completa), exist_ok=True)
+        else:
+            nombre_salida = input("\nIngrese el nombre para el archivo unificado (ej: porteros_unificados.csv): ")
+            if not nombre_salida.lower().endswith('.csv'):
+                nombre_salida += '.csv'
+            ruta_completa = os.path.join(directorio_data, nombre_salida)
         
-        ruta_completa = os.path.join(directorio_data, nombre_salida)
         df_unificado_final.to_csv(ruta_completa, index=False)
         print(f"\nArchivo unificado guardado como: {ruta_completa}")
         
-        # Mostrar un resumen de los datos
-        mostrar_resumen(df_unificado_final)
+        # Mostrar y guardar un resumen de los datos
+        ruta_resumen = os.path.splitext(ruta_completa)[0] + '_resumen.csv'
+        mostrar_resumen(df_unificado_final, ruta_resumen)
         
         print("\n¡Proceso completado con éxito!")
     else:
         print("No se ha podido unificar ningún archivo.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Unifica los archivos por temporada de los porteros de FBref')
+    parser.add_argument('--salida', type=str, default=None,
+                        help='Ruta del CSV unificado (si no se indica, se pide el nombre por consola)')
+    args = parser.parse_args()
+    main(args.salida)
\ No newline at end of file
@@ -1,8 +1,17 @@
 import pandas as pd
 import os
 import re
+import sys
+import argparse
 import datetime
 
+# Esquemas de tipos compartidos con "Procesamiento de datos"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Procesamiento de datos'))
+from esquemas import ESQUEMAS
+
+# Tipos de las columnas numéricas del archivo unificado
+TIPOS_COLUMNAS = ESQUEMAS['goleadores_unificados']['tipos']
+
 # Lista de columnas esperadas en el nuevo formato
 COLUMNAS_ESPERADAS = [
     "partido", "Fecha", "Día de la semana", "Competición", "Ronda o Fase", 
@@ -199,19 +208,10 @@ def unificar_columnas(df, año, jugador):
         if columna not in df.columns:
             df[columna] = ""
     
-    # 6. Convertir columnas numéricas
-    columnas_numericas = [
-        "Minutos", "Goles", "Asistencias", "Penales marcados", 
-        "Penales intentados", "Tiros totales", "Tiros a puerta", 
-        "Tarjetas amarillas", "Tarjetas rojas", "Faltas cometidas", 
-        "Faltas recibidas", "Fuera de juego", "Centros", 
-        "Entradas ganadas", "Intercepciones", "Goles en propia", 
-        "Penales ganados", "Penales concedidos"
-    ]
-    
-    for col in columnas_numericas:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+    # 6. Convertir columnas numéricas a los tipos compactos del esquema
+    for col, tipo in TIPOS_COLUMNAS.items():
+        if col in df.columns and tipo.startswith('int'):
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(tipo)
     
     return df
 
@@ -295,18 +295,45 @@ def procesar_jugador(nombre_jugador):
         print(f"No se ha podido unificar ningún archivo para {nombre_jugador}.")
         return None
 
-def mostrar_resumen(df):
+def _unir_valores(serie):
+    """
+    Une los valores distintos (no vacíos) de una serie en un texto separado por comas.
+    """
+    valores = serie.dropna().astype(str).str.strip()
+    valores = valores[valores != '']
+    return ', '.join(valores.unique())
+
+def calcular_resumen(df):
+    """
+    Calcula el resumen por jugador con una sola agregación groupby.
+    Retorna un DataFrame con partidos, goles, equipos y competiciones por jugador,
+    en el mismo orden en que aparecen los jugadores en el DataFrame.
+    """
+    agregaciones = {'Partidos': ('Jugador', 'size')}
+    if 'Goles' in df.columns:
+        agregaciones['Goles'] = ('Goles', 'sum')
+    if 'Equipo' in df.columns:
+        agregaciones['Equipos'] = ('Equipo', _unir_valores)
+    if 'Competición' in df.columns:
+        agregaciones['Competiciones'] = ('Competición', _unir_valores)
+    
+    resumen = df.groupby('Jugador', sort=False).agg(**agregaciones).reset_index()
+    return resumen
+
+def mostrar_resumen(df, ruta_salida=None):
     """
     Muestra un resumen del DataFrame unificado.
+    Si se indica ruta_salida, el resumen por jugador también se guarda como CSV.
+    Retorna el DataFrame con el resumen por jugador.
     """
+    resumen = calcular_resumen(df)
+    
     print("\nResumen de los datos unificados:")
     print(f"Total de registros: {len(df)}")
     
     # Mostrar jugadores y partidos por jugador
-    jugadores = df['Jugador'].unique()
-    print(f"\nJugadores incluidos ({len(jugadores)}):")
-    for jugador in jugadores:
-        partidos = df[df['Jugador'] == jugador].shape[0]
+    print(f"\nJugadores incluidos ({len(resumen)}):")
+    for jugador, partidos in zip(resumen['Jugador'], resumen['Partidos']):
         print(f"- {jugador}: {partidos} partidos")
     
     # Mostrar equipos
@@ -315,25 +342,37 @@ def mostrar_resumen(df):
     for equipo in equipos:
         print(f"- {equipo}")
     
-    # Mostrar competiciones
+    # Mostrar competiciones (un solo conteo para todas)
     if 'Competición' in df.columns:
         competiciones = df['Competición'].unique()
+        partidos_por_competicion = df['Competición'].value_counts()
         print(f"\nCompeticiones incluidas ({len(competiciones)}):")
         for comp in competiciones:
             if pd.notna(comp) and comp != '':
-                partidos = df[df['Competición'] == comp].shape[0]
-                print(f"- {comp}: {partidos} partidos")
+                print(f"- {comp}: {partidos_por_competicion[comp]} partidos")
     
     # Mostrar estadísticas de goles
-    if 'Goles' in df.columns:
-        total_goles = df['Goles'].sum()
-        print(f"\nTotal de goles: {total_goles}")
-        for jugador in jugadores:
-            goles = df[df['Jugador'] == jugador]['Goles'].sum()
-            if goles > 0:
-                print(f"- {jugador}: {goles} goles")
+    if 'Goles' in resumen.columns:
+        print(f"\nTotal de goles: {resumen['Goles'].sum()}")
+        goleadores = resumen[resumen['Goles'] > 0]
+        for jugador, goles in zip(goleadores['Jugador'], goleadores['Goles']):
+            print(f"- {jugador}: {goles} goles")
+    
+    # Guardar el resumen si se solicitó
+    if ruta_salida:
+        resumen.to_csv(ruta_salida, index=False)
+        print(f"\nResumen por jugador guardado en: {ruta_salida}")
+    
+    return resumen
+
+def main(ruta_salida=None):
+    """
+    Unifica los archivos de los jugadores indicados por consola.
 
-def main():
+    Args:
+        ruta_salida: Ruta del CSV unificado; si es None se pide el nombre por consola
+                     y el archivo se guarda en data/
+    """
     print("=== UNIFICADOR DE ESTADÍSTICAS DE JUGADORES DE FÚTBOL ===")
     print("Este programa unifica archivos CSV de estadísticas de jugadores en un único archivo.")
     print("Los archivos deben tener el formato: YYYY_NombreJugador.csv")
@@ -387,21 +426,31 @@ def main():
             [col for col in columnas_ordenadas if col in df_unificado_final.columns]
         ]
         
-        # Guardar el dataframe unificado en la carpeta data
-        nombre_salida = input("\nIngrese el nombre para el archivo unificado (ej: datos_unificados.csv): ")
-        if not nombre_salida.lower().endswith('.csv'):
-            nombre_salida += '.csv'
+        # Guardar el dataframe unificado en la ruta indicada o en la carpeta data
+        if ruta_salida:
+            ruta_completa = ruta_salida
+            if os.path.dirname(ruta_completa):
+                os.makedirs(os.path.dirname(ruta_completa), exist_ok=True)
+        else:
+            nombre_salida = input("\nIngrese el nombre para el archivo unificado (ej: datos_unificados.csv): ")
+            if not nombre_salida.lower().endswith('.csv'):
+                nombre_salida += '.csv'
+            ruta_completa = os.path.join(directorio_data, nombre_salida)
         
-        ruta_completa = os.path.join(directorio_data, nombre_salida)
         df_unificado_final.to_csv(ruta_completa, index=False)
         print(f"\nArchivo unificado guardado como: {ruta_completa}")
         
-        # Mostrar un resumen de los datos
-        mostrar_resumen(df_unificado_final)
+        # Mostrar y guardar un resumen de los datos
+        ruta_resumen = os.path.splitext(ruta_completa)[0] + '_resumen.csv'
+        mostrar_resumen(df_unificado_final, ruta_resumen)
         
         print("\n¡Proceso completado con éxito!")
     else:
         print("No se ha podido unificar ningún archivo.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Unifica los archivos por temporada de los jugadores de FBref')
+    parser.add_argument('--salida', type=str, default=None,
+                        help='Ruta del CSV unificado (si no se indica, se pide el nombre por consola)')
+    args = parser.parse_args()
+    main(args.salida)
\ No newline at end of file
@@ -0,0 +1,340 @@
+"""
+Benchmark sin conexión de la extracción de datos de los scrapers.
+
+Carga páginas HTML reales guardadas de SofaScore (fixtures/sofascore/<categoria>_<pagina>.html)
+y de FBref (fixtures/fbref/*.html) y mide cada estrategia de extracción:
+
+- webdriver: extract_player_table / extract_matches_from_fbref (una llamada por celda)
+- js: extract_player_table_js / extract_matches_js (una sola llamada execute_script)
+- lxml: extract_player_table_html / extract_matches_from_html (sin navegador)
+
+además de process_matches_data y combine_data. Para guardar una página real basta con
+escribir driver.page_source en la carpeta correspondiente. Si una carpeta está vacía se
+usan páginas SINTÉTICAS con la misma estructura, generadas en una carpeta temporal que se
+borra al terminar; sus tiempos no representan las páginas reales y el informe indica qué
+páginas eran sintéticas. Las estrategias con navegador solo se ejecutan con --navegador
+(abren los archivos con file://).
+
+Los resultados se guardan por defecto en resultados_benchmark/ (ignorada por git).
+
+Uso:
+    python benchmark_extraccion.py
+    python benchmark_extraccion.py --navegador firefox --salida despues.json --comparar antes.json
+"""
+import argparse
+import contextlib
+import copy
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DIRECTORIO_SCRAPER = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(DIRECTORIO_SCRAPER, 'Fbref'))
+
+from sofascore_scraper import (extract_player_table, extract_player_table_js, extract_player_table_html,
+                               combine_data)
+from FbrefPlayers_scraper import (CAMPO_A_DATA_STAT, create_driver, extract_matches_from_fbref,
+                                  extract_matches_js, extract_matches_from_html, process_matches_data)
+from config import STAT_CATEGORIES, PLAYER_STATS
+from equipos import NOMBRES_EQUIPOS
+
+# Carpetas de páginas reales guardadas
+CARPETA_FIXTURES = os.path.join(DIRECTORIO_SCRAPER, "fixtures")
+CARPETA_SOFASCORE = os.path.join(CARPETA_FIXTURES, "sofascore")
+CARPETA_FBREF = os.path.join(CARPETA_FIXTURES, "fbref")
+
+# Carpeta de los JSON de resultados (ignorada por git)
+CARPETA_RESULTADOS = os.path.join(DIRECTORIO_SCRAPER, "resultados_benchmark")
+
+# Filas por página de la tabla de jugadores de SofaScore
+FILAS_POR_PAGINA = 20
+
+# Datos de jugador usados por process_matches_data para fechas sin año
+INFO_JUGADOR = {"nombre": "Benchmark", "año": 2024}
+
+def _tabla_sofascore(categoria, pagina, rng):
+    """HTML de una página de la tabla de jugadores con la estructura de SofaScore"""
+    estadisticas = [stat.replace('_', ' ').title() for stat in PLAYER_STATS[categoria]
+                    if stat not in ('name', 'team', 'position')]
+    encabezados = ''.join(f'<th>{texto}</th>' for texto in ['#', 'Team', 'Name'] + estadisticas)
+
+    filas = []
+    for i in range(FILAS_POR_PAGINA):
+        posicion = pagina * FILAS_POR_PAGINA + i + 1
+        equipo = NOMBRES_EQUIPOS[(posicion * 7) % len(NOMBRES_EQUIPOS)]
+        jugador = f"Jugador {posicion} Apellido"
+        valores = ''.join(f'<td>{valor}</td>' for valor in rng.integers(0, 40, len(estadisticas)))
+        filas.append(f'<tr><td>{posicion}</td><td title="{equipo}"><img alt="{equipo}"></td>'
+                     f'<td title="{jugador}"><a href="/player/{posicion}">{jugador}</a></td>{valores}</tr>')
+
+    return (f'<html><body><div class="statistics"><table><thead><tr>{encabezados}</tr></thead>'
+            f'<tbody>{"".join(filas)}</tbody></table></div></body></html>')
+
+def _tabla_fbref(partidos, rng):
+    """HTML de una página de partidos de un jugador con la estructura de FBref"""
+    filas = []
+    fecha = pd.Timestamp('2024-01-20')
+    for i in range(partidos):
+        fecha += pd.Timedelta(days=int(rng.integers(3, 10)))
+        celdas = [f'<th data-stat="date" csk="{fecha:%Y%m%d}"><a href="/en/matches/{fecha:%Y-%m-%d}">'
+                  f'{fecha:%Y-%m-%d}</a></th>']
+        for campo, data_stat in CAMPO_A_DATA_STAT.items():
+            if campo == "Date":
+                continue
+            if campo in ("Comp", "Round", "Venue", "Squad", "Opponent", "Pos", "Day"):
+                valor = f"{campo} {i % 5}"
+            elif campo == "Result":
+                valor = f"{'WDL'[i % 3]} {rng.integers(0, 4)}–{rng.integers(0, 4)}"
+            elif campo == "Start":
+                valor = "Y" if i % 2 else "N"
+            else:
+                valor = str(rng.integers(0, 3)) if i % 11 else ""
+            celdas.append(f'<td data-stat="{data_stat}">{valor}</td>')
+        filas.append(f'<tr>{"".join(celdas)}</tr>')
+        # FBref intercala filas de encabezado repetido
+        if i % 20 == 19:
+            filas.append('<tr class="thead"><th data-stat="date" csk="0">Date</th></tr>')
+
+    return (f'<html><body><table id="matchlogs_all"><tbody>{"".join(filas)}</tbody></table>'
+            f'</body></html>')
+
+def generar_paginas_sofascore(carpeta, paginas, semilla=42):
+    """Escribe páginas sintéticas de SofaScore en una carpeta (por ejemplo temporal)"""
+    rng = np.random.default_rng(semilla)
+    os.makedirs(carpeta, exist_ok=True)
+    for categoria in STAT_CATEGORIES:
+        for pagina in range(paginas):
+            with open(os.path.join(carpeta, f"{categoria}_{pagina + 1:02d}.html"), 'w', encoding='utf-8') as f:
+                f.write(_tabla_sofascore(categoria, pagina, rng))
+
+def generar_paginas_fbref(carpeta, paginas, partidos, semilla=42):
+    """Escribe páginas sintéticas de FBref en una carpeta (por ejemplo temporal)"""
+    rng = np.random.default_rng(semilla)
+    os.makedirs(carpeta, exist_ok=True)
+    for pagina in range(paginas):
+        with open(os.path.join(carpeta, f"jugador_{pagina + 1:02d}.html"), 'w', encoding='utf-8') as f:
+            f.write(_tabla_fbref(partidos, rng))
+
+def cargar_fixtures(carpeta):
+    """Devuelve {ruta: html} de las páginas guardadas en una carpeta, en orden"""
+    paginas = {}
+    for ruta in sorted(glob.glob(os.path.join(carpeta, "*.html"))):
+        with open(ruta, encoding='utf-8') as f:
+            paginas[ruta] = f.read()
+    return paginas
+
+def medir(funcion, repeticiones, preparar=None):
+    """
+    Mide una función: mejor tiempo de varias ejecuciones (con la salida por pantalla
+    descartada) y memoria pico de Python en una ejecución adicional con tracemalloc.
+
+    Args:
+        funcion: Función que recibe el valor de preparar() y devuelve el número de filas procesadas
+        repeticiones: Ejecuciones cronometradas
+        preparar: Función que crea la entrada de cada ejecución (fuera del tiempo medido)
+
+    Returns:
+        dict: filas, segundos, filas_por_segundo y memoria_pico_mb
+    """
+    preparar = preparar or (lambda: None)
+    tiempos = []
+    filas = 0
+    for _ in range(repeticiones):
+        entrada = preparar()
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            filas = funcion(entrada)
+            tiempos.append(time.perf_counter() - inicio)
+
+    entrada = preparar()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcion(entrada)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    segundos = min(tiempos)
+    return {
+        'filas': filas,
+        'segundos': round(segundos, 6),
+        'filas_por_segundo': round(filas / segundos, 1) if segundos > 0 else None,
+        'memoria_pico_mb': round(pico / 1024 ** 2, 3),
+    }
+
+def _en_navegador(driver, paginas, extraer):
+    """Abre cada página guardada en el navegador y aplica la extracción; devuelve las filas"""
+    filas = 0
+    for ruta in paginas:
+        driver.get(f"file://{os.path.abspath(ruta)}")
+        filas += len(extraer(driver))
+    return filas
+
+def medir_estrategias(paginas_sofascore, paginas_fbref, repeticiones, navegador=None):
+    """
+    Mide todas las estrategias de extracción y el procesamiento posterior.
+
+    Returns:
+        dict: Resultado de cada medición (o el motivo por el que se omitió)
+    """
+    resultados = {}
+    sofascore = list(paginas_sofascore.values())
+    fbref = list(paginas_fbref.values())
+
+    resultados['sofascore.lxml'] = medir(
+        lambda _: sum(len(extract_player_table_html(html)) for html in sofascore), repeticiones)
+    resultados['fbref.lxml'] = medir(
+        lambda _: sum(len(extract_matches_from_html(html)) for html in fbref), repeticiones)
+
+    # Estrategias que necesitan un navegador real
+    estrategias_navegador = {
+        'sofascore.webdriver': (paginas_sofascore, extract_player_table),
+        'sofascore.js': (paginas_sofascore, extract_player_table_js),
+        'sofascore.lxml_page_source': (paginas_sofascore, lambda d: extract_player_table_html(d.page_source)),
+        'fbref.webdriver': (paginas_fbref, extract_matches_from_fbref),
+        'fbref.js': (paginas_fbref, extract_matches_js),
+        'fbref.lxml_page_source': (paginas_fbref, lambda d: extract_matches_from_html(d.page_source)),
+    }
+    driver = None
+    motivo = "sin --navegador"
+    if navegador:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                driver = create_driver(navegador, visible=False)
+        except Exception as e:
+            motivo = f"no se pudo iniciar {navegador}: {e.__class__.__name__}"
+
+    try:
+        for nombre, (paginas, extraer) in estrategias_navegador.items():
+            if driver is None:
+                resultados[nombre] = {'omitido': motivo}
+            else:
+                # La carga de las páginas entra en el tiempo, igual para las tres estrategias
+                resultados[nombre] = medir(lambda _, p=paginas, e=extraer: _en_navegador(driver, p, e), repeticiones)
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    # Procesamiento posterior sobre los datos extraídos con lxml
+    with contextlib.redirect_stdout(io.StringIO()):
+        partidos = [extract_matches_from_html(html) for html in fbref]
+        por_categoria = {}
+        for ruta, html in paginas_sofascore.items():
+            categoria = os.path.basename(ruta).rsplit('_', 1)[0]
+            por_categoria.setdefault(categoria, []).extend(extract_player_table_html(html))
+    all_data = {categoria: pd.DataFrame(filas) for categoria, filas in por_categoria.items()}
+
+    # process_matches_data modifica la lista, así que cada ejecución recibe una copia
+    resultados['fbref.process_matches_data'] = medir(
+        lambda copia: sum(len(process_matches_data(lista, INFO_JUGADOR)) for lista in copia),
+        repeticiones, preparar=lambda: copy.deepcopy(partidos))
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        salida = os.path.join(carpeta, "combinado.csv")
+        resultados['sofascore.combine_data'] = medir(
+            lambda _: sum(len(df) for df in all_data.values()) if combine_data(all_data, salida) is not None else 0,
+            repeticiones)
+
+    return resultados
+
+def commit_actual():
+    """Commit de git del árbol medido (None si no se puede obtener)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=DIRECTORIO_SCRAPER,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def comparar(resultados, ruta_previo):
+    """Imprime la razón de tiempos y memoria frente a un JSON de una ejecución anterior"""
+    with open(ruta_previo, encoding='utf-8') as f:
+        previo = json.load(f)
+    print(f"\nComparación con {ruta_previo} (commit {previo.get('commit')}):")
+    for nombre, actual in resultados.items():
+        anterior = previo['resultados'].get(nombre, {})
+        if 'segundos' not in actual or 'segundos' not in anterior:
+            continue
+        razon_tiempo = anterior['segundos'] / actual['segundos'] if actual['segundos'] else float('nan')
+        razon_memoria = actual['memoria_pico_mb'] / anterior['memoria_pico_mb'] if anterior['memoria_pico_mb'] else float('nan')
+        print(f"  {nombre:<30} {razon_tiempo:6.2f}x más rápido   memoria {razon_memoria:5.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sin conexión de la extracción de los scrapers')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Ejecuciones cronometradas por medición')
+    parser.add_argument('--navegador', type=str, default=None,
+                        help='Navegador para las estrategias webdriver y js (firefox, chrome)')
+    parser.add_argument('--paginas-sofascore', type=int, default=30,
+                        help='Páginas sintéticas por categoría si no hay fixtures de SofaScore')
+    parser.add_argument('--paginas-fbref', type=int, default=20,
+                        help='Páginas sintéticas si no hay fixtures de FBref')
+    parser.add_argument('--partidos', type=int, default=60, help='Partidos por página sintética de FBref')
+    parser.add_argument('--salida', type=str, default=os.path.join(CARPETA_RESULTADOS, "benchmark_extraccion.json"),
+                        help='Archivo JSON de resultados')
+    parser.add_argument('--comparar', type=str, default=None, help='JSON de una ejecución anterior')
+    args = parser.parse_args()
+
+    paginas_sofascore = cargar_fixtures(CARPETA_SOFASCORE)
+    paginas_fbref = cargar_fixtures(CARPETA_FBREF)
+
+    # Las páginas sintéticas solo existen durante la ejecución
+    with tempfile.TemporaryDirectory() as carpeta_temporal:
+        sinteticas = []
+        if not paginas_sofascore:
+            carpeta = os.path.join(carpeta_temporal, "sofascore")
+            generar_paginas_sofascore(carpeta, args.paginas_sofascore)
+            paginas_sofascore = cargar_fixtures(carpeta)
+            sinteticas.append('sofascore')
+        if not paginas_fbref:
+            carpeta = os.path.join(carpeta_temporal, "fbref")
+            generar_paginas_fbref(carpeta, args.paginas_fbref, args.partidos)
+            paginas_fbref = cargar_fixtures(carpeta)
+            sinteticas.append('fbref')
+
+        print(f"Páginas: {len(paginas_sofascore)} de SofaScore, {len(paginas_fbref)} de FBref")
+        if sinteticas:
+            print(f"⚠️ Sin páginas guardadas en {CARPETA_FIXTURES} para {', '.join(sinteticas)}: "
+                  f"se usan páginas SINTÉTICAS, los tiempos no representan las páginas reales")
+
+        resultados = medir_estrategias(paginas_sofascore, paginas_fbref, args.repeticiones, args.navegador)
+
+    for nombre, resultado in resultados.items():
+        if 'omitido' in resultado:
+            print(f"  {nombre:<30} omitido ({resultado['omitido']})")
+        else:
+            print(f"  {nombre:<30} {resultado['filas']:>7} filas  {resultado['segundos']:9.4f} s  "
+                  f"{resultado['filas_por_segundo']:>12,.0f} filas/s  {resultado['memoria_pico_mb']:8.2f} MB")
+
+    informe = {
+        'commit': commit_actual(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'parametros': {'repeticiones': args.repeticiones, 'navegador': args.navegador,
+                       'paginas_sofascore': len(paginas_sofascore), 'paginas_fbref': len(paginas_fbref),
+                       'paginas_sinteticas': sinteticas},
+        'resultados': resultados,
+    }
+    carpeta_salida = os.path.dirname(args.salida)
+    if carpeta_salida:
+        os.makedirs(carpeta_salida, exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"✓ Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        comparar(resultados, args.comparar)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+Cola persistente de trabajos de scraping en SQLite con varios procesos trabajadores.
+
+Cada trabajo es una categoría de un torneo de SofaScore en un modo de acumulación,
+la combinación de las categorías de un torneo y modo, o una temporada de un jugador
+o portero de FBref. Los trabajadores (procesos independientes, cada uno con su
+navegador) reclaman los trabajos de forma atómica; los que fallan se reintentan con
+espera exponencial. El estado vive en la base de datos, así que un lote se puede
+interrumpir y reanudar más tarde (también tras reiniciar el equipo).
+
+Uso:
+    python cola_scraping.py --torneo apertura:70681 --torneo clausura:63819
+    python cola_scraping.py --fbref-jugadores urls_jugadores.txt
+    python cola_scraping.py --procesos 3              # vacía la cola con 3 trabajadores
+    python cola_scraping.py --estado
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sqlite3
+import sys
+import time
+import traceback
+
+import pandas as pd
+
+import sofascore_scraper
+from config import BASE_URL, STAT_CATEGORIES, DATA_FOLDER, INDIVIDUAL_STATS_FILES, PLAYER_DATA_FILE, QUALITY_GATE
+from calidad_datos import validar, exigir_calidad, imprimir_reporte
+
+# Scrapers de FBref (carpeta Fbref)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Fbref'))
+import FbrefPlayers_scraper
+import FbrefGoalkeeper_scraper
+
+# Base de datos de la cola
+RUTA_COLA = os.path.join(DATA_FOLDER, "cola_scraping.db")
+
+# Intentos por trabajo y espera antes de cada reintento: ESPERA_BASE * 2^(intento - 1)
+# segundos, con un máximo de ESPERA_MAXIMA
+MAX_INTENTOS = 4
+ESPERA_BASE = 60
+ESPERA_MAXIMA = 3600
+
+# Tiempo máximo que un trabajador retiene un trabajo. Pasado este tiempo (trabajador
+# caído o equipo reiniciado) otro trabajador puede reclamarlo
+TIEMPO_MAXIMO_TRABAJO = 1800
+
+# Espera máxima de un trabajador sin trabajos disponibles antes de volver a consultar
+ESPERA_SIN_TRABAJOS = 30
+
+# Modos de acumulación de SofaScore y URL de cada tipo de torneo (ver main.py)
+MODOS_ACUMULACION = ["All", "Per 90 mins"]
+URLS_TORNEOS = {
+    "apertura": f"{BASE_URL}/tournament/football/colombia/primera-a-apertura/11539",
+    "clausura": f"{BASE_URL}/tournament/football/colombia/primera-a-clausura/11536",
+}
+
+# Tipos de trabajo
+TIPO_CATEGORIA = "sofascore_categoria"
+TIPO_COMBINACION = "sofascore_combinacion"
+TIPO_FBREF_JUGADOR = "fbref_jugador"
+TIPO_FBREF_PORTERO = "fbref_portero"
+
+ESQUEMA_COLA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    clave TEXT NOT NULL UNIQUE,
+    grupo TEXT,
+    parametros TEXT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    max_intentos INTEGER NOT NULL,
+    disponible_desde REAL NOT NULL,
+    bloqueado_hasta REAL,
+    trabajador TEXT,
+    creado REAL NOT NULL,
+    iniciado REAL,
+    terminado REAL,
+    segundos REAL,
+    ultimo_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON trabajos (estado, disponible_desde);
+CREATE INDEX IF NOT EXISTS idx_trabajos_grupo ON trabajos (grupo, tipo, estado);
+"""
+
+def abrir_cola(ruta=RUTA_COLA):
+    """
+    Abre (o crea) la base de datos de la cola. La conexión trabaja en modo
+    autocommit y las operaciones que deben ser atómicas abren su propia transacción.
+    """
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    conexion = sqlite3.connect(ruta, timeout=60, isolation_level=None)
+    conexion.row_factory = sqlite3.Row
+    # WAL permite que los trabajadores lean mientras otro escribe
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA busy_timeout=60000")
+    conexion.executescript(ESQUEMA_COLA)
+    return conexion
+
+def encolar(conexion, tipo, parametros, clave, grupo=None, max_intentos=MAX_INTENTOS):
+    """
+    Añade un trabajo si no existe otro con la misma clave.
+
+    Returns:
+        bool: True si se añadió, False si ya estaba en la cola
+    """
+    ahora = time.time()
+    cursor = conexion.execute(
+        "INSERT OR IGNORE INTO trabajos (tipo, clave, grupo, parametros, max_intentos, disponible_desde, creado) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (tipo, clave, grupo, json.dumps(parametros, ensure_ascii=False), max_intentos, ahora, ahora))
+    return cursor.rowcount == 1
+
+def encolar_torneo(conexion, tipo_torneo, id_torneo, modos=MODOS_ACUMULACION, categorias=STAT_CATEGORIES):
+    """
+    Encola una categoría por modo de acumulación y la combinación de cada modo, que
+    solo se reclama cuando todas las categorías del modo terminaron.
+
+    Returns:
+        int: Número de trabajos nuevos
+    """
+    tipo_torneo = tipo_torneo.lower()
+    if tipo_torneo not in URLS_TORNEOS:
+        raise ValueError(f"Tipo de torneo desconocido: {tipo_torneo}. Disponibles: {list(URLS_TORNEOS)}")
+
+    nuevos = 0
+    carpeta_torneo = f"{tipo_torneo}_{id_torneo}"
+    for modo in modos:
+        grupo = f"{carpeta_torneo}/{modo.replace(' ', '_').lower()}"
+        base = {'tipo_torneo': tipo_torneo, 'id_torneo': str(id_torneo), 'url': URLS_TORNEOS[tipo_torneo],
+                'modo': modo, 'carpeta': grupo}
+        for categoria in categorias:
+            nuevos += encolar(conexion, TIPO_CATEGORIA, {**base, 'categoria': categoria},
+                              clave=f"{TIPO_CATEGORIA}:{grupo}/{categoria}", grupo=grupo)
+        nuevos += encolar(conexion, TIPO_COMBINACION, {**base, 'categorias': list(categorias)},
+                          clave=f"{TIPO_COMBINACION}:{grupo}", grupo=grupo)
+    return nuevos
+
+def encolar_fbref(conexion, urls, porteros=False):
+    """
+    Encola una temporada de FBref por URL (páginas matchlogs/<año>/ de cada jugador).
+
+    Returns:
+        int: Número de trabajos nuevos
+    """
+    tipo = TIPO_FBREF_PORTERO if porteros else TIPO_FBREF_JUGADOR
+    return sum(encolar(conexion, tipo, {'url': url}, clave=f"{tipo}:{url}") for url in urls)
+
+def _cerrar_agotados(conexion, ahora):
+    """
+    Marca como fallidos los trabajos sin intentos restantes cuyo trabajador no terminó
+    (retención vencida o liberados con reanudar) y las combinaciones de los grupos con
+    alguna categoría fallida, que ya no se podrían reclamar nunca.
+    """
+    conexion.execute(
+        "UPDATE trabajos SET estado = 'fallido', bloqueado_hasta = NULL, terminado = :ahora, "
+        "ultimo_error = COALESCE(ultimo_error, 'El trabajador no terminó el último intento') "
+        "WHERE intentos >= max_intentos AND (estado = 'pendiente' OR (estado = 'en_curso' AND bloqueado_hasta < :ahora))",
+        {'ahora': ahora})
+    conexion.execute(
+        """
+        UPDATE trabajos SET estado = 'fallido', terminado = :ahora,
+            ultimo_error = 'Falló una categoría del grupo; la combinación no se puede hacer'
+        WHERE tipo = :combinacion AND estado = 'pendiente' AND EXISTS (
+            SELECT 1 FROM trabajos AS c
+            WHERE c.grupo = trabajos.grupo AND c.tipo = :categoria AND c.estado = 'fallido')
+        """,
+        {'ahora': ahora, 'combinacion': TIPO_COMBINACION, 'categoria': TIPO_CATEGORIA})
+
+def reclamar(conexion, trabajador, ahora=None):
+    """
+    Reclama de forma atómica el siguiente trabajo disponible con intentos restantes:
+    pendiente y fuera de su espera, o en curso con el tiempo de retención vencido.
+    Las combinaciones solo están disponibles cuando todas las categorías de su grupo
+    están completadas.
+
+    Returns:
+        dict: Trabajo reclamado (con 'parametros' decodificados) o None si no hay
+    """
+    ahora = time.time() if ahora is None else ahora
+    # BEGIN IMMEDIATE toma el bloqueo de escritura antes de leer: dos trabajadores
+    # no pueden elegir el mismo trabajo
+    conexion.execute("BEGIN IMMEDIATE")
+    try:
+        _cerrar_agotados(conexion, ahora)
+        fila = conexion.execute(
+            """
+            SELECT * FROM trabajos AS t
+            WHERE ((t.estado = 'pendiente' AND t.disponible_desde <= :ahora)
+                   OR (t.estado = 'en_curso' AND t.bloqueado_hasta < :ahora))
+              AND t.intentos < t.max_intentos
+              AND NOT (t.tipo = :combinacion AND EXISTS (
+                  SELECT 1 FROM trabajos AS c
+                  WHERE c.grupo = t.grupo AND c.tipo = :categoria AND c.estado != 'completado'))
+            ORDER BY t.disponible_desde, t.id
+            LIMIT 1
+            """,
+            {'ahora': ahora, 'combinacion': TIPO_COMBINACION, 'categoria': TIPO_CATEGORIA}).fetchone()
+        if fila is None:
+            conexion.execute("COMMIT")
+            return None
+        conexion.execute(
+            "UPDATE trabajos SET estado = 'en_curso', intentos = intentos + 1, trabajador = ?, "
+            "iniciado = ?, bloqueado_hasta = ? WHERE id = ?",
+            (trabajador, ahora, ahora + TIEMPO_MAXIMO_TRABAJO, fila['id']))
+        conexion.execute("COMMIT")
+    except Exception:
+        conexion.execute("ROLLBACK")
+        raise
+
+    trabajo = dict(fila)
+    trabajo['intentos'] += 1
+    trabajo['parametros'] = json.loads(trabajo['parametros'])
+    return trabajo
+
+def completar(conexion, trabajo, segundos):
+    conexion.execute(
+        "UPDATE trabajos SET estado = 'completado', terminado = ?, segundos = ?, bloqueado_hasta = NULL, "
+        "ultimo_error = NULL WHERE id = ?",
+        (time.time(), segundos, trabajo['id']))
+
+def espera_reintento(intentos):
+    """Segundos antes del siguiente intento (exponencial con una variación de hasta el 10%)"""
+    espera = min(ESPERA_MAXIMA, ESPERA_BASE * 2 ** (intentos - 1))
+    return espera * (1 + random.uniform(0, 0.1))
+
+def fallar(conexion, trabajo, error, segundos):
+    """
+    Registra un intento fallido: el trabajo vuelve a estar pendiente tras la espera
+    de reintento o queda 'fallido' si agotó sus intentos.
+
+    Returns:
+        str: Nuevo estado del trabajo
+    """
+    ahora = time.time()
+    agotado = trabajo['intentos'] >= trabajo['max_intentos']
+    estado = 'fallido' if agotado else 'pendiente'
+    conexion.execute(
+        "UPDATE trabajos SET estado = ?, disponible_desde = ?, bloqueado_hasta = NULL, terminado = ?, "
+        "segundos = ?, ultimo_error = ? WHERE id = ?",
+        (estado, ahora if agotado else ahora + espera_reintento(trabajo['intentos']), ahora, segundos,
+         str(error)[:2000], trabajo['id']))
+    if agotado:
+        _cerrar_agotados(conexion, ahora)
+    return estado
+
+def reanudar(conexion):
+    """
+    Devuelve a pendientes los trabajos en curso (después de un reinicio, cuando se
+    sabe que no hay trabajadores activos y no se quiere esperar a que venza su
+    tiempo de retención).
+
+    Returns:
+        int: Número de trabajos liberados
+    """
+    return conexion.execute(
+        "UPDATE trabajos SET estado = 'pendiente', bloqueado_hasta = NULL, disponible_desde = ? "
+        "WHERE estado = 'en_curso'", (time.time(),)).rowcount
+
+def reintentar_fallidos(conexion):
+    """Vuelve a poner en la cola los trabajos fallidos con sus intentos a cero"""
+    return conexion.execute(
+        "UPDATE trabajos SET estado = 'pendiente', intentos = 0, disponible_desde = ? "
+        "WHERE estado = 'fallido'", (time.time(),)).rowcount
+
+def resumen_cola(conexion):
+    """Trabajos por tipo y estado, con el tiempo medio de los completados"""
+    return pd.read_sql_query(
+        "SELECT tipo, estado, COUNT(*) AS trabajos, SUM(intentos) AS intentos, "
+        "ROUND(AVG(segundos), 1) AS segundos_medios FROM trabajos GROUP BY tipo, estado ORDER BY tipo, estado",
+        conexion)
+
+def trabajos_activos(conexion):
+    """
+    Trabajos pendientes o en curso que todavía se pueden terminar y la próxima hora
+    en la que habrá uno disponible. No cuenta las combinaciones de grupos con alguna
+    categoría fallida.
+    """
+    fila = conexion.execute(
+        """
+        SELECT COUNT(*), MIN(CASE WHEN t.estado = 'pendiente' THEN t.disponible_desde ELSE t.bloqueado_hasta END)
+        FROM trabajos AS t
+        WHERE t.estado IN ('pendiente', 'en_curso')
+          AND NOT (t.tipo = :combinacion AND EXISTS (
+              SELECT 1 FROM trabajos AS c
+              WHERE c.grupo = t.grupo AND c.tipo = :categoria AND c.estado = 'fallido'))
+        """,
+        {'combinacion': TIPO_COMBINACION, 'categoria': TIPO_CATEGORIA}).fetchone()
+    return fila[0], fila[1]
+
+def _carpeta_modo(parametros):
+    return os.path.join(DATA_FOLDER, *parametros['carpeta'].split('/'))
+
+def ejecutar_categoria(driver, parametros):
+    """Extrae una categoría de un torneo en un modo de acumulación y guarda su CSV"""
+    # El scraper de SofaScore lee el torneo de variables globales (ver sofascore_scraper.main)
+    sofascore_scraper.TOURNAMENT_URL = parametros['url']
+    sofascore_scraper.TOURNAMENT_ID = parametros['id_torneo']
+    if not sofascore_scraper.navigate_to_tournament_page(driver):
+        raise RuntimeError(f"No se pudo abrir el torneo {parametros['url']}")
+    sofascore_scraper.find_player_statistics_section(driver)
+
+    modo = parametros['modo']
+    if modo != MODOS_ACUMULACION[0] and not sofascore_scraper.select_accumulation_mode(driver, modo):
+        raise RuntimeError(f"No se pudo seleccionar el modo '{modo}'")
+
+    page_counts = []
+    datos = sofascore_scraper.scrape_category_data(driver, parametros['categoria'], page_counts=page_counts)
+    if not datos:
+        raise RuntimeError(f"No se extrajeron datos de la categoría {parametros['categoria']}")
+
+    df = pd.DataFrame(datos)
+    reporte = validar(df, "sofascore", nombre=f"{parametros['carpeta']}/{parametros['categoria']}",
+                      filas_por_pagina=page_counts)
+    imprimir_reporte(reporte)
+    if QUALITY_GATE:
+        exigir_calidad(reporte)
+
+    carpeta = _carpeta_modo(parametros)
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, INDIVIDUAL_STATS_FILES[parametros['categoria']])
+    df.to_csv(ruta, index=False)
+    print(f"Datos guardados en {ruta}")
+
+def ejecutar_combinacion(parametros):
+    """Combina los CSV de las categorías de un torneo y modo (no usa el navegador)"""
+    carpeta = _carpeta_modo(parametros)
+    all_data = {}
+    for categoria in parametros['categorias']:
+        ruta = os.path.join(carpeta, INDIVIDUAL_STATS_FILES[categoria])
+        if os.path.exists(ruta):
+            all_data[categoria] = pd.read_csv(ruta)
+
+    ruta_combinado = os.path.join(carpeta, PLAYER_DATA_FILE)
+    combined_df = sofascore_scraper.combine_data(all_data, ruta_combinado)
+    if combined_df is None or combined_df.empty:
+        raise RuntimeError(f"No hay datos para combinar en {carpeta}")
+
+    reporte = validar(combined_df, "sofascore", nombre=f"{parametros['carpeta']}/combinado")
+    imprimir_reporte(reporte)
+    if QUALITY_GATE and not reporte['valido']:
+        os.replace(ruta_combinado, ruta_combinado + ".rechazado")
+        exigir_calidad(reporte)
+
+def ejecutar_fbref(driver, parametros, porteros=False):
+    scraper = FbrefGoalkeeper_scraper if porteros else FbrefPlayers_scraper
+    if not scraper.scrape_fbref(parametros['url'], driver=driver):
+        raise RuntimeError(f"No se pudieron extraer los partidos de {parametros['url']}")
+
+def trabajar(ruta_cola=RUTA_COLA, nombre=None, visible=False, max_trabajos=None):
+    """
+    Bucle de un trabajador: reclama y ejecuta trabajos hasta que no quedan pendientes
+    ni en curso. El navegador se abre con el primer trabajo que lo necesita, se
+    reutiliza entre trabajos y se reinicia después de un fallo.
+
+    Args:
+        ruta_cola: Base de datos de la cola
+        nombre: Identificador del trabajador (por defecto equipo y PID)
+        visible: Si es True el navegador no se ejecuta en modo headless
+        max_trabajos: Número máximo de trabajos a procesar (None para vaciar la cola)
+
+    Returns:
+        dict: Trabajos completados y fallidos por este trabajador
+    """
+    nombre = nombre or f"{socket.gethostname()}:{os.getpid()}"
+    conexion = abrir_cola(ruta_cola)
+    driver = None
+    totales = {'completados': 0, 'fallidos': 0}
+
+    try:
+        while max_trabajos is None or totales['completados'] + totales['fallidos'] < max_trabajos:
+            trabajo = reclamar(conexion, nombre)
+            if trabajo is None:
+                activos, proximo = trabajos_activos(conexion)
+                if activos == 0:
+                    break
+                # Trabajos en espera de reintento o en manos de otros trabajadores
+                time.sleep(min(ESPERA_SIN_TRABAJOS, max(1.0, (proximo or 0) - time.time())))
+                continue
+
+            print(f"[{nombre}] Trabajo {trabajo['id']} ({trabajo['clave']}), intento {trabajo['intentos']}")
+            inicio = time.time()
+            try:
+                if trabajo['tipo'] == TIPO_COMBINACION:
+                    ejecutar_combinacion(trabajo['parametros'])
+                else:
+                    if driver is None:
+                        driver = sofascore_scraper.create_firefox_driver(visible=visible)
+                        driver.set_page_load_timeout(60)
+                    if trabajo['tipo'] == TIPO_CATEGORIA:
+                        ejecutar_categoria(driver, trabajo['parametros'])
+                    else:
+                        ejecutar_fbref(driver, trabajo['parametros'], porteros=trabajo['tipo'] == TIPO_FBREF_PORTERO)
+                completar(conexion, trabajo, time.time() - inicio)
+                totales['completados'] += 1
+                print(f"[{nombre}] ✓ Trabajo {trabajo['id']} completado en {time.time() - inicio:.1f} s")
+            except Exception as e:
+                print(traceback.format_exc())
+                estado = fallar(conexion, trabajo, e, time.time() - inicio)
+                totales['fallidos'] += 1
+                print(f"[{nombre}] ✗ Trabajo {trabajo['id']} falló ({e}); estado: {estado}")
+                # Un navegador en mal estado suele ser la causa: se abre uno nuevo
+                if driver is not None:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+    finally:
+        if driver is not None:
+            driver.quit()
+        conexion.close()
+
+    print(f"[{nombre}] Sin trabajos pendientes: {totales['completados']} completados, {totales['fallidos']} fallidos")
+    return totales
+
+def lanzar_trabajadores(procesos, ruta_cola=RUTA_COLA, visible=False):
+    """Ejecuta varios trabajadores en procesos independientes y espera a que terminen"""
+    trabajadores = [
+        multiprocessing.Process(target=trabajar, args=(ruta_cola, f"{socket.gethostname()}:trabajador_{i + 1}", visible))
+        for i in range(procesos)
+    ]
+    for proceso in trabajadores:
+        proceso.start()
+    for proceso in trabajadores:
+        proceso.join()
+
+def _leer_urls(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return [linea.strip() for linea in f if linea.strip() and not linea.startswith('#')]
+
+def main():
+    parser = argparse.ArgumentParser(description='Cola persistente de trabajos de scraping')
+    parser.add_argument('--cola', type=str, default=RUTA_COLA, help='Base de datos de la cola')
+    parser.add_argument('--torneo', action='append', default=[],
+                        help='Torneo de SofaScore a encolar como tipo:id (por ejemplo apertura:70681)')
+    parser.add_argument('--modos', nargs='+', default=MODOS_ACUMULACION, help='Modos de acumulación')
+    parser.add_argument('--categorias', nargs='+', default=STAT_CATEGORIES, help='Categorías de estadísticas')
+    parser.add_argument('--fbref-jugadores', type=str, default=None,
+                        help='Archivo con una URL de FBref (matchlogs de una temporada) por línea')
+    parser.add_argument('--fbref-porteros', type=str, default=None,
+                        help='Archivo con una URL de FBref de porteros por línea')
+    parser.add_argument('--procesos', type=int, default=0, help='Trabajadores a lanzar (0 solo encola)')
+    parser.add_argument('--visible', action='store_true', help='Navegadores visibles (no headless)')
+    parser.add_argument('--reanudar', action='store_true',
+                        help='Liberar los trabajos que quedaron en curso (tras un reinicio)')
+    parser.add_argument('--reintentar-fallidos', action='store_true',
+                        help='Volver a encolar los trabajos fallidos')
+    parser.add_argument('--estado', action='store_true', help='Mostrar el resumen de la cola')
+    args = parser.parse_args()
+
+    conexion = abrir_cola(args.cola)
+    try:
+        for torneo in args.torneo:
+            tipo_torneo, _, id_torneo = torneo.partition(':')
+            if not id_torneo:
+                raise ValueError(f"Formato de torneo inválido: {torneo} (se espera tipo:id)")
+            print(f"✓ {torneo}: {encolar_torneo(conexion, tipo_torneo, id_torneo, args.modos, args.categorias)} "
+                  f"trabajos nuevos")
+        if args.fbref_jugadores:
+            print(f"✓ FBref jugadores: {encolar_fbref(conexion, _leer_urls(args.fbref_jugadores))} trabajos nuevos")
+        if args.fbref_porteros:
+            print(f"✓ FBref porteros: {encolar_fbref(conexion, _leer_urls(args.fbref_porteros), porteros=True)} "
+                  f"trabajos nuevos")
+        if args.reanudar:
+            print(f"✓ {reanudar(conexion)} trabajos en curso devueltos a pendientes")
+        if args.reintentar_fallidos:
+            print(f"✓ {reintentar_fallidos(conexion)} trabajos fallidos devueltos a la cola")
+    finally:
+        conexion.close()
+
+    if args.procesos > 0:
+        lanzar_trabajadores(args.procesos, args.cola, args.visible)
+
+    if args.estado or args.procesos > 0:
+        conexion = abrir_cola(args.cola)
+        try:
+            print(resumen_cola(conexion).to_string(index=False))
+        finally:
+            conexion.close()
+
+if __name__ == "__main__":
+    main()
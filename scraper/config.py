@@ -3,9 +3,12 @@ Configuración para el web scraper de SofaScore - Jugadores de la Liga Colombian
 Incluye todas las categorías de estadísticas disponibles en el sitio
 """
 
-# URLs base
-BASE_URL = "https://www.sofascore.com"
-TOURNAMENT_URL = "https://www.sofascore.com/tournament/football/colombia/primera-a-apertura/11539"
+import os
+
+# URLs base. SOFASCORE_BASE_URL permite apuntar el scraper al emulador local
+# (emulador_sitio.py), por ejemplo http://127.0.0.1:8765
+BASE_URL = os.environ.get("SOFASCORE_BASE_URL", "https://www.sofascore.com").rstrip("/")
+TOURNAMENT_URL = f"{BASE_URL}/tournament/football/colombia/primera-a-apertura/11539"
 TOURNAMENT_ID = "70681"  # ID de la temporada actual
 
 # Pestañas de estadísticas disponibles
@@ -87,6 +90,28 @@ PLAYER_STATS = {
     ]
 }
 
+# Estrategia de extracción de la tabla de jugadores: "webdriver" (una llamada por celda),
+# "js" (una sola llamada execute_script) o "lxml" (análisis del HTML de la página).
+# benchmark_extraccion.py mide las tres sobre páginas guardadas
+EXTRACTION_STRATEGY = "webdriver"
+
+# Número máximo de páginas de la tabla por categoría (20 jugadores por página)
+MAX_PAGES = int(os.environ.get("SCRAPER_MAX_PAGES", 30))
+
+# Factor aplicado a las esperas fijas del scraper. Con el emulador local se pueden
+# usar valores pequeños (SCRAPER_WAIT_FACTOR=0.05) para pruebas de carga
+WAIT_FACTOR = float(os.environ.get("SCRAPER_WAIT_FACTOR", 1.0))
+
+# Si es True, el cambio al modo 'Per 90 mins' se hace desde el scraper en lugar de
+# pedírselo al usuario (si no se encuentra el desplegable se pregunta igualmente)
+AUTO_SELECT_ACCUMULATION = os.environ.get("SCRAPER_AUTO_ACCUMULATION", "0") == "1"
+
+# Comprobaciones de calidad tras cada extracción (calidad_datos.py). Si es True, un
+# modo con datos que no las superan se detiene y el archivo combinado se renombra
+# a .rechazado para que no llegue a la unificación; el informe se guarda siempre
+QUALITY_GATE = os.environ.get("SCRAPER_QUALITY_GATE", "1") == "1"
+QUALITY_REPORT_FILE = "calidad_datos.json"
+
 # Cantidad de reintentos para solicitudes fallidas
 MAX_RETRIES = 3
 
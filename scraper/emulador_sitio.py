@@ -0,0 +1,369 @@
+"""
+Emulador local de SofaScore y FBref para ejecutar los scrapers completos sin red.
+
+Sirve una página de torneo parecida a la de SofaScore (banner de cookies, pestañas
+de estadísticas, desplegable All / Per 90 mins y tabla paginada de 20 jugadores que
+se carga desde /api/jugadores con latencia configurable) y páginas de partidos de
+jugadores con la estructura de FBref. Los datos son sintéticos y deterministas.
+
+Uso (prueba de carga con 5.000 jugadores):
+    python emulador_sitio.py --jugadores 5000 --latencia 0.2
+    SOFASCORE_BASE_URL=http://127.0.0.1:8765 SCRAPER_WAIT_FACTOR=0.1 SCRAPER_MAX_PAGES=300 \\
+        SCRAPER_AUTO_ACCUMULATION=1 python main.py
+    FBREF_BASE_URL=http://127.0.0.1:8765 python Fbref/FbrefPlayers_scraper.py \\
+        --url http://127.0.0.1:8765/en/players/00000001/matchlogs/2024/Nombre-1-Apellido-Match-Logs
+
+La lista de URLs de jugadores de FBref está en http://127.0.0.1:8765/en/players/.
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+DIRECTORIO_SCRAPER = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(DIRECTORIO_SCRAPER, 'Fbref'))
+sys.path.append(os.path.join(DIRECTORIO_SCRAPER, '..', 'Procesamiento de datos'))
+
+from config import STAT_CATEGORIES, PLAYER_STATS
+from equipos import NOMBRES_EQUIPOS
+from FbrefPlayers_scraper import CAMPO_A_DATA_STAT as CAMPOS_JUGADOR
+from FbrefGoalkeeper_scraper import CAMPO_A_DATA_STAT as CAMPOS_PORTERO
+
+# Servidor local por defecto
+HOST = "127.0.0.1"
+PUERTO = 8765
+
+# Filas por página de la tabla de jugadores (igual que SofaScore)
+FILAS_POR_PAGINA = 20
+
+# Modos de acumulación del desplegable
+MODOS_ACUMULACION = ["All", "Per 90 mins"]
+
+# Proporción de porteros entre los jugadores sintéticos
+PROPORCION_PORTEROS = 0.1
+
+# Estadísticas que no son conteos: se generan en su escala (la valoración de SofaScore
+# va de 0 a 10) y no se dividen por los minutos en el modo 'Per 90 mins'
+ESTADISTICAS_PROMEDIO = {'average_sofascore_rating'}
+RANGO_VALORACION = (5.5, 8.5)
+
+# Página del torneo: la tabla se pide a /api/jugadores al cambiar de pestaña, de modo
+# o de página y mientras carga no existe ningún elemento <table>
+PAGINA_TORNEO = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Primera A - Emulador SofaScore</title></head>
+<body>
+<div id="cookies"><span>Usamos cookies</span> <button onclick="this.parentNode.remove()">Accept</button></div>
+<h2><div>Player statistics</div></h2>
+<div id="pestanas">__PESTANAS__</div>
+<div id="acumulacion">
+  <button class="DropdownButton" aria-haspopup="listbox" onclick="alternarModos()">All</button>
+  <ul role="listbox" id="modos" style="display: none">__MODOS__</ul>
+</div>
+<div id="contenedor"></div>
+<script>
+var estado = {categoria: 'summary', pagina: 1, modo: 'All', solicitud: 0};
+
+function alternarModos() {
+    var lista = document.getElementById('modos');
+    lista.style.display = lista.style.display === 'none' ? 'block' : 'none';
+}
+
+function seleccionarModo(modo) {
+    estado.modo = modo;
+    estado.pagina = 1;
+    document.querySelector('.DropdownButton').textContent = modo;
+    document.getElementById('modos').style.display = 'none';
+    cargar();
+}
+
+function seleccionarCategoria(categoria) {
+    estado.categoria = categoria;
+    estado.pagina = 1;
+    cargar();
+}
+
+function irAPagina(pagina) {
+    estado.pagina = pagina;
+    cargar();
+}
+
+function boton(texto, clase, alHacerClic, deshabilitado) {
+    var b = document.createElement('button');
+    b.className = clase;
+    if (texto.indexOf('<svg') === 0) { b.innerHTML = texto; } else { b.textContent = texto; }
+    if (deshabilitado) { b.disabled = true; } else { b.onclick = alHacerClic; }
+    return b;
+}
+
+function mostrar(datos) {
+    var contenedor = document.getElementById('contenedor');
+    contenedor.innerHTML = '';
+    var tabla = document.createElement('table');
+    var encabezado = tabla.createTHead().insertRow();
+    datos.encabezados.forEach(function (texto) {
+        var th = document.createElement('th');
+        th.textContent = texto;
+        encabezado.appendChild(th);
+    });
+    var cuerpo = tabla.createTBody();
+    datos.filas.forEach(function (fila) {
+        var tr = cuerpo.insertRow();
+        tr.insertCell().textContent = fila[0];
+        var equipo = tr.insertCell();
+        equipo.setAttribute('title', fila[1]);
+        var escudo = document.createElement('img');
+        escudo.setAttribute('alt', fila[1]);
+        equipo.appendChild(escudo);
+        var nombre = tr.insertCell();
+        nombre.setAttribute('title', fila[2]);
+        nombre.textContent = fila[2];
+        fila.slice(3).forEach(function (valor) { tr.insertCell().textContent = valor; });
+    });
+    contenedor.appendChild(tabla);
+
+    var paginacion = document.createElement('div');
+    var flecha = '<svg width="24" height="24"><path d="M15 6l-6 6 6 6"></path></svg>';
+    paginacion.appendChild(boton(flecha, 'arrow', function () { irAPagina(datos.pagina - 1); }, datos.pagina <= 1));
+    for (var p = Math.max(1, datos.pagina - 2); p <= Math.min(datos.paginas, datos.pagina + 2); p++) {
+        paginacion.appendChild(boton(String(p), p === datos.pagina ? 'button filled' : 'button',
+                                     (function (destino) { return function () { irAPagina(destino); }; })(p), false));
+    }
+    paginacion.appendChild(boton(flecha.replace('M15 6l-6 6 6 6', 'M9 6l6 6-6 6'), 'arrow',
+                                 function () { irAPagina(datos.pagina + 1); }, datos.pagina >= datos.paginas));
+    contenedor.appendChild(paginacion);
+}
+
+function cargar() {
+    var solicitud = ++estado.solicitud;
+    document.getElementById('contenedor').innerHTML = '<div>Cargando...</div>';
+    var url = '/api/jugadores?categoria=' + encodeURIComponent(estado.categoria) +
+              '&modo=' + encodeURIComponent(estado.modo) + '&pagina=' + estado.pagina;
+    fetch(url).then(function (r) { return r.json(); }).then(function (datos) {
+        // Una respuesta de una solicitud anterior no debe pisar la actual
+        if (solicitud === estado.solicitud) { mostrar(datos); }
+    });
+}
+
+cargar();
+</script>
+</body>
+</html>
+"""
+
+def generar_jugadores(n_jugadores, semilla=42):
+    """
+    Genera los jugadores sintéticos con sus estadísticas acumuladas por categoría.
+
+    Returns:
+        DataFrame: Una fila por jugador con Id, Name, Team, Position, Minutes y una
+                   columna por estadística de PLAYER_STATS
+    """
+    rng = np.random.default_rng(semilla)
+    ids = np.arange(1, n_jugadores + 1)
+    jugadores = pd.DataFrame({
+        'Id': ids,
+        'Name': [f"Nombre {i} Apellido" for i in ids],
+        'Team': rng.choice(NOMBRES_EQUIPOS, n_jugadores),
+        'Position': np.where(rng.random(n_jugadores) < PROPORCION_PORTEROS, 'G', rng.choice(['D', 'M', 'F'], n_jugadores)),
+        'Minutes': rng.integers(90, 1800, n_jugadores),
+    })
+    estadisticas = sorted({stat for stats in PLAYER_STATS.values() for stat in stats} - {'name', 'team', 'position'})
+    for stat in estadisticas:
+        if stat in ESTADISTICAS_PROMEDIO:
+            jugadores[stat] = rng.uniform(*RANGO_VALORACION, n_jugadores).round(2)
+        else:
+            jugadores[stat] = rng.poisson(rng.uniform(0.5, 30), n_jugadores)
+    return jugadores
+
+def columnas_categoria(categoria):
+    """Estadísticas de una pestaña y sus encabezados en la tabla"""
+    estadisticas = [stat for stat in PLAYER_STATS[categoria] if stat not in ('name', 'team', 'position')]
+    return estadisticas, [stat.replace('_', ' ').title() for stat in estadisticas]
+
+def pagina_jugadores(jugadores, categoria, modo, pagina):
+    """
+    Datos de una página de la tabla de jugadores, en el formato que espera la página del torneo.
+    """
+    if categoria not in PLAYER_STATS:
+        categoria = STAT_CATEGORIES[0]
+    # La pestaña de porteros solo lista porteros
+    if categoria == 'goalkeeper':
+        jugadores = jugadores[jugadores['Position'] == 'G']
+
+    estadisticas, encabezados = columnas_categoria(categoria)
+    paginas = max(1, -(-len(jugadores) // FILAS_POR_PAGINA))
+    pagina = min(max(1, pagina), paginas)
+    bloque = jugadores.iloc[(pagina - 1) * FILAS_POR_PAGINA:pagina * FILAS_POR_PAGINA]
+
+    conteos = [stat for stat in estadisticas if stat not in ESTADISTICAS_PROMEDIO]
+    valores = bloque[estadisticas].astype(str)
+    if modo == "Per 90 mins":
+        valores[conteos] = (bloque[conteos].div(bloque['Minutes'], axis=0) * 90).round(2).astype(str)
+
+    filas = [[str((pagina - 1) * FILAS_POR_PAGINA + i + 1), equipo, nombre] + list(fila)
+             for i, (equipo, nombre, fila) in enumerate(zip(bloque['Team'], bloque['Name'], valores.to_numpy()))]
+    return {'encabezados': ['#', 'Team', 'Name'] + encabezados, 'filas': filas,
+            'pagina': pagina, 'paginas': paginas}
+
+def _valor_fbref(campo, i, fecha, jugador, rival, rng):
+    """Valor sintético de una celda de la tabla de partidos de FBref"""
+    local = i % 2 == 0
+    goles = (int(rng.integers(0, 4)), int(rng.integers(0, 4)))
+    if campo == "Day":
+        return f"{fecha:%a}"
+    if campo == "Comp":
+        return "Primera A"
+    if campo == "Round":
+        return f"Matchweek {i + 1}"
+    if campo == "Venue":
+        return "Home" if local else "Away"
+    if campo == "Result":
+        letra = 'W' if goles[0] > goles[1] else 'L' if goles[0] < goles[1] else 'D'
+        return f"{letra} {goles[0]}–{goles[1]}"
+    if campo == "Squad":
+        return jugador['Team']
+    if campo == "Opponent":
+        return rival
+    if campo == "Start":
+        return "Y" if rng.random() < 0.7 else "N"
+    if campo == "Pos":
+        return {'G': 'GK', 'D': 'DF', 'M': 'MF', 'F': 'FW'}[jugador['Position']]
+    if campo == "Min":
+        return str(int(rng.integers(1, 91)))
+    if campo == "Save%":
+        return f"{rng.uniform(0, 100):.1f}"
+    return str(int(rng.poisson(0.4)))
+
+def pagina_fbref(jugador, año, partidos, semilla=42):
+    """HTML de la página de partidos de un jugador con la estructura de FBref"""
+    rng = np.random.default_rng([semilla, int(jugador['Id'])])
+    campos = CAMPOS_PORTERO if jugador['Position'] == 'G' else CAMPOS_JUGADOR
+    nombre = html.escape(jugador['Name'])
+    rivales = [equipo for equipo in NOMBRES_EQUIPOS if equipo != jugador['Team']]
+
+    encabezados = ''.join(f'<th data-stat="{data_stat}">{campo}</th>' for campo, data_stat in campos.items())
+    filas = []
+    fecha = pd.Timestamp(f"{año}-01-20")
+    for i in range(partidos):
+        fecha += pd.Timedelta(days=int(rng.integers(3, 10)))
+        rival = rivales[i % len(rivales)]
+        celdas = [f'<th data-stat="date" csk="{fecha:%Y%m%d}"><a href="/en/matches/{fecha:%Y-%m-%d}">{fecha:%Y-%m-%d}</a></th>']
+        celdas += [f'<td data-stat="{data_stat}">{html.escape(_valor_fbref(campo, i, fecha, jugador, rival, rng))}</td>'
+                   for campo, data_stat in campos.items() if campo != "Date"]
+        filas.append(f'<tr>{"".join(celdas)}</tr>')
+        # FBref repite el encabezado de la tabla cada 20 partidos
+        if i % 20 == 19 and i + 1 < partidos:
+            filas.append(f'<tr class="thead">{encabezados}</tr>')
+
+    titulo = "Goalkeeping" if jugador['Position'] == 'G' else "Match Logs"
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{nombre} {titulo} | FBref.com</title></head>'
+            f'<body><div id="meta"><img class="headshot" alt="{nombre} headshot"><h1>{nombre}</h1>'
+            f'<p><strong>Current Team:</strong> <a href="#">{html.escape(jugador["Team"])}</a></p></div>'
+            f'<table id="matchlogs_all"><caption>{titulo} {año}</caption><thead><tr>{encabezados}</tr></thead>'
+            f'<tbody>{"".join(filas)}</tbody></table></body></html>')
+
+def url_fbref(jugador, año):
+    """Ruta de la página de partidos de un jugador en el emulador"""
+    return f"/en/players/{int(jugador['Id']):08d}/matchlogs/{año}/{jugador['Name'].replace(' ', '-')}-Match-Logs"
+
+def crear_manejador(jugadores, latencia=0.0, partidos=34, año=2024, semilla=42, verbose=False):
+    """Crea la clase que atiende las solicitudes del emulador con los datos dados"""
+    indice = jugadores.set_index('Id', drop=False)
+    pestanas = ''.join(f'<button class="Chip" data-tabid="{categoria}" onclick="seleccionarCategoria(\'{categoria}\')">'
+                       f'{categoria.title()}</button>' for categoria in STAT_CATEGORIES)
+    modos = ''.join(f'<li role="option" onclick="seleccionarModo(\'{modo}\')">{modo}</li>' for modo in MODOS_ACUMULACION)
+    pagina_torneo = PAGINA_TORNEO.replace('__PESTANAS__', pestanas).replace('__MODOS__', modos)
+
+    class ManejadorEmulador(BaseHTTPRequestHandler):
+        def _responder(self, cuerpo, tipo="text/html; charset=utf-8", estado=200):
+            datos = cuerpo.encode('utf-8')
+            self.send_response(estado)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def do_GET(self):
+            if latencia > 0:
+                time.sleep(latencia)
+            url = urlparse(self.path)
+
+            if url.path.startswith("/tournament/"):
+                return self._responder(pagina_torneo)
+
+            if url.path == "/api/jugadores":
+                parametros = {clave: valores[0] for clave, valores in parse_qs(url.query).items()}
+                datos = pagina_jugadores(jugadores, parametros.get('categoria', 'summary'),
+                                         parametros.get('modo', 'All'), int(parametros.get('pagina', 1)))
+                return self._responder(json.dumps(datos), tipo="application/json")
+
+            if url.path.rstrip('/') == "/en/players":
+                enlaces = ''.join(f'<li><a href="{url_fbref(jugador, año)}">{html.escape(jugador["Name"])}</a></li>'
+                                  for jugador in jugadores.to_dict('records'))
+                return self._responder(f'<!DOCTYPE html><html><body><ul>{enlaces}</ul></body></html>')
+
+            coincidencia = re.match(r"^/en/players/(\d+)/matchlogs/(\d{4})/", url.path)
+            if coincidencia and int(coincidencia.group(1)) in indice.index:
+                jugador = indice.loc[int(coincidencia.group(1))].to_dict()
+                return self._responder(pagina_fbref(jugador, int(coincidencia.group(2)), partidos, semilla))
+
+            self._responder("<html><body>404</body></html>", estado=404)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return ManejadorEmulador
+
+def iniciar_emulador(n_jugadores=600, latencia=0.0, partidos=34, año=2024, host=HOST, puerto=PUERTO,
+                     semilla=42, verbose=False):
+    """
+    Inicia el emulador en un hilo en segundo plano (puerto 0 elige un puerto libre).
+
+    Returns:
+        tuple: (servidor, url_base); servidor.shutdown() lo detiene
+    """
+    jugadores = generar_jugadores(n_jugadores, semilla)
+    manejador = crear_manejador(jugadores, latencia, partidos, año, semilla, verbose)
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description='Emulador local de SofaScore y FBref para los scrapers')
+    parser.add_argument('--jugadores', type=int, default=600, help='Jugadores de la tabla del torneo')
+    parser.add_argument('--latencia', type=float, default=0.0, help='Latencia artificial por solicitud (segundos)')
+    parser.add_argument('--partidos', type=int, default=34, help='Partidos por jugador en las páginas de FBref')
+    parser.add_argument('--año', type=int, default=2024, help='Temporada de las páginas de FBref')
+    parser.add_argument('--host', type=str, default=HOST, help='Dirección del servidor')
+    parser.add_argument('--puerto', type=int, default=PUERTO, help='Puerto del servidor')
+    parser.add_argument('--semilla', type=int, default=42, help='Semilla de los datos sintéticos')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar cada solicitud atendida')
+    args = parser.parse_args()
+
+    servidor, url_base = iniciar_emulador(args.jugadores, args.latencia, args.partidos, args.año,
+                                          args.host, args.puerto, args.semilla, args.verbose)
+    print(f"✓ Emulador escuchando en {url_base} ({args.jugadores} jugadores, latencia {args.latencia} s)")
+    print(f"  SofaScore: SOFASCORE_BASE_URL={url_base}")
+    print(f"  FBref:     FBREF_BASE_URL={url_base} (jugadores en {url_base}/en/players/)")
+    print("Ctrl+C para detener")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
+        print("Emulador detenido")
+
+if __name__ == "__main__":
+    main()
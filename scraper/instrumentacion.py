@@ -0,0 +1,201 @@
+"""
+Instrumentación ligera de los scrapers: temporizadores por fase, contadores y
+conteo de llamadas a WebDriver, con un informe JSON por ejecución.
+
+Uso:
+    iniciar_ejecucion("sofascore", torneo="Apertura")
+    driver = instrumentar_driver(driver)
+    with ambito(categoria="All/summary", pagina=1):
+        extract_player_table(driver)      # decorada con @medir_fase("extraccion")
+    finalizar_ejecucion()
+
+Cada medición se suma a tres niveles: la ejecución completa, la categoría actual y
+la página actual. Si no hay una ejecución iniciada, las funciones decoradas se
+ejecutan sin registrar nada.
+"""
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Carpeta donde se guardan los informes de ejecución
+CARPETA_REPORTES = "reportes/"
+
+# Ejecución en curso y ámbito (categoría y página) de las mediciones
+_estado = {'reporte': None, 'inicio': None, 'categoria': None, 'pagina': None}
+
+def _nuevo_nivel():
+    return {'segundos': 0.0, 'fases': {}, 'contadores': {}, 'webdriver': 0}
+
+def _niveles():
+    """Devuelve los niveles (ejecución, categoría, página) a los que se suma una medición"""
+    reporte = _estado['reporte']
+    niveles = [reporte]
+    categoria = _estado['categoria']
+    if categoria is not None:
+        nivel_categoria = reporte['categorias'].setdefault(categoria, {**_nuevo_nivel(), 'paginas': {}})
+        niveles.append(nivel_categoria)
+        if _estado['pagina'] is not None:
+            niveles.append(nivel_categoria['paginas'].setdefault(str(_estado['pagina']), _nuevo_nivel()))
+    return niveles
+
+def iniciar_ejecucion(nombre, **parametros):
+    """
+    Inicia el informe de una ejecución y lo convierte en el informe activo.
+
+    Args:
+        nombre: Nombre del scraper (por ejemplo 'sofascore' o 'fbref_jugadores')
+        **parametros: Parámetros de la ejecución que se guardan en el informe
+
+    Returns:
+        dict: Informe de la ejecución
+    """
+    _estado.update(categoria=None, pagina=None, inicio=time.perf_counter())
+    _estado['reporte'] = {
+        'ejecucion': nombre,
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'parametros': parametros,
+        **_nuevo_nivel(),
+        'webdriver_comandos': {},
+        'categorias': {},
+    }
+    return _estado['reporte']
+
+def ejecucion_activa():
+    """Indica si hay una ejecución en curso"""
+    return _estado['reporte'] is not None
+
+@contextmanager
+def ambito(categoria=None, pagina=None):
+    """
+    Asigna la categoría y la página de las mediciones dentro del bloque. Un valor
+    None conserva el del ámbito exterior.
+    """
+    anterior = (_estado['categoria'], _estado['pagina'])
+    if categoria is not None:
+        _estado['categoria'], _estado['pagina'] = categoria, None
+    if pagina is not None:
+        _estado['pagina'] = pagina
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        if ejecucion_activa() and _estado['categoria'] is not None:
+            # El tiempo del ámbito se suma solo al nivel que abre el bloque
+            nivel = _niveles()[-1] if pagina is not None else _niveles()[1]
+            nivel['segundos'] += time.perf_counter() - inicio
+        _estado['categoria'], _estado['pagina'] = anterior
+
+def registrar_fase(fase, segundos, exito=True):
+    """Suma la duración de una fase en todos los niveles del ámbito actual"""
+    if not ejecucion_activa():
+        return
+    for nivel in _niveles():
+        datos = nivel['fases'].setdefault(fase, {'llamadas': 0, 'segundos': 0.0, 'fallos': 0})
+        datos['llamadas'] += 1
+        datos['segundos'] += segundos
+        if not exito:
+            datos['fallos'] += 1
+
+def contar(nombre, cantidad=1):
+    """Suma una cantidad a un contador (filas extraídas, archivos escritos...)"""
+    if not ejecucion_activa():
+        return
+    for nivel in _niveles():
+        nivel['contadores'][nombre] = nivel['contadores'].get(nombre, 0) + cantidad
+
+@contextmanager
+def fase(nombre):
+    """Mide el bloque como una fase; una excepción cuenta como fallo y se propaga"""
+    inicio = time.perf_counter()
+    exito = False
+    try:
+        yield
+        exito = True
+    finally:
+        registrar_fase(nombre, time.perf_counter() - inicio, exito)
+
+def medir_fase(nombre):
+    """
+    Decorador que mide cada llamada a la función como una fase. Un resultado False,
+    None o vacío (la convención de los scrapers para los fallos) cuenta como fallo.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not ejecucion_activa():
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            resultado = None
+            try:
+                resultado = funcion(*args, **kwargs)
+                return resultado
+            finally:
+                exito = resultado is not None and resultado is not False and not (
+                    isinstance(resultado, (list, dict)) and not resultado)
+                registrar_fase(nombre, time.perf_counter() - inicio, exito)
+        return envoltura
+    return decorador
+
+def instrumentar_driver(driver):
+    """
+    Cuenta las llamadas a WebDriver del driver. Todas las órdenes (también las de
+    los elementos: .text, get_attribute, click...) pasan por driver.execute, así que
+    basta con envolver ese método en la instancia.
+    """
+    execute = driver.execute
+
+    @functools.wraps(execute)
+    def execute_contado(driver_command, params=None):
+        if ejecucion_activa():
+            comandos = _estado['reporte']['webdriver_comandos']
+            comandos[driver_command] = comandos.get(driver_command, 0) + 1
+            for nivel in _niveles():
+                nivel['webdriver'] += 1
+        return execute(driver_command, params)
+
+    driver.execute = execute_contado
+    return driver
+
+def _redondear(valor):
+    if isinstance(valor, float):
+        return round(valor, 4)
+    if isinstance(valor, dict):
+        return {clave: _redondear(v) for clave, v in valor.items()}
+    return valor
+
+def finalizar_ejecucion(ruta=None, resumen=True):
+    """
+    Cierra la ejecución activa y guarda su informe JSON.
+
+    Args:
+        ruta: Archivo del informe (por defecto reportes/<ejecucion>_<fecha>.json)
+        resumen: Si es True, imprime el tiempo por fase
+
+    Returns:
+        str: Ruta del informe o None si no había una ejecución activa
+    """
+    reporte = _estado['reporte']
+    if reporte is None:
+        return None
+    reporte['segundos'] = time.perf_counter() - _estado['inicio']
+    reporte['fin'] = datetime.now().isoformat(timespec='seconds')
+
+    if ruta is None:
+        os.makedirs(CARPETA_REPORTES, exist_ok=True)
+        ruta = os.path.join(CARPETA_REPORTES, f"{reporte['ejecucion']}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(_redondear(reporte), f, indent=2, ensure_ascii=False)
+
+    if resumen:
+        print(f"\nTiempo por fase ({reporte['segundos']:.2f} s en total, "
+              f"{reporte['webdriver']} llamadas a WebDriver):")
+        for nombre, datos in sorted(reporte['fases'].items(), key=lambda item: -item[1]['segundos']):
+            print(f"- {nombre}: {datos['segundos']:.2f} s en {datos['llamadas']} llamadas"
+                  + (f" ({datos['fallos']} fallidas)" if datos['fallos'] else ""))
+        print(f"Informe de la ejecución guardado en {ruta}")
+
+    _estado.update(reporte=None, inicio=None, categoria=None, pagina=None)
+    return ruta
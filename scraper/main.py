@@ -2,14 +2,20 @@ import time
 import datetime
 import argparse
 import os
+import sys
 # Importar TODAS las funciones necesarias
 from sofascore_scraper import main as run_scraper
+from config import BASE_URL
+# calidad_datos está en 'Procesamiento de datos' (sofascore_scraper añade la ruta)
+from calidad_datos import ErrorCalidadDatos
 
 if __name__ == "__main__":
     # Configurar argumentos de línea de comandos
     parser = argparse.ArgumentParser(description='Scraper de SofaScore para la Liga Colombiana')
     parser.add_argument('--visible', action='store_true', 
                         help='Ejecutar con navegador visible (no headless)')
+    parser.add_argument('--reporte', type=str, default=None,
+                        help='Ruta del informe JSON de tiempos por fase (por defecto en reportes/)')
     
     args = parser.parse_args()
     
@@ -23,10 +29,10 @@ if __name__ == "__main__":
     # Determinar URLs y nombres basados en la selección
     if tournament_type == "1":
         tournament_name = "Apertura"
-        tournament_url = "https://www.sofascore.com/tournament/football/colombia/primera-a-apertura/11539"
+        tournament_url = f"{BASE_URL}/tournament/football/colombia/primera-a-apertura/11539"
     else:
         tournament_name = "Clausura"
-        tournament_url = "https://www.sofascore.com/tournament/football/colombia/primera-a-clausura/11536"
+        tournament_url = f"{BASE_URL}/tournament/football/colombia/primera-a-clausura/11536"
     
     # Solicitar ID del torneo (año)
     tournament_id = input(f"Introduce el ID de {tournament_name} (por ejemplo, 70681 para 2025): ")
@@ -38,7 +44,13 @@ if __name__ == "__main__":
     print(f"Iniciando scraper a las {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Ejecutar scraper pasando los parámetros
-    run_scraper(visible=args.visible, tournament_type=tournament_name, tournament_url=tournament_url, tournament_id=tournament_id)
+    try:
+        run_scraper(visible=args.visible, tournament_type=tournament_name, tournament_url=tournament_url,
+                    tournament_id=tournament_id, report_path=args.reporte)
+    except ErrorCalidadDatos as e:
+        # Código de salida distinto de 0 para que el pipeline no acepte los datos rechazados
+        print(f"\nERROR: {e}")
+        sys.exit(1)
     
     # Mostrar tiempo de ejecución
     elapsed_time = time.time() - start_time
@@ -14,8 +14,21 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import traceback
 import re
+import sys
+from lxml import html as lxml_html
 from config import *
 
+# Registro de equipos compartido con "Procesamiento de datos"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Procesamiento de datos'))
+from equipos import parece_equipo
+from calidad_datos import validar, exigir_calidad, guardar_reportes, imprimir_reporte, ErrorCalidadDatos
+from instrumentacion import (medir_fase, fase, ambito, contar, iniciar_ejecucion, finalizar_ejecucion,
+                             instrumentar_driver)
+
+def pause(seconds):
+    """Espera fija entre acciones, escalada por WAIT_FACTOR (config.py)"""
+    time.sleep(seconds * WAIT_FACTOR)
+
 def create_firefox_driver(visible=True):
     """
     Crea y configura el driver de Firefox
@@ -46,6 +59,7 @@ def create_firefox_driver(visible=True):
         print(f"Error al inicializar Firefox: {e}")
         raise
 
+@medir_fase("navegacion")
 def navigate_to_tournament_page(driver):
     """
     Navega a la página principal del torneo
@@ -61,7 +75,7 @@ def navigate_to_tournament_page(driver):
         full_url = f"{TOURNAMENT_URL}#id:{TOURNAMENT_ID}"
         driver.get(full_url)
         print(f"Navegando a: {full_url}")
-        time.sleep(8)  # Esperar a que la página cargue completamente
+        pause(8)  # Esperar a que la página cargue completamente
         
         # Verificar si hay un banner de cookies y cerrarlo
         try:
@@ -69,7 +83,7 @@ def navigate_to_tournament_page(driver):
                 "//button[contains(text(), 'Accept') or contains(text(), 'Aceptar')]")
             cookie_button.click()
             print("Banner de cookies cerrado")
-            time.sleep(1)
+            pause(1)
         except:
             print("No se encontró banner de cookies o ya fue aceptado")
         
@@ -82,6 +96,7 @@ def navigate_to_tournament_page(driver):
         print(traceback.format_exc())
         return False
 
+@medir_fase("busqueda_seccion")
 def find_player_statistics_section(driver):
     """
     Encuentra la sección de estadísticas de jugadores
@@ -132,6 +147,7 @@ def find_player_statistics_section(driver):
         print(f"Error al buscar sección de estadísticas: {e}")
         return False
 
+@medir_fase("pestana")
 def select_statistics_tab(driver, tab_name):
     """
     Selecciona una pestaña específica de estadísticas (Summary, Attack, Defence, etc.)
@@ -192,7 +208,7 @@ def select_statistics_tab(driver, tab_name):
             result = driver.execute_script(script, tab_button or chip_buttons[0], target_button or chip_buttons[0])
             if result:
                 print(f"Pestaña '{tab_name}' seleccionada usando JavaScript")
-                time.sleep(2)  # Esperar a que cargue la tabla
+                pause(2)  # Esperar a que cargue la tabla
                 return True
         
         # Método alternativo - forzar el clic con JavaScript
@@ -218,7 +234,7 @@ def select_statistics_tab(driver, tab_name):
         result = driver.execute_script(alt_script)
         if result:
             print(f"Pestaña '{tab_name}' seleccionada usando JavaScript alternativo")
-            time.sleep(2)
+            pause(2)
             return True
         
         print(f"No se pudo seleccionar la pestaña '{tab_name}' con ningún método")
@@ -229,6 +245,151 @@ def select_statistics_tab(driver, tab_name):
         print(traceback.format_exc())
         return False
 
+def build_player_record(headers, cell_texts, cell_titles):
+    """
+    Construye el registro de un jugador a partir del texto y el atributo title de
+    las celdas de una fila. Es común a todas las estrategias de extracción.
+    
+    Args:
+        headers (list): Encabezados de la tabla (sin '#')
+        cell_texts (list): Texto de cada celda td de la fila
+        cell_titles (list): Atributo title de cada celda (None si no tiene)
+    
+    Returns:
+        dict: Datos del jugador o None si la fila no tiene datos
+    """
+    if len(cell_texts) <= 1:
+        return None
+    
+    player = {}
+    
+    # Obtener número de posición
+    player["Position"] = cell_texts[0]
+    
+    # Recorrer todas las celdas para buscar atributos title y clasificarlos correctamente
+    team_name = None
+    player_name = None
+    titles = [title for title in cell_titles if title and len(title) > 2]
+    
+    # Si tenemos exactamente dos títulos, es muy probable que sean equipo y jugador
+    if len(titles) >= 2:
+        # Heurística: Si un título contiene espacio, probablemente es un nombre de jugador
+        # Si no contiene espacio o tiene pocas palabras, probablemente es un equipo
+        for title in titles:
+            # Si contiene palabras como FC, Independiente, Atlético, etc., es un equipo
+            if parece_equipo(title):
+                team_name = title
+            # Si tiene espacios y no se ha identificado como jugador, probablemente es un jugador
+            elif ' ' in title and not player_name:
+                player_name = title
+    
+    # Si no pudimos identificar claramente, usemos la heurística simple
+    if not team_name or not player_name:
+        # Si tenemos al menos dos títulos
+        if len(titles) >= 2:
+            # Ordenamos por número de palabras
+            titles_by_words = sorted(titles, key=lambda x: len(x.split()))
+            # El que tiene menos palabras probablemente es el equipo
+            team_name = titles_by_words[0]
+            # El que tiene más palabras probablemente es el jugador
+            player_name = titles_by_words[-1]
+        # Si solo tenemos un título, intentamos adivinar
+        elif len(titles) == 1:
+            if ' ' in titles[0]:
+                # Si tiene espacio, probablemente es un jugador
+                player_name = titles[0]
+            else:
+                # Si no tiene espacio, probablemente es un equipo
+                team_name = titles[0]
+    
+    # Asignar los valores encontrados
+    player["Team"] = team_name if team_name else "Unknown"
+    player["Name"] = player_name if player_name else "Unknown"
+    
+    # Extraer estadísticas usando los encabezados correctos
+    # Primero identificamos cuáles son las columnas de estadísticas (no Team o Name)
+    stat_headers = [h for h in headers if h != "Team" and h != "Name"]
+    
+    # Las estadísticas están en celdas después de las columnas de Team y Name
+    # En SofaScore, después de Position, suelen estar Team, Name y luego las estadísticas
+    for i, header in enumerate(stat_headers):
+        # Comenzar desde la celda 3 (índice 2) para las estadísticas
+        cell_idx = 3 + i
+        if cell_idx < len(cell_texts):
+            player[header] = cell_texts[cell_idx]
+    
+    # Validar y corregir
+    if player["Team"] == player["Name"]:
+        # Si son iguales, algo está mal. Intentemos usar heurística
+        if ' ' in player["Team"]:
+            # Si tiene espacio, probablemente es un jugador
+            player["Name"] = player["Team"]
+            player["Team"] = "Unknown"
+    
+    # Verificación final por consistencia
+    if player["Name"] != "Unknown" and player["Team"] != "Unknown":
+        # VERIFICACIÓN FINAL: Asegurarnos de que equipo y jugador no están invertidos
+        # Si el "nombre" contiene palabras de nombres de equipos, podría ser un equipo
+        if parece_equipo(player["Name"]):
+            # Y si el "equipo" tiene espacios (como un nombre), probablemente están invertidos
+            if ' ' in player["Team"] and len(player["Team"].split()) > 1:
+                # Intercambiar valores
+                player["Team"], player["Name"] = player["Name"], player["Team"]
+    
+    return player
+
+def clean_headers(header_texts):
+    """Descarta los encabezados vacíos y la columna '#'"""
+    return [text for text in header_texts if text and text != "#"]
+
+@medir_fase("modo_acumulacion")
+def select_accumulation_mode(driver, mode):
+    """
+    Selecciona el modo de acumulación (All, Per 90 mins...) en el desplegable de la
+    tabla de jugadores
+    
+    Args:
+        driver: El driver de Selenium
+        mode: Texto de la opción a seleccionar
+    
+    Returns:
+        bool: True si seleccionó el modo, False en caso contrario
+    """
+    script = """
+    var modo = arguments[0];
+    var buscarOpcion = function () {
+        return Array.from(document.querySelectorAll('[role="option"], li')).find(function (el) {
+            return el.textContent.trim() === modo && el.offsetParent !== null;
+        });
+    };
+    
+    // Abrir el desplegable si la opción no está visible
+    var opcion = buscarOpcion();
+    if (!opcion) {
+        var desplegable = Array.from(document.querySelectorAll('button')).find(function (b) {
+            return b.getAttribute('aria-haspopup') || b.className.indexOf('Dropdown') >= 0;
+        });
+        if (!desplegable) { return false; }
+        desplegable.click();
+        opcion = buscarOpcion();
+    }
+    
+    if (!opcion) { return false; }
+    opcion.click();
+    return true;
+    """
+    try:
+        if driver.execute_script(script, mode):
+            print(f"Modo de acumulación '{mode}' seleccionado")
+            pause(2)  # Esperar a que cargue la tabla
+            return True
+        print(f"No se encontró el modo de acumulación '{mode}'")
+        return False
+    except Exception as e:
+        print(f"Error al seleccionar el modo de acumulación '{mode}': {e}")
+        return False
+
+@medir_fase("extraccion")
 def extract_player_table(driver):
     """
     Extrae los datos de la tabla de jugadores
@@ -247,144 +408,35 @@ def extract_player_table(driver):
         print("Tabla de jugadores encontrada")
         
         # Extraer encabezados de la tabla
-        headers = []
-        header_cells = table.find_elements(By.XPATH, ".//th")
-        
-        for cell in header_cells:
-            text = cell.text.strip()
-            if text and text != "#":
-                headers.append(text)
-        
+        headers = clean_headers([cell.text.strip() for cell in table.find_elements(By.XPATH, ".//th")])
         print(f"Encabezados encontrados: {headers}")
         
         # Extraer filas de jugadores
         rows = table.find_elements(By.XPATH, ".//tbody/tr")
         print(f"Filas de jugadores encontradas: {len(rows)}")
         
-        # Extraer datos
+        # Extraer datos (una llamada a WebDriver por celda y atributo)
         players_data = []
         
         for row in rows:
             cells = row.find_elements(By.XPATH, "./td")
+            if len(cells) <= 1:
+                continue
             
-            if len(cells) > 1:
-                player = {}
-                
-                # Obtener número de posición
+            cell_texts = []
+            cell_titles = []
+            for cell in cells:
                 try:
-                    player["Position"] = cells[0].text.strip()
+                    cell_texts.append(cell.text.strip())
                 except:
-                    player["Position"] = ""
-                
-                # Recorrer todas las celdas para buscar atributos title y clasificarlos correctamente
-                team_name = None
-                player_name = None
-                titles = []
-                
-                # Primero recopilamos todos los atributos title
-                for cell in cells:
-                    try:
-                        title = cell.get_attribute("title")
-                        if title and len(title) > 2:
-                            # Eliminamos la impresión de cada título encontrado
-                            titles.append(title)
-                    except:
-                        pass
-                
-                # Si tenemos exactamente dos títulos, es muy probable que sean equipo y jugador
-                if len(titles) >= 2:
-                    # Heurística: Si un título contiene espacio, probablemente es un nombre de jugador
-                    # Si no contiene espacio o tiene pocas palabras, probablemente es un equipo
-                    
-                    # Ordenamos los títulos por número de palabras (menos a más)
-                    sorted_titles = sorted(titles, key=lambda x: len(x.split()))
-                    
-                    # El primero probablemente es el equipo, el último probablemente es el jugador
-                    # (pero verificamos más condiciones)
-                    for title in titles:
-                        # Si contiene palabras como FC, Independiente, Atlético, etc., es un equipo
-                        team_indicators = ["FC", "Independiente", "Atlético", "Deportivo", "Junior", "Caldas",
-                                         "Santa Fe", "Magdalena", "Medellín", "Cali", "Nacional", "Bucaramanga",
-                                         "Chicó", "Tolima", "Millonarios", "Fortaleza", "Águilas", "Envigado",
-                                         "Alianza", "Pasto", "Equidad", "Pereira", "Rionegro", "Llaneros",
-                                         "Unión", "América", "Barranquilla", "Valledupar", "Doradas", "CEIF"]
-                        
-                        # Verificar si contiene alguno de los indicadores de equipo
-                        if any(indicator in title for indicator in team_indicators):
-                            team_name = title
-                        # Si tiene espacios y no se ha identificado como jugador, probablemente es un jugador
-                        elif ' ' in title and not player_name:
-                            player_name = title
-                
-                # Si no pudimos identificar claramente, usemos la heurística simple
-                if not team_name or not player_name:
-                    # Si tenemos al menos dos títulos
-                    if len(titles) >= 2:
-                        # Ordenamos por número de palabras
-                        titles_by_words = sorted(titles, key=lambda x: len(x.split()))
-                        # El que tiene menos palabras probablemente es el equipo
-                        team_name = titles_by_words[0]
-                        # El que tiene más palabras probablemente es el jugador
-                        player_name = titles_by_words[-1]
-                    # Si solo tenemos un título, intentamos adivinar
-                    elif len(titles) == 1:
-                        if ' ' in titles[0]:
-                            # Si tiene espacio, probablemente es un jugador
-                            player_name = titles[0]
-                        else:
-                            # Si no tiene espacio, probablemente es un equipo
-                            team_name = titles[0]
-                
-                # Asignar los valores encontrados
-                if team_name:
-                    player["Team"] = team_name
-                else:
-                    player["Team"] = "Unknown"
-                
-                if player_name:
-                    player["Name"] = player_name
-                else:
-                    player["Name"] = "Unknown"
-                
-                # Extraer estadísticas usando los encabezados correctos
-                # Primero identificamos cuáles son las columnas de estadísticas (no Team o Name)
-                stat_headers = [h for h in headers if h != "Team" and h != "Name"]
-                
-                # Las estadísticas están en celdas después de las columnas de Team y Name
-                # En SofaScore, después de Position, suelen estar Team, Name y luego las estadísticas
-                for i, header in enumerate(stat_headers):
-                    # Comenzar desde la celda 3 (índice 2) para las estadísticas
-                    cell_idx = 3 + i
-                    if cell_idx < len(cells):
-                        player[header] = cells[cell_idx].text.strip()
-                
-                # Validar y corregir
-                if player["Team"] == player["Name"]:
-                    # Si son iguales, algo está mal. Intentemos usar heurística
-                    if ' ' in player["Team"]:
-                        # Si tiene espacio, probablemente es un jugador
-                        player["Name"] = player["Team"]
-                        player["Team"] = "Unknown"
-                
-                # Verificación final por consistencia
-                if "Name" in player and player["Name"] != "Unknown" and "Team" in player and player["Team"] != "Unknown":
-                    # VERIFICACIÓN FINAL: Asegurarnos de que equipo y jugador no están invertidos
-                    # Indicadores de equipos (palabras que suelen estar en nombres de equipos)
-                    team_indicators = ["FC", "Independiente", "Atlético", "Deportivo", "Junior", "Caldas",
-                                       "Santa Fe", "Magdalena", "Medellín", "Cali", "Nacional", "Bucaramanga",
-                                       "Chicó", "Tolima", "Millonarios", "Fortaleza", "Águilas", "Envigado",
-                                       "Alianza", "Pasto", "Equidad", "Pereira", "Rionegro", "Llaneros",
-                                       "Unión", "América", "Barranquilla", "Valledupar", "Doradas", "CEIF"]
-                    
-                    # Si el "nombre" contiene alguno de estos indicadores, podría ser un equipo
-                    if any(indicator in player["Name"] for indicator in team_indicators):
-                        # Y si el "equipo" tiene espacios (como un nombre), probablemente están invertidos
-                        if ' ' in player["Team"] and len(player["Team"].split()) > 1:
-                            # Intercambiar valores
-                            player["Team"], player["Name"] = player["Name"], player["Team"]
-                            # Eliminamos la impresión de corrección de inversión
-                
-                # Eliminamos la impresión de cada jugador añadido
+                    cell_texts.append("")
+                try:
+                    cell_titles.append(cell.get_attribute("title"))
+                except:
+                    cell_titles.append(None)
+            
+            player = build_player_record(headers, cell_texts, cell_titles)
+            if player:
                 players_data.append(player)
         
         print(f"Extraídos datos de {len(players_data)} jugadores")
@@ -398,6 +450,93 @@ def extract_player_table(driver):
         print(traceback.format_exc())
         return []
 
+# Lee encabezados, texto y title de todas las celdas de la tabla en una sola llamada
+JS_EXTRACT_PLAYER_TABLE = """
+var table = document.querySelector('table');
+if (!table) { return null; }
+var headers = Array.from(table.querySelectorAll('th')).map(function (th) { return th.innerText.trim(); });
+var rows = Array.from(table.querySelectorAll('tbody > tr')).map(function (tr) {
+    return Array.from(tr.children).filter(function (td) { return td.tagName === 'TD'; }).map(function (td) {
+        return [td.innerText.trim(), td.getAttribute('title')];
+    });
+});
+return {headers: headers, rows: rows};
+"""
+
+@medir_fase("extraccion")
+def extract_player_table_js(driver):
+    """
+    Extrae la tabla de jugadores con una sola llamada execute_script en lugar de
+    una llamada a WebDriver por celda.
+    
+    Args:
+        driver: El driver de Selenium
+        
+    Returns:
+        list: Lista de diccionarios con datos de jugadores
+    """
+    try:
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+        table = driver.execute_script(JS_EXTRACT_PLAYER_TABLE)
+        if not table:
+            print("No se pudo encontrar la tabla de jugadores")
+            return []
+        
+        headers = clean_headers(table["headers"])
+        players_data = []
+        for row in table["rows"]:
+            player = build_player_record(headers, [cell[0] for cell in row], [cell[1] for cell in row])
+            if player:
+                players_data.append(player)
+        
+        print(f"Extraídos datos de {len(players_data)} jugadores")
+        return players_data
+    
+    except TimeoutException:
+        print("No se pudo encontrar la tabla de jugadores")
+        return []
+    except Exception as e:
+        print(f"Error al extraer datos de la tabla: {e}")
+        print(traceback.format_exc())
+        return []
+
+def extract_player_table_html(page_source):
+    """
+    Extrae la tabla de jugadores del HTML de la página (driver.page_source o una
+    página guardada) con lxml, sin llamadas a WebDriver.
+    
+    Args:
+        page_source (str): HTML de la página
+        
+    Returns:
+        list: Lista de diccionarios con datos de jugadores
+    """
+    tables = lxml_html.fromstring(page_source).xpath("//table")
+    if not tables:
+        print("No se pudo encontrar la tabla de jugadores")
+        return []
+    table = tables[0]
+    
+    headers = clean_headers([th.text_content().strip() for th in table.xpath(".//th")])
+    players_data = []
+    for row in table.xpath(".//tbody/tr"):
+        cells = row.xpath("./td")
+        player = build_player_record(headers, [cell.text_content().strip() for cell in cells],
+                                     [cell.get("title") for cell in cells])
+        if player:
+            players_data.append(player)
+    
+    print(f"Extraídos datos de {len(players_data)} jugadores")
+    return players_data
+
+# Estrategias de extracción de la tabla de jugadores (ver EXTRACTION_STRATEGY en config.py)
+EXTRACTION_STRATEGIES = {
+    "webdriver": extract_player_table,
+    "js": extract_player_table_js,
+    "lxml": medir_fase("extraccion")(lambda driver: extract_player_table_html(driver.page_source)),
+}
+
+@medir_fase("paginacion")
 def navigate_pagination(driver, page_num):
     """
     Navega a una página específica de la paginación
@@ -414,10 +553,10 @@ def navigate_pagination(driver, page_num):
         try:
             page_button = driver.find_element(By.XPATH, f"//button[text()='{page_num}']")
             driver.execute_script("arguments[0].scrollIntoView(true);", page_button)
-            time.sleep(0.5)
+            pause(0.5)
             page_button.click()
             print(f"Navegando a la página {page_num}")
-            time.sleep(3)  # Esperar a que cargue la tabla
+            pause(3)  # Esperar a que cargue la tabla
             return True
         except NoSuchElementException:
             print(f"No se encontró el botón exacto para la página {page_num}, intentando otros métodos")
@@ -428,10 +567,10 @@ def navigate_pagination(driver, page_num):
             for btn in page_buttons:
                 if btn.text.strip() == str(page_num):
                     driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                    time.sleep(0.5)
+                    pause(0.5)
                     btn.click()
                     print(f"Navegando a la página {page_num} mediante botón de clase 'button'")
-                    time.sleep(3)
+                    pause(3)
                     return True
         except:
             print(f"Error al buscar botones con clase 'button' para la página {page_num}")
@@ -442,10 +581,10 @@ def navigate_pagination(driver, page_num):
             for btn in buttons:
                 if btn.text.strip() == str(page_num):
                     driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                    time.sleep(0.5)
+                    pause(0.5)
                     btn.click()
                     print(f"Navegando a la página {page_num} mediante botón genérico")
-                    time.sleep(3)
+                    pause(3)
                     return True
         except:
             print(f"Error al buscar botones genéricos para la página {page_num}")
@@ -465,7 +604,7 @@ def navigate_pagination(driver, page_num):
         result = driver.execute_script(script)
         if result:
             print(f"Navegando a la página {page_num} mediante JavaScript")
-            time.sleep(3)
+            pause(3)
             return True
         
         print(f"No se pudo encontrar el botón para la página {page_num} con ningún método")
@@ -476,6 +615,7 @@ def navigate_pagination(driver, page_num):
         print(traceback.format_exc())
         return False
 
+@medir_fase("paginacion")
 def click_next_page_button(driver):
     """
     Hace clic en el botón de siguiente página
@@ -509,7 +649,7 @@ def click_next_page_button(driver):
                 next_page_button = driver.find_element(By.XPATH, f"//button[text()='{next_page}']")
                 next_page_button.click()
                 print(f"Navegando a la página {next_page}")
-                time.sleep(3)
+                pause(3)
                 return True
             except NoSuchElementException:
                 print(f"No se encontró botón para la página {next_page}")
@@ -521,8 +661,9 @@ def click_next_page_button(driver):
         if svg_buttons:
             print(f"Encontrados {len(svg_buttons)} botones con SVG")
             
-            # Recorrer todos los botones con SVG
-            for btn in svg_buttons:
+            # Recorrer los botones con SVG desde el último: la flecha de "siguiente" está
+            # a la derecha de la de "anterior", que en la última página sigue habilitada
+            for btn in reversed(svg_buttons):
                 # Verificar si parece ser un botón de "siguiente"
                 btn_class = btn.get_attribute("class")
                 btn_html = btn.get_attribute("innerHTML")
@@ -547,12 +688,12 @@ def click_next_page_button(driver):
                     
                     # Desplazarse para asegurarse de que el botón sea visible
                     driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                    time.sleep(0.5)
+                    pause(0.5)
                     
                     # Hacer clic en el botón
                     btn.click()
                     print("Navegando a la siguiente página mediante botón SVG")
-                    time.sleep(3)
+                    pause(3)
                     return True
         
         # Método 3: Buscar por botones específicos visibles en la captura de pantalla
@@ -573,10 +714,10 @@ def click_next_page_button(driver):
                 
                 # Desplazarse y hacer clic
                 driver.execute_script("arguments[0].scrollIntoView(true);", next_btn)
-                time.sleep(0.5)
+                pause(0.5)
                 next_btn.click()
                 print("Navegando a la siguiente página mediante botón específico")
-                time.sleep(3)
+                pause(3)
                 return True
         except Exception as e:
             print(f"Error al intentar método específico de navegación: {e}")
@@ -612,7 +753,7 @@ def click_next_page_button(driver):
             result = driver.execute_script(script)
             if result:
                 print("Navegando a la siguiente página mediante JavaScript")
-                time.sleep(3)
+                pause(3)
                 return True
         except Exception as e:
             print(f"Error al ejecutar script de navegación: {e}")
@@ -625,6 +766,7 @@ def click_next_page_button(driver):
         print(traceback.format_exc())
         return False
 
+@medir_fase("escritura")
 def save_data(data, category):
     """
     Guarda los datos en un archivo CSV
@@ -654,13 +796,14 @@ def save_data(data, category):
     
     return df
 
-def scrape_category_data(driver, category):
+def scrape_category_data(driver, category, page_counts=None):
     """
     Extrae datos de todas las páginas para una categoría específica
     
     Args:
         driver: El driver de Selenium
         category: Categoría de estadísticas a extraer
+        page_counts (list): Si se pasa, se le añade el número de filas de cada página
     
     Returns:
         list: Lista combinada de datos de todas las páginas
@@ -673,33 +816,44 @@ def scrape_category_data(driver, category):
     
     all_data = []
     
+    extract_table = EXTRACTION_STRATEGIES[EXTRACTION_STRATEGY]
+    
     # Extraer datos de la primera página
-    page_data = extract_player_table(driver)
-    if page_data:
-        all_data.extend(page_data)
-        print(f"Extraídos {len(page_data)} jugadores de la página 1")
+    with ambito(pagina=1):
+        page_data = extract_table(driver)
+        if page_data:
+            all_data.extend(page_data)
+            contar("filas", len(page_data))
+            if page_counts is not None:
+                page_counts.append(len(page_data))
+            print(f"Extraídos {len(page_data)} jugadores de la página 1")
     
     # Extraer datos de las siguientes páginas
     page_num = 1
-    max_pages = 30  # Limitar a 10 páginas para evitar problemas
+    max_pages = MAX_PAGES  # Limitar el número de páginas para evitar problemas
     
     while page_num < max_pages:
-        # Intentar ir a la siguiente página
-        if click_next_page_button(driver):
-            page_num += 1
-            print(f"Procesando página {page_num}")
-            
-            # Extraer datos de la página actual
-            page_data = extract_player_table(driver)
-            if page_data:
-                all_data.extend(page_data)
-                print(f"Extraídos {len(page_data)} jugadores de la página {page_num}")
+        # El cambio de página y la extracción cuentan para la página siguiente
+        with ambito(pagina=page_num + 1):
+            # Intentar ir a la siguiente página
+            if click_next_page_button(driver):
+                page_num += 1
+                print(f"Procesando página {page_num}")
+                
+                # Extraer datos de la página actual
+                page_data = extract_table(driver)
+                if page_data:
+                    all_data.extend(page_data)
+                    contar("filas", len(page_data))
+                    if page_counts is not None:
+                        page_counts.append(len(page_data))
+                    print(f"Extraídos {len(page_data)} jugadores de la página {page_num}")
+                else:
+                    print(f"No se pudieron extraer datos de la página {page_num}")
+                    break
             else:
-                print(f"No se pudieron extraer datos de la página {page_num}")
+                print(f"No se pudo navegar a la página siguiente, finalizando")
                 break
-        else:
-            print(f"No se pudo navegar a la página siguiente, finalizando")
-            break
     
     print(f"Total de {len(all_data)} jugadores extraídos para la categoría {category}")
     return all_data
@@ -743,6 +897,7 @@ def scrape_all_categories(driver):
     
     return all_data
    
+@medir_fase("combinacion")
 def combine_data(all_data, output_file_path):
     """
     Combina los datos de todas las categorías
@@ -835,7 +990,7 @@ def combine_data(all_data, output_file_path):
     
     return combined_df
 
-def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL, tournament_id="70681"):
+def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL, tournament_id="70681", report_path=None):
     """
     Función principal
     
@@ -844,6 +999,7 @@ def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL
         tournament_type (str): Tipo de torneo (Apertura o Clausura)
         tournament_url (str): URL del torneo
         tournament_id (str): ID del torneo a scrapear
+        report_path (str): Ruta del informe JSON de tiempos (por defecto en reportes/)
     """
     # Actualizar la configuración del torneo
     global TOURNAMENT_URL, TOURNAMENT_ID
@@ -860,8 +1016,13 @@ def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL
         os.makedirs(data_folder)
         print(f"Creada carpeta para el torneo: {data_folder}")
     
+    # Informe de tiempos por fase, categoría y página de esta ejecución
+    iniciar_ejecucion("sofascore", torneo=tournament_type, id_torneo=TOURNAMENT_ID,
+                      estrategia_extraccion=EXTRACTION_STRATEGY)
+    
     # Inicializar driver Firefox con el parámetro de visibilidad
-    driver = create_firefox_driver(visible=visible)
+    with fase("inicio_navegador"):
+        driver = instrumentar_driver(create_firefox_driver(visible=visible))
     
     try:
         # Establecer tiempos de espera
@@ -881,8 +1042,10 @@ def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL
         
         for acc_mode in accumulation_modes:
             if acc_mode == "Per 90 mins":
-                # Pedir al usuario que cambie manualmente el modo
+                # Pedir al usuario que cambie manualmente el modo (salvo que el scraper lo consiga solo)
                 user_input = ""
+                if AUTO_SELECT_ACCUMULATION and select_accumulation_mode(driver, acc_mode):
+                    user_input = "s"
                 while user_input.lower() not in ["s", "n"]:
                     print("\n==========================================")
                     print("Extracción en modo 'All' completada.")
@@ -891,7 +1054,8 @@ def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL
                     print("2. Cuando hayas cambiado el modo, escribe 's' para continuar")
                     print("   o 'n' para terminar sin extraer datos de 'Per 90 mins'")
                     print("==========================================")
-                    user_input = input("¿Continuar con la extracción en modo 'Per 90 mins'? (s/n): ")
+                    with fase("espera_usuario"):
+                        user_input = input("¿Continuar con la extracción en modo 'Per 90 mins'? (s/n): ")
                 
                 if user_input.lower() != "s":
                     print("Omitiendo extracción en modo 'Per 90 mins'")
@@ -913,24 +1077,58 @@ def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL
             
             # Extraer datos de todas las categorías para este modo
             all_data = {}
+            quality_reports = []
             
             for category in STAT_CATEGORIES:
                 print(f"\nExtrayendo estadísticas de la categoría: {category} en modo {acc_mode}")
-                # Si es summary o se pudo seleccionar la pestaña, extraer datos
-                if category == "summary" or select_statistics_tab(driver, category):
-                    category_data = scrape_category_data(driver, category)
-                    if category_data:
-                        file_path = file_paths[category]
-                        df = pd.DataFrame(category_data)
-                        df.to_csv(file_path, index=False)
-                        print(f"Datos guardados en {file_path}")
-                        
-                        all_data[category] = df
-                else:
-                    print(f"No se pudo seleccionar la categoría {category}, saltando...")
+                with ambito(categoria=f"{acc_mode}/{category}"):
+                    # Summary solo está seleccionada por defecto en el primer modo; en los
+                    # siguientes la pestaña activa es la última categoría del modo anterior
+                    default_tab = category == "summary" and acc_mode == accumulation_modes[0]
+                    # Si es summary o se pudo seleccionar la pestaña, extraer datos
+                    if default_tab or select_statistics_tab(driver, category):
+                        page_counts = []
+                        category_data = scrape_category_data(driver, category, page_counts=page_counts)
+                        if category_data:
+                            df = pd.DataFrame(category_data)
+                            
+                            # Comprobaciones de calidad de la categoría (incluye filas por página)
+                            with fase("calidad"):
+                                report = validar(df, "sofascore", nombre=f"{acc_mode}/{category}",
+                                                 filas_por_pagina=page_counts)
+                            imprimir_reporte(report)
+                            quality_reports.append(report)
+                            
+                            all_data[category] = df
+                    else:
+                        print(f"No se pudo seleccionar la categoría {category}, saltando...")
             
             # Combinar todos los datos para este modo
-            combined_df = combine_data(all_data, player_data_file)
+            with ambito(categoria=f"{acc_mode}/combinado"):
+                combined_df = combine_data(all_data, player_data_file)
+            
+            # Validar el archivo combinado antes de que llegue a la unificación
+            if combined_df is not None and not combined_df.empty:
+                with fase("calidad"):
+                    report = validar(combined_df, "sofascore", nombre=f"{acc_mode}/combinado")
+                imprimir_reporte(report)
+                quality_reports.append(report)
+            report_file = guardar_reportes(quality_reports, os.path.join(mode_folder, QUALITY_REPORT_FILE))
+            print(f"Informe de calidad guardado en {report_file}")
+            
+            failed = [report for report in quality_reports if not report["valido"]]
+            if QUALITY_GATE and failed:
+                # El archivo combinado rechazado no debe llegar a Unificacion.py
+                if os.path.exists(player_data_file):
+                    os.replace(player_data_file, player_data_file + ".rechazado")
+                    print(f"Archivo combinado rechazado: {player_data_file}.rechazado")
+                exigir_calidad(failed[0])
+            
+            # Los CSV por categoría solo se escriben cuando los datos superan la compuerta de calidad
+            for category, df in all_data.items():
+                with ambito(categoria=f"{acc_mode}/{category}"), fase("escritura"):
+                    df.to_csv(file_paths[category], index=False)
+                print(f"Datos guardados en {file_paths[category]}")
             
             # Verificar si se han extraído correctamente los equipos
             if combined_df is not None and not combined_df.empty:
@@ -950,6 +1148,10 @@ def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL
         elapsed_time = time.time() - start_time
         print(f"Proceso completado exitosamente en {elapsed_time:.2f} segundos.")
     
+    except ErrorCalidadDatos:
+        # Se propaga (tras cerrar el navegador) para que el proceso termine con error
+        raise
+    
     except Exception as e:
         print(f"Error durante la ejecución: {e}")
         print(traceback.format_exc())
@@ -958,6 +1160,7 @@ def main(visible=True, tournament_type="Apertura", tournament_url=TOURNAMENT_URL
         # Cerrar el navegador
         driver.quit()
         print("Navegador cerrado")
+        finalizar_ejecucion(report_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
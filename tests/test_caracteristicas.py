@@ -0,0 +1,65 @@
+"""
+crear_caracteristicas_forma debe reproducir la Tendencia_Reciente del bucle por jugador
+que calculaba Analisis_goleadores_Sarimax.ipynb antes de vectorizarse.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(RAIZ, 'Procesamiento de datos'))
+
+from caracteristicas import crear_caracteristicas_forma
+
+
+def tendencia_bucle(df):
+    """Implementación original (notebook) con un orden estable entre partidos del mismo día"""
+    df = df.copy()
+    df['Tendencia_Reciente'] = 0.0
+    for jugador in df['Jugador'].unique():
+        df_jugador = df[df['Jugador'] == jugador].sort_values(by='Fecha', kind='mergesort')
+        for idx, partido in df_jugador.iterrows():
+            anteriores = df_jugador[df_jugador['Fecha'] < partido['Fecha']]
+            if len(anteriores) > 0:
+                promedio_reciente = anteriores.tail(5)['Goles'].mean()
+                promedio_general = anteriores['Goles'].mean()
+                if promedio_general > 0:
+                    tendencia = promedio_reciente / promedio_general
+                else:
+                    tendencia = 1.0
+                df.loc[idx, 'Tendencia_Reciente'] = tendencia
+    return df['Tendencia_Reciente']
+
+
+def datos_prueba():
+    """Partidos desordenados, con varios partidos el mismo día, goles vacíos y una fecha vacía"""
+    rng = np.random.default_rng(7)
+    filas = []
+    for jugador in ['A', 'B', 'C']:
+        fechas = pd.to_datetime('2024-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 40, 25)) * 7, unit='D')
+        for fecha in fechas:
+            filas.append({'Jugador': jugador, 'Fecha': fecha, 'Goles': float(rng.poisson(0.6))})
+    df = pd.DataFrame(filas)
+    # Jugador sin goles registrados en sus primeros partidos y con una fecha vacía
+    df.loc[df['Jugador'] == 'C', 'Goles'] = np.where(np.arange(25) < 6, np.nan, df.loc[df['Jugador'] == 'C', 'Goles'])
+    df.loc[df.index[-1], 'Fecha'] = pd.NaT
+    df = df.sample(frac=1, random_state=3)
+    df.index = np.arange(len(df))[::-1] * 10
+    assert df.duplicated(['Jugador', 'Fecha']).any()
+    return df
+
+
+def test_tendencia_reciente_igual_al_bucle():
+    df = datos_prueba()
+    forma = crear_caracteristicas_forma(df, variables=('Goles',))
+    esperado = tendencia_bucle(df)
+    pd.testing.assert_series_equal(forma['Tendencia_Reciente'], esperado, check_names=False)
+
+
+def test_partidos_del_mismo_dia_comparten_tendencia():
+    df = datos_prueba()
+    forma = crear_caracteristicas_forma(df, variables=('Goles',))
+    por_dia = forma['Tendencia_Reciente'].groupby([df['Jugador'], df['Fecha']]).nunique()
+    assert (por_dia == 1).all()
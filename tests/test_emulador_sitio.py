@@ -0,0 +1,50 @@
+"""
+Los datos del emulador de SofaScore deben superar la compuerta de calidad del scraper
+(calidad_datos.validar con las reglas 'sofascore'), o la prueba de extremo a extremo
+y la de carga se rechazan.
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(RAIZ, 'scraper'))
+sys.path.insert(0, os.path.join(RAIZ, 'Procesamiento de datos'))
+
+import emulador_sitio
+from calidad_datos import validar
+
+
+def tabla_emulada(jugadores, categoria, modo):
+    """Todas las páginas de una pestaña como las extrae el scraper y las filas de cada página"""
+    filas, filas_por_pagina = [], []
+    pagina, paginas = 1, 1
+    while pagina <= paginas:
+        datos = emulador_sitio.pagina_jugadores(jugadores, categoria, modo, pagina)
+        encabezados, paginas = datos['encabezados'], datos['paginas']
+        filas.extend(datos['filas'])
+        filas_por_pagina.append(len(datos['filas']))
+        pagina += 1
+    return pd.DataFrame(filas, columns=encabezados).drop(columns='#'), filas_por_pagina
+
+
+@pytest.mark.parametrize('n_jugadores', [600, 5000])
+@pytest.mark.parametrize('modo', emulador_sitio.MODOS_ACUMULACION)
+def test_datos_emulados_superan_la_calidad(n_jugadores, modo):
+    jugadores = emulador_sitio.generar_jugadores(n_jugadores)
+    for categoria in emulador_sitio.STAT_CATEGORIES:
+        df, filas_por_pagina = tabla_emulada(jugadores, categoria, modo)
+        reporte = validar(df, 'sofascore', nombre=f"{modo}/{categoria}", filas_por_pagina=filas_por_pagina)
+        errores = [c for c in reporte['comprobaciones'] if c['estado'] == 'error']
+        assert reporte['valido'], f"{modo}/{categoria}: {errores}"
+
+
+def test_valoracion_no_se_escala_por_90_minutos():
+    jugadores = emulador_sitio.generar_jugadores(100)
+    total, _ = tabla_emulada(jugadores, 'summary', 'All')
+    por_90, _ = tabla_emulada(jugadores, 'summary', 'Per 90 mins')
+    valoracion = pd.to_numeric(total['Average Sofascore Rating'])
+    assert valoracion.between(0, 10).all()
+    assert (valoracion == pd.to_numeric(por_90['Average Sofascore Rating'])).all()